@@ -0,0 +1,28 @@
+"""
+Benchmarks
+
+Performance benchmarks for TPKE.
+
+The benchmarks follow the asv layout: classes with 'params' and 'param_names',
+an optional 'setup()' which may raise NotImplementedError to skip a
+combination of parameters, and 'time_*' methods to be timed.
+
+Run them with:
+
+	python -m benchmarks [filter]
+"""
+import os as _os
+import tpke as _tpke
+
+INPUT_DIR = _os.path.join(_os.path.dirname(_os.path.dirname(__file__)), "inputs")
+DECKS = {
+	1: "explicit_step_dg1.yml",
+	2: "implicit_ramp_dg2.yml",
+	6: "implicit_sine_dg6.yml",
+	8: "implicit_step_dg8.yml",
+}
+
+
+def load_deck(ndg: int):
+	"""Load the input deck from 'inputs/' with 'ndg' delayed groups."""
+	return _tpke.yamlin.load_input_file(_os.path.join(INPUT_DIR, DECKS[ndg]))
@@ -0,0 +1,245 @@
+"""
+Run the benchmark suite
+
+Usage:
+
+	python -m benchmarks [filter] [--save]
+	python -m benchmarks --compare OLD NEW
+
+Only benchmarks whose name contains 'filter' are run.
+With --save, the results are written to RESULTS_DIR as '<commit>.json',
+so that two commits can be compared with --compare.
+"""
+import argparse
+import datetime
+import glob
+import importlib
+import inspect
+import itertools
+import json
+import os
+import pkgutil
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import numpy as np
+import benchmarks
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, ".benchmarks")
+THRESHOLD = 1.2  # Ratio of times to report as a change
+
+
+def discover(name_filter: str = ""):
+	"""Find the benchmark classes and their 'time_*' and 'timeraw_*' methods.
+	
+	Parameters:
+	-----------
+	name_filter: str, optional
+		Only yield benchmarks whose full name contains this string.
+		[Default: "" --> all]
+	
+	Yields:
+	-------
+	name: str
+		Full name of the benchmark, 'module.Class.time_method'
+	
+	cls: type
+		Benchmark class
+	
+	method: str
+		Name of the method to time
+	"""
+	for info in pkgutil.iter_modules(benchmarks.__path__):
+		if not info.name.startswith("bench_"):
+			continue
+		module = importlib.import_module(f"benchmarks.{info.name}")
+		for cname, cls in inspect.getmembers(module, inspect.isclass):
+			if cls.__module__ != module.__name__:
+				continue
+			for method in sorted(dir(cls)):
+				name = f"{info.name}.{cname}.{method}"
+				if method.startswith(("time_", "timeraw_")) and name_filter in name:
+					yield name, cls, method
+
+
+def run(cls, method: str, params: tuple, repeat: int = 3) -> float:
+	"""Time one benchmark for one combination of parameters.
+	
+	A 'timeraw_*' method returns source code instead, which is timed
+	in a fresh interpreter, so that imports are included.
+	
+	Returns:
+	--------
+	float
+		Best time per call (s), or NaN if the combination was skipped.
+	"""
+	bench = cls()
+	try:
+		if hasattr(bench, "setup"):
+			bench.setup(*params)
+	except NotImplementedError:
+		return float("nan")
+	try:
+		if method.startswith("timeraw_"):
+			return _run_raw(getattr(bench, method)(*params), repeat)
+		timer = timeit.Timer(lambda: getattr(bench, method)(*params))
+		number, _ = timer.autorange()
+		return min(timer.repeat(repeat, number))/number
+	finally:
+		if hasattr(bench, "teardown"):
+			bench.teardown(*params)
+
+
+def _run_raw(code: str, repeat: int) -> float:
+	"""Best wall time (s) to run 'code' in a new Python process.
+	
+	It runs in an empty temporary directory, so that any files it writes
+	there are thrown away, with the repository on its path.
+	"""
+	env = dict(os.environ)
+	env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+	times = []
+	with tempfile.TemporaryDirectory() as cwd:
+		for _ in range(repeat):
+			tick = time.perf_counter()
+			subprocess.run([sys.executable, "-c", code], check=True, cwd=cwd, env=env,
+			               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+			times.append(time.perf_counter() - tick)
+	return min(times)
+
+
+def _git(*args) -> str:
+	"""Output of a git command in the repository, or '' if it fails."""
+	try:
+		out = subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True)
+	except (OSError, subprocess.CalledProcessError):
+		return ""
+	return out.stdout.strip()
+
+
+def save(results: dict, results_dir: str = RESULTS_DIR) -> str:
+	"""Write the results for the current commit to 'results_dir'.
+	
+	Results for a commit with uncommitted changes are saved as '<commit>-dirty.json'.
+	Benchmarks which were not run this time are kept from the existing file.
+	
+	Returns:
+	--------
+	fpath: str
+		Path to the JSON file written.
+	"""
+	commit = _git("rev-parse", "--short", "HEAD") or "unknown"
+	dirty = bool(_git("status", "--porcelain", "--untracked-files=no"))
+	fpath = os.path.join(results_dir, f"{commit}{'-dirty' if dirty else ''}.json")
+	os.makedirs(results_dir, exist_ok=True)
+	previous = {}
+	if os.path.isfile(fpath):
+		with open(fpath) as f:
+			previous = json.load(f)["results"]
+	report = {
+		"commit": commit,
+		"dirty": dirty,
+		"date": datetime.datetime.now().isoformat(timespec="seconds"),
+		"machine": platform.machine(),
+		"processor": platform.processor(),
+		"cpus": os.cpu_count(),
+		"python": platform.python_version(),
+		"numpy": np.__version__,
+		"results": previous | results,
+	}
+	with open(fpath, "w") as f:
+		json.dump(report, f, indent=1)
+	return fpath
+
+
+def _find_results(ref: str, results_dir: str = RESULTS_DIR) -> str:
+	"""Path to the results for a JSON file, or for a commit (of any abbreviation)."""
+	if os.path.isfile(ref):
+		return ref
+	commit = _git("rev-parse", "--short", ref) or ref
+	matches = sorted(glob.glob(os.path.join(results_dir, f"{commit}*.json")))
+	if not matches:
+		raise FileNotFoundError(f"No saved results for '{ref}' in: {results_dir}")
+	# Prefer the clean results over '-dirty' ones.
+	return matches[0]
+
+
+def compare(old: str, new: str, threshold: float = THRESHOLD) -> int:
+	"""Print the ratio of the new to the old times for each benchmark in both.
+	
+	Returns:
+	--------
+	int
+		Number of benchmarks which got slower by more than 'threshold'.
+	"""
+	runs = []
+	for ref in (old, new):
+		with open(_find_results(ref)) as f:
+			runs.append(json.load(f))
+	print(f"{runs[0]['commit']} -> {runs[1]['commit']}")
+	slower = 0
+	for name, cases in runs[1]["results"].items():
+		old_cases = runs[0]["results"].get(name, {})
+		lines = []
+		for label, t_new in cases.items():
+			t_old = old_cases.get(label)
+			if t_old is None or t_new is None:
+				continue
+			ratio = t_new/t_old
+			mark = ""
+			if ratio > threshold:
+				mark = "  SLOWER"
+				slower += 1
+			elif ratio < 1/threshold:
+				mark = "  faster"
+			lines.append(f"\t{label}: {t_old*1e3:10.3f} -> {t_new*1e3:10.3f} ms ({ratio:5.2f}x){mark}")
+		if lines:
+			print(name, *lines, sep="\n")
+	print(f"{slower} benchmarks slower by more than {threshold}x.")
+	return slower
+
+
+def main():
+	ap = argparse.ArgumentParser(description="Run the TPKE benchmarks.")
+	ap.add_argument("filter", nargs="?", default="",
+	                help="Only run benchmarks whose name contains this string.")
+	ap.add_argument("-r", "--repeat", type=int, default=3,
+	                help="Number of repeats; the best is reported (default: 3).")
+	ap.add_argument("--save", action="store_true", default=False,
+	                help=f"Save the results for the current commit in {RESULTS_DIR}.")
+	ap.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), default=None,
+	                help="Compare the saved results of two commits (or JSON files) instead of running. "
+	                     "The exit status is 1 if any benchmark got slower.")
+	ap.add_argument("--threshold", type=float, default=THRESHOLD,
+	                help=f"Ratio of times to report as a change (default: {THRESHOLD}).")
+	args = ap.parse_args()
+	if args.compare:
+		return int(bool(compare(*args.compare, threshold=args.threshold)))
+	results = {}
+	for name, cls, method in discover(args.filter):
+		params = getattr(cls, "params", ())
+		if params and not isinstance(params[0], (list, tuple)):
+			params = (params,)
+		names = getattr(cls, "param_names", [f"p{i}" for i in range(len(params))])
+		print(name)
+		results[name] = {}
+		for combo in itertools.product(*params):
+			best = run(cls, method, combo, args.repeat)
+			label = ", ".join(f"{k}={v!r}" for k, v in zip(names, combo))
+			if best != best:
+				print(f"\t{label}: skipped")
+				results[name][label] = None
+			else:
+				print(f"\t{label}: {best*1e3:10.3f} ms")
+				results[name][label] = best
+	if args.save:
+		print("Results saved to:", save(results))
+	return 0
+
+
+if __name__ == "__main__":
+	exit(main())
@@ -0,0 +1,46 @@
+"""
+Benchmarks for the output
+
+Times writing a solution with tpke.store.save() in each format,
+and reading it back with tpke.store.load().
+"""
+import shutil
+import tempfile
+import numpy as np
+import tpke
+import tpke.keys as K
+from benchmarks import load_deck
+
+
+class Output:
+	params = (
+		list(K.FORMATS),
+		[1000, 100000],
+		[1, 6, 8],
+	)
+	param_names = ["format", "n", "ndg"]
+	
+	def setup(self, fmt, n, ndg):
+		if fmt == K.FORMAT_HDF5 and tpke.store.h5py is None:
+			raise NotImplementedError("h5py is not installed.")
+		self.config = load_deck(ndg)
+		rng = np.random.default_rng(0)
+		self.datasets = {
+			K.DSET_TIME: np.linspace(0, 1, n),
+			K.DSET_RHO: rng.random(n),
+			K.DSET_P: rng.random(n),
+			K.DSET_C: rng.random((ndg, n)),
+		}
+		self.tmpdir = tempfile.mkdtemp()
+		tpke.store.save(self.tmpdir, self.datasets, metadata={"config": self.config}, fmt=fmt)
+	
+	def teardown(self, fmt, n, ndg):
+		shutil.rmtree(self.tmpdir, ignore_errors=True)
+	
+	def time_save(self, fmt, n, ndg):
+		tpke.store.save(self.tmpdir, self.datasets, metadata={"config": self.config}, fmt=fmt)
+	
+	def time_load(self, fmt, n, ndg):
+		datasets, _ = tpke.store.load(self.tmpdir)
+		for array in datasets.values():
+			np.asarray(array).sum()
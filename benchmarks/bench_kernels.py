@@ -0,0 +1,47 @@
+"""
+Benchmarks for the compiled marching kernels
+
+Compares marching with the Numba kernels in tpke.kernels against the
+NumPy loops they replace, on the 6-group sine deck.
+"""
+import importlib.util
+import numpy as np
+import tpke
+import tpke.keys as K
+from benchmarks import load_deck
+
+
+class Marching:
+	params = (
+		[K.IMPLICIT_NAMES[0], K.EXPLICIT_NAMES[0]],
+		[1000, 100000, 1000000],
+		[False, True],
+	)
+	param_names = ["method", "n", "jit"]
+	
+	def setup(self, method, n, jit):
+		if jit and importlib.util.find_spec("numba") is None:
+			raise NotImplementedError("Numba is not installed.")
+		config = load_deck(6)
+		data = config[K.DATA]
+		reac = config[K.REAC]
+		dt = config[K.TIME][K.TIME_DELTA]
+		self.kwargs = dict(
+			n=n,
+			rho_vec=tpke.reactivity.sine(reac[K.RHO], reac[K.SINE_OMEGA])(np.arange(n)*dt),
+			dt=dt,
+			betas=data[K.DATA_B],
+			lams=data[K.DATA_L],
+			L=data[K.DATA_BIG_L],
+		)
+		self.march = tpke.marching.METHODS[method]
+		self.jit = tpke.kernels.JIT
+		tpke.kernels.JIT = jit
+		# Compile (or load from the cache) before timing.
+		self.march(**dict(self.kwargs, n=2, rho_vec=self.kwargs["rho_vec"][:2]))
+	
+	def teardown(self, method, n, jit):
+		tpke.kernels.JIT = self.jit
+	
+	def time_march(self, method, n, jit):
+		self.march(**self.kwargs)
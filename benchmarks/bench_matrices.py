@@ -0,0 +1,108 @@
+"""
+Benchmarks for the matrix builders
+
+Compares the vectorized builders in tpke.matrices against the
+previous per-timestep, per-group Python loops, kept here for reference.
+"""
+import numpy as np
+import scipy.sparse as sp
+import tpke
+import tpke.keys as K
+from benchmarks import load_deck
+
+MAX_DENSE = 8000  # Largest dense matrix to bother with
+
+
+def _loop_implicit_euler(n, rho_vec, dt, betas, lams, L, P0=1, sparse=False):
+	"""Reference: implicit Euler builder filled with nested loops."""
+	ndg = len(betas)
+	beff = sum(betas)
+	rho_vec *= beff
+	size = (1 + ndg)*n
+	A = sp.lil_matrix((size, size)) if sparse else np.zeros((size, size))
+	B = np.zeros(size)
+	C0s = (P0*betas)/(lams*L)
+	for ip in range(n-1):
+		dtrbl = dt*(rho_vec[ip+1] - beff)/L
+		A[ip, ip] = -1
+		A[ip, ip+1] = 1 - dtrbl
+		for k in range(ndg):
+			ic = ip + n*(k+1)
+			A[ip, ic+1] = -dt*lams[k]
+			A[ic, ip+1] = -dt*betas[k]/L
+			A[ic, ic] = -1
+			A[ic, ic+1] = 1 + dt*lams[k]
+	A[n-1, 0] = 1
+	B[n-1] = P0
+	for k in range(ndg):
+		A[n*(k+2)-1, n*(k+1)] = 1
+		B[n*(k+2)-1] = C0s[k]
+	if sparse:
+		A = A.tocsr()
+	return A, B
+
+
+def _loop_explicit_euler(n, rho_vec, dt, betas, lams, L, P0=1, sparse=False):
+	"""Reference: explicit Euler builder filled with nested loops."""
+	ndg = len(betas)
+	beff = sum(betas)
+	rho_vec *= beff
+	size = (1 + ndg)*n
+	A = sp.lil_matrix((size, size)) if sparse else np.zeros((size, size))
+	B = np.zeros(size)
+	C0s = (P0*betas)/(lams*L)
+	for ip in range(n-1):
+		dtrbl = dt*(rho_vec[ip] - beff)/L
+		A[ip, ip] = -1 - dtrbl
+		A[ip, ip+1] = 1
+		for k in range(ndg):
+			ic = ip + n*(k+1)
+			A[ip, ic] = -dt*lams[k]
+			A[ic, ip] = -dt*betas[k]/L
+			A[ic, ic] = -1 + dt*lams[k]
+			A[ic, ic+1] = 1
+	A[n-1, 0] = 1
+	B[n-1] = P0
+	for k in range(ndg):
+		A[n*(k+2)-1, n*(k+1)] = 1
+		B[n*(k+2)-1] = C0s[k]
+	if sparse:
+		A = A.tocsr()
+	return A, B
+
+
+LOOPS = {
+	K.IMPLICIT_NAMES[0]: _loop_implicit_euler,
+	K.EXPLICIT_NAMES[0]: _loop_explicit_euler,
+}
+
+
+class Assembly:
+	"""Time to assemble A and B, loops vs. vectorized."""
+	params = (
+		[K.IMPLICIT_NAMES[0], K.EXPLICIT_NAMES[0]],
+		[100, 1000, 10000],
+		[1, 6, 8],
+		[False, True],
+	)
+	param_names = ["method", "n", "ndg", "sparse"]
+	
+	def setup(self, method, n, ndg, sparse):
+		if not sparse and (1 + ndg)*n > MAX_DENSE:
+			raise NotImplementedError("Too large for a dense matrix.")
+		data = load_deck(ndg)[K.DATA]
+		self.kwargs = dict(
+			n=n,
+			dt=1e-4,
+			betas=data[K.DATA_B],
+			lams=data[K.DATA_L],
+			L=data[K.DATA_BIG_L],
+			sparse=sparse,
+		)
+		self.rho_vec = np.full(n, 0.1)
+	
+	def time_loops(self, method, n, ndg, sparse):
+		LOOPS[method](rho_vec=self.rho_vec.copy(), **self.kwargs)
+	
+	def time_vectorized(self, method, n, ndg, sparse):
+		tpke.matrices.METHODS[method](rho_vec=self.rho_vec.copy(), **self.kwargs)
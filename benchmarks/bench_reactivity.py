@@ -0,0 +1,47 @@
+"""
+Benchmarks for the reactivity functions
+
+Times tpke.reactivity.get_reactivity_vector() for each type of reactivity,
+with the settings of the matching decks in 'inputs/'.
+"""
+import os
+import shutil
+import tempfile
+import numpy as np
+import tpke
+import tpke.keys as K
+from benchmarks import load_deck
+
+TABLE_ROWS = 10000
+
+
+class ReactivityVector:
+	params = (
+		[K.STEP, K.RAMP, K.SINE, K.TABLE],
+		[1000, 100000, 10000000],
+	)
+	param_names = ["type", "n"]
+	
+	def setup(self, r_type, n):
+		self.tmpdir = None
+		if r_type == K.STEP:
+			self.kwargs = {K.RHO: load_deck(1)[K.REAC][K.RHO]}
+		elif r_type == K.RAMP:
+			self.kwargs = {K.RHO: 0.5, K.RAMP_SLOPE: 0.5}
+		elif r_type == K.SINE:
+			reac = load_deck(6)[K.REAC]
+			self.kwargs = {K.RHO: reac[K.RHO], K.SINE_OMEGA: reac[K.SINE_OMEGA]}
+		else:
+			self.tmpdir = tempfile.mkdtemp()
+			fpath = os.path.join(self.tmpdir, "table.npy")
+			times = np.linspace(0, 1, TABLE_ROWS)
+			np.save(fpath, np.column_stack([times, 0.25*np.sin(62.8*times)]))
+			self.kwargs = {K.TABLE_FILE: fpath, K.TABLE_INTERP: K.INTERP_PCHIP}
+		self.dt = 1/n
+	
+	def teardown(self, r_type, n):
+		if self.tmpdir:
+			shutil.rmtree(self.tmpdir, ignore_errors=True)
+	
+	def time_vector(self, r_type, n):
+		tpke.reactivity.get_reactivity_vector(r_type, n, self.dt, **self.kwargs)
@@ -0,0 +1,49 @@
+"""
+Benchmarks for the solvers
+
+Times the solve alone, from an already assembled system, for each
+of the solvers in tpke.solver and for marching through time instead.
+"""
+import numpy as np
+import tpke
+import tpke.keys as K
+from benchmarks import load_deck
+
+MAX_DENSE = 8000  # Largest dense matrix to bother with
+INVERSION = "inversion"
+
+
+class Solve:
+	"""Time to solve the implicit Euler system."""
+	params = (
+		[K.SOLVER_DENSE, INVERSION, K.SOLVER_SPARSE, K.SOLVER_BANDED, K.SOLVER_MARCH],
+		[100, 1000, 10000, 100000],
+		[1, 6, 8],
+	)
+	param_names = ["solver", "n", "ndg"]
+	
+	def setup(self, solver, n, ndg):
+		dense = solver in (K.SOLVER_DENSE, INVERSION)
+		if dense and (1 + ndg)*n > MAX_DENSE:
+			raise NotImplementedError("Too large for a dense matrix.")
+		data = load_deck(ndg)[K.DATA]
+		self.n = n
+		self.kinetics = dict(
+			n=n,
+			rho_vec=np.full(n, 0.1),
+			dt=1e-4,
+			betas=data[K.DATA_B],
+			lams=data[K.DATA_L],
+			L=data[K.DATA_BIG_L],
+		)
+		if solver == K.SOLVER_MARCH:
+			self.march = tpke.marching.METHODS[K.IMPLICIT_NAMES[0]]
+			return
+		self.matA, self.vecB = tpke.matrices.implicit_euler(**self.kinetics, sparse=not dense)
+		self.solve = tpke.solver.inversion if solver == INVERSION else tpke.solver.SOLVERS[solver]
+	
+	def time_solve(self, solver, n, ndg):
+		if solver == K.SOLVER_MARCH:
+			self.march(**self.kinetics)
+		else:
+			self.solve(self.matA, self.vecB, self.n)
@@ -0,0 +1,50 @@
+"""
+Benchmarks for the command line startup
+
+Each entry mode of 'python -m tpke' is timed in a fresh interpreter,
+so the cost of the imports it needs is included.
+"""
+import os
+import shutil
+import tempfile
+import tpke
+import tpke.keys as K
+from benchmarks import INPUT_DIR, DECKS, load_deck
+
+DECK = os.path.join(INPUT_DIR, DECKS[1])
+
+
+class CommandLine:
+	params = ["import", "help", "validate", "dump_schema", "plot_only", "solve"]
+	param_names = ["mode"]
+	
+	def setup(self, mode):
+		self.tmpdir = tempfile.mkdtemp()
+		if mode == "plot_only":
+			config = load_deck(1)
+			config[K.PLOT] = {}
+			tpke.modes.solution(config, self.tmpdir)
+	
+	def teardown(self, mode):
+		shutil.rmtree(self.tmpdir, ignore_errors=True)
+	
+	def timeraw_cli(self, mode):
+		if mode == "import":
+			return "import tpke"
+		argv = {
+			"help": ["--help"],
+			"validate": ["-y", DECK],
+			"dump_schema": ["-s", os.path.join(self.tmpdir, "schema.yml")],
+			"plot_only": ["-p", self.tmpdir, DECK],
+			"solve": ["-np", "-o", self.tmpdir, DECK],
+		}[mode]
+		return (
+			"import os, sys\n"
+			"os.environ['MPLBACKEND'] = 'Agg'\n"
+			f"sys.argv = ['tpke', *{argv!r}]\n"
+			"import tpke.__main__\n"
+			"try:\n"
+			"\ttpke.__main__.main()\n"
+			"except SystemExit:\n"
+			"\tpass\n"
+		)
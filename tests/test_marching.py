@@ -0,0 +1,39 @@
+"""
+Marching solvers agree with the dense global solve
+"""
+import numpy as np
+import pytest
+from tpke import keys, marching, matrices, solver
+
+BETAS = np.array([2.15e-4, 1.424e-3, 1.274e-3, 2.568e-3, 7.48e-4, 2.73e-4])
+LAMS = np.array([0.0124, 0.0305, 0.111, 0.301, 1.14, 3.01])
+L = 1e-3    # s; long enough for explicit Euler to stay stable
+DT = 0.01   # s
+N = 101
+RTOL = 1e-10
+
+
+def _reactivities():
+	return 0.5*np.sin(4*np.arange(N)*DT)    # $
+
+
+@pytest.mark.parametrize("method", sorted(marching.METHODS))
+def test_marching_matches_dense(method):
+	if method not in matrices.METHODS:
+		pytest.skip(f"'{method}' has no global system to compare with.")
+	matA, matB = matrices.METHODS[method](N, _reactivities(), DT, BETAS, LAMS, L, sparse=False)
+	P_dense, C_dense = solver.SOLVERS[keys.SOLVER_DENSE](matA, matB, N)
+	P, C = marching.METHODS[method](N, _reactivities(), DT, BETAS, LAMS, L)
+	np.testing.assert_allclose(P, P_dense, rtol=0, atol=RTOL*np.abs(P_dense).max())
+	np.testing.assert_allclose(C, C_dense, rtol=0, atol=RTOL*np.abs(C_dense).max())
+
+
+def test_exponential_is_exact_for_constant_reactivity():
+	rho = 0.3   # $
+	P, C = marching.METHODS[keys.EXPONENTIAL_NAMES[0]](N, np.full(N, rho), DT, BETAS, LAMS, L)
+	matM = matrices.kinetics_matrix(rho*BETAS.sum(), BETAS, LAMS, L)
+	y0 = np.concatenate(([1], BETAS/(LAMS*L)))
+	w, V = np.linalg.eig(matM)
+	expected = (V @ (np.exp(np.outer(w, np.arange(N)*DT))*np.linalg.solve(V, y0)[:, None])).real
+	np.testing.assert_allclose(P, expected[0], rtol=1e-9)
+	np.testing.assert_allclose(C, expected[1:], rtol=1e-9)
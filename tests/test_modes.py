@@ -0,0 +1,38 @@
+"""
+Streamed results match the in-memory solution
+"""
+import os
+import numpy as np
+import pytest
+import tpke
+from tpke import keys as K, modes, store, yamlin
+
+INPUT = os.path.join(os.path.dirname(__file__), os.pardir, "inputs", "implicit_sine_dg6.yml")
+# Not a divisor of the number of steps, so the last chunk is short
+CHUNK = 37
+# One name for each scheme that can be streamed
+STREAM_METHODS = list({
+	func: name for name, func in reversed(tpke.marching.STREAM_METHODS.items())
+}.values())
+
+
+def _config(method):
+	config = yamlin.load_input_file(INPUT)
+	config.pop(K.PLOT, None)
+	config[K.METH] = method
+	config[K.SOLVER] = K.SOLVER_MARCH
+	return config
+
+
+@pytest.mark.parametrize("fmt", [K.FORMAT_TXT, K.FORMAT_HDF5])
+@pytest.mark.parametrize("method", STREAM_METHODS)
+def test_stream_matches_memory(tmp_path, method, fmt):
+	if fmt == K.FORMAT_HDF5:
+		pytest.importorskip("h5py")
+	config = _config(method)
+	result = tpke.api.run(config)
+	num_points = modes.stream_solution(config, tmp_path, fmt=fmt, chunk=CHUNK)
+	assert num_points == len(result.times)
+	streamed, _ = store.load(tmp_path)
+	for name, array in result.datasets().items():
+		np.testing.assert_allclose(streamed[name], array, rtol=1e-12, atol=0, err_msg=name)
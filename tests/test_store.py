@@ -0,0 +1,44 @@
+"""
+Saved results read back unchanged
+"""
+import numpy as np
+import pytest
+from tpke import keys as K, store
+
+METADATA = {"method": "implicit euler", "time": {"total": 1.0, "dt": 0.01}}
+
+
+def _datasets():
+	rng = np.random.default_rng(560)
+	return {
+		K.DSET_TIME: np.linspace(0, 1, 11),
+		K.DSET_RHO: rng.uniform(-1, 1, 11),
+		K.DSET_P: rng.uniform(0, 2, 11),
+		K.DSET_C: rng.uniform(0, 100, (6, 11)),
+		K.DSET_T: rng.uniform(-5, 5, (2, 11)),
+	}
+
+
+@pytest.mark.parametrize("fmt", K.FORMATS)
+def test_save_load_round_trip(tmp_path, fmt):
+	if fmt == K.FORMAT_HDF5:
+		pytest.importorskip("h5py")
+	datasets = _datasets()
+	store.save(tmp_path, datasets, metadata=METADATA, fmt=fmt)
+	loaded, metadata = store.load(tmp_path)
+	assert set(loaded) == set(datasets)
+	for name, array in datasets.items():
+		# np.savetxt() writes '%.18e', so text round-trips exactly too.
+		np.testing.assert_array_equal(loaded[name], array, err_msg=name)
+	assert metadata == ({} if fmt == K.FORMAT_TXT else METADATA)
+
+
+@pytest.mark.parametrize("fmt", K.FORMATS)
+def test_load_skips_missing_optional(tmp_path, fmt):
+	if fmt == K.FORMAT_HDF5:
+		pytest.importorskip("h5py")
+	datasets = _datasets()
+	del datasets[K.DSET_T]
+	store.save(tmp_path, datasets, fmt=fmt)
+	loaded, _ = store.load(tmp_path)
+	assert set(loaded) == set(datasets)
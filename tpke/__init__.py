@@ -4,13 +4,41 @@ _simplefilter("ignore", UserWarning)
 __author__ = "Travis J. Labossiere-Hickman"
 __email__ = "travisl2@illinois.edu"
 
+import importlib as _importlib
 import tpke.keys
 import tpke.tping
-import tpke.modes
-import tpke.actions
-import tpke.arguments
-import tpke.matrices
-import tpke.reactivity
-import tpke.solver
-import tpke.yamlin
-import tpke.plotter
+
+# Loaded on first use: most of these pull in scipy or matplotlib.
+_SUBMODULES = (
+	"api",
+	"modes",
+	"actions",
+	"arguments",
+	"matrices",
+	"marching",
+	"kernels",
+	"inverse",
+	"reactivity",
+	"solver",
+	"store",
+	"yamlin",
+	"validate",
+	"plotter",
+	"profiler",
+)
+
+
+# Loaded from tpke.api on first use
+_API = ("run", "Result")
+
+
+def __getattr__(name):
+	if name in _SUBMODULES:
+		return _importlib.import_module(f"tpke.{name}")
+	if name in _API:
+		return getattr(_importlib.import_module("tpke.api"), name)
+	raise AttributeError(f"module 'tpke' has no attribute '{name}'")
+
+
+def __dir__():
+	return sorted([*globals(), *_SUBMODULES, *_API])
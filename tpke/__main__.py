@@ -3,6 +3,7 @@ Travis's Point Kinetics Equations
 """
 import tpke
 import tpke.keys as K
+import importlib
 import os
 import shutil
 import numpy as np
@@ -27,6 +28,36 @@ def main():
 		input_dict[K.PLOT] = {}
 	os.makedirs(args.output_dir, exist_ok=True)
 	shutil.copy(input_file, os.path.join(args.output_dir, K.FNAME_CFG))
+	if args.profile:
+		tpke.profiler.enable(memory=args.profile == K.PROFILE_MEMORY)
+	with tpke.profiler.phase("imports"):
+		# SciPy and Matplotlib, which take a while
+		importlib.import_module("tpke.modes")
+		if args.inverse:
+			importlib.import_module("tpke.inverse")
+	status = run(args, input_dict)
+	profiler = tpke.profiler.disable()
+	if profiler is not None:
+		print(profiler.summary())
+		print("Profile saved to:", profiler.write(args.output_dir))
+	return status
+
+
+def run(args, input_dict):
+	"""Run the mode selected by the command line arguments."""
+	if args.batch:
+		input_files = [os.path.abspath(f) for f in args.batch]
+		for fpath in input_files:
+			if not os.path.isfile(fpath):
+				raise FileNotFoundError(fpath)
+		with tpke.profiler.phase("input"):
+			input_dicts = [input_dict] + [tpke.yamlin.load_input_file(f) for f in input_files]
+		tick = time.time()
+		print(f"Solving a batch of {len(input_dicts)} scenarios...")
+		tpke.modes.ensemble(input_dicts, args.output_dir, fmt=args.format)
+		tock = time.time()
+		print(f"...Completed in {tock - tick:.2f} seconds. Outputs saved to: {args.output_dir}.")
+		return 0
 	if args.study_timesteps:
 		dts = args.study_timesteps
 		if len(dts) < 2:
@@ -34,11 +65,33 @@ def main():
 		if min(dts) <= 0:
 			raise ValueError("Timestep sizes must be >0.")
 		print("Starting timestep study.")
-		return tpke.modes.study_timesteps(input_dict, args.output_dir, dts)
+		if args.jobs < 1:
+			raise ValueError("Number of jobs must be >0.")
+		return tpke.modes.study_timesteps(input_dict, args.output_dir, dts, jobs=args.jobs,
+		                                  tolerance=args.study_tolerance)
+	if args.stream is not None and args.stream < 1:
+		raise ValueError("Chunk size must be >0.")
+	if args.inverse:
+		if args.inverse != "-" and not os.path.isfile(args.inverse):
+			raise FileNotFoundError(args.inverse)
+		tick = time.time()
+		print("Finding the reactivity from the power trace...")
+		num_points = tpke.modes.inverse_solution(input_dict, args.inverse, args.output_dir,
+		                                         fmt=args.format, chunk=args.stream or K.STREAM_CHUNK)
+		tock = time.time()
+		print(f"...Wrote {num_points} times in {tock - tick:.2f} seconds. Outputs saved to: {args.output_dir}.")
+		return 0
+	if args.stream is not None:
+		tick = time.time()
+		print(f"Streaming in chunks of {args.stream} steps...")
+		num_points = tpke.modes.stream_solution(input_dict, args.output_dir, fmt=args.format, chunk=args.stream)
+		tock = time.time()
+		print(f"...Wrote {num_points} times in {tock - tick:.2f} seconds. Outputs saved to: {args.output_dir}.")
+		return 0
 	# Otherwise, run normally.
 	tick = time.time()
 	print("Solving...")
-	tpke.modes.solution(input_dict, args.output_dir)
+	tpke.modes.solution(input_dict, args.output_dir, fmt=args.format, save_matrix=args.save_matrix)
 	tock = time.time()
 	print(f"...Completed in {tock - tick:.2f} seconds. Outputs saved to: {args.output_dir}.")
 	return 0
@@ -8,12 +8,12 @@ all attributes of Action instances.
 """
 import argparse
 import os.path
-from tpke.modes import plot_only
-from tpke.yamlin import SCHEMA
+
 
 class SchemaDumpAction(argparse.Action):
 	"""Argparse action to dump the Yamale schema to a YAML file."""
 	def __call__(self, parser, namespace, values, option_string=None):
+		from tpke.yamlin import SCHEMA
 		fname = values
 		if not fname.lower().endswith('.yml'):
 			fname += '.yml'
@@ -26,6 +26,7 @@ class SchemaDumpAction(argparse.Action):
 class PlotOnlyAction(argparse.Action):
 	"""Argparse action to make plots intead of reading."""
 	def __call__(self, parser, namespace, values, option_string=None):
+		from tpke.modes import plot_only
 		fpath = values
 		if not os.path.isdir(fpath):
 			raise NotADirectoryError(fpath)
@@ -0,0 +1,229 @@
+"""
+API
+
+Solve the Point Kinetics Reactor Equations in memory.
+
+	result = tpke.run(config)
+
+returns the solution arrays in a Result, without writing any files
+or making any plots; modes.solution() does both from the Result.
+Matplotlib is never imported, nor yamale when the input is given as
+a dict rather than a path, so this is the entry point for calling
+TPKE many times over from other Python code.
+"""
+import dataclasses
+import os
+import typing
+import numpy as np
+import tpke
+import tpke.keys as K
+from tpke.tping import PathType, T_arr
+
+
+@dataclasses.dataclass
+class Result:
+	"""Solution of one run.
+	
+	Attributes:
+	-----------
+	times: np.ndarray
+		[1 x n] vector of times (s)
+	
+	reactivities: np.ndarray
+		[1 x n] vector of the reactivities at those times ($),
+		including the feedback, if any.
+	
+	powers: np.ndarray
+		[1 x n] vector of powers
+	
+	concentrations: np.ndarray
+		[ndg x n] array of precursor group concentrations
+	
+	temperatures: np.ndarray or None
+		[2 x n] array of the fuel and coolant temperature changes (K),
+		if the input has feedback.
+	
+	metadata: dict
+		Description of the run, as written by the binary output formats.
+	
+	info: dict
+		What the solver reported, if anything: the Krylov 'iterations',
+		'residual' and 'residuals'; the feedback 'iterations', 'jacobians'
+		and 'failed'; or the adaptive 'steps'.
+	
+	system: tuple of (matrix A, vector B) or None
+		The linear system, if it was assembled and requested.
+		For the Krylov solvers, A is the operator.
+	"""
+	times: T_arr
+	reactivities: T_arr
+	powers: T_arr
+	concentrations: T_arr
+	temperatures: typing.Optional[T_arr] = None
+	metadata: dict = dataclasses.field(default_factory=dict)
+	info: dict = dataclasses.field(default_factory=dict)
+	system: typing.Optional[tuple] = None
+	
+	def datasets(self) -> typing.Dict[str, T_arr]:
+		"""The arrays by dataset name, for store.save()."""
+		datasets = {
+			K.DSET_TIME: self.times,
+			K.DSET_RHO: self.reactivities,
+			K.DSET_P: self.powers,
+			K.DSET_C: self.concentrations,
+		}
+		if self.temperatures is not None:
+			datasets[K.DSET_T] = self.temperatures
+		return datasets
+
+
+def run(
+		config: typing.Union[typing.Mapping, str, os.PathLike],
+		keep_system: bool = False
+) -> Result:
+	"""Solve the Point Kinetics Reactor Equations for one input.
+	
+	Parameters:
+	-----------
+	config: dict, or str or PathLike
+		Parsed input, as from yamlin.load_input_file(),
+		or the path to an input file to load.
+	
+	keep_system: bool, optional
+		Whether to keep the linear system in Result.system, for the
+		solvers which build one.
+		[Default: False]
+	
+	Returns:
+	--------
+	Result
+		Times, reactivities, powers, concentrations, and the rest.
+	"""
+	if isinstance(config, PathType):
+		config = tpke.yamlin.load_input_file(config)
+	if K.DATA_FEEDBACK in config[K.DATA]:
+		result = _feedback_solution(config)
+	elif K.TIME_DELTA in config[K.TIME]:
+		result = _fixed_solution(config, keep_system)
+	else:
+		result = _adaptive_solution(config)
+	result.metadata = metadata(config)
+	return result
+
+
+def metadata(config: typing.Mapping) -> dict:
+	"""Describe a run for the binary output formats."""
+	return {
+		"method": config[K.METH],
+		"solver": config.get(K.SOLVER, K.SOLVER_DENSE),
+		"delayed_groups": len(config[K.DATA][K.DATA_B]),
+		"time": dict(config[K.TIME]),
+		"config": config,
+	}
+
+
+def _reactivity_vector(config: typing.Mapping, num_steps: int, dt: float) -> T_arr:
+	rxdict = dict(config[K.REAC])
+	rxtype = rxdict.pop(K.REAC_TYPE)
+	with tpke.profiler.phase("reactivity"):
+		return tpke.reactivity.get_reactivity_vector(r_type=rxtype, n=num_steps, dt=dt, **rxdict)
+
+
+def _fixed_solution(config: typing.Mapping, keep_system: bool = False) -> Result:
+	"""Solve with a uniform timestep."""
+	method_name = config[K.METH].lower()
+	solver_name = config.get(K.SOLVER, K.SOLVER_DENSE).lower()
+	total = config[K.TIME][K.TIME_TOTAL]
+	dt = config[K.TIME][K.TIME_DELTA]
+	num_steps = int(np.ceil(total/dt))  # Will raise total if not divisible
+	times = np.linspace(0, num_steps*dt, num_steps + 1)
+	reactivity_vals = _reactivity_vector(config, num_steps, dt)
+	kinetics = dict(
+		n=num_steps + 1,
+		dt=dt,
+		betas=config[K.DATA][K.DATA_B],
+		lams=config[K.DATA][K.DATA_L],
+		L=config[K.DATA][K.DATA_BIG_L],
+		rho_vec=reactivity_vals.copy()
+	)
+	info = {}
+	system = None
+	if solver_name == K.SOLVER_MARCH:
+		# Step through time without ever forming the global system.
+		method = tpke.marching.METHODS[method_name]
+		with tpke.profiler.phase("solve"):
+			power_vals, concentration_vals = method(**kinetics)
+	elif solver_name in tpke.solver.KRYLOV_SOLVERS:
+		# Apply A without storing it.
+		method = tpke.matrices.OPERATORS[method_name]
+		preconditioner = config.get(K.PRECOND, K.PRECOND_FROZEN).lower()
+		with tpke.profiler.phase("assembly"):
+			opA, matB, precond = method(**kinetics, preconditioner=preconditioner)
+		with tpke.profiler.phase("solve"):
+			power_vals, concentration_vals, info = tpke.solver.krylov(
+				opA, matB, num_steps + 1, M=precond, method=solver_name
+			)
+		if keep_system:
+			system = (opA, matB)
+	else:
+		method = tpke.matrices.METHODS[method_name]
+		solver = tpke.solver.SOLVERS[solver_name]
+		sparse = solver_name in tpke.solver.SPARSE_SOLVERS
+		with tpke.profiler.phase("assembly"):
+			matA, matB = method(**kinetics, sparse=sparse)
+		with tpke.profiler.phase("solve"):
+			power_vals, concentration_vals = solver(matA, matB, num_steps + 1)
+		if keep_system:
+			system = (matA, matB)
+	return Result(times, reactivity_vals, power_vals, concentration_vals, info=info, system=system)
+
+
+def _feedback_solution(config: typing.Mapping) -> Result:
+	"""Solve with temperature feedback, marching with a uniform timestep.
+	
+	The reactivities include the feedback.
+	"""
+	total = config[K.TIME][K.TIME_TOTAL]
+	dt = config[K.TIME][K.TIME_DELTA]
+	num_steps = int(np.ceil(total/dt))  # Will raise total if not divisible
+	times = np.linspace(0, num_steps*dt, num_steps + 1)
+	external_vals = _reactivity_vector(config, num_steps, dt)
+	fb = config[K.DATA][K.DATA_FEEDBACK]
+	with tpke.profiler.phase("solve"):
+		power_vals, concentration_vals, temperatures, reactivity_vals, report = tpke.marching.feedback(
+			n=num_steps + 1,
+			rho_vec=external_vals,
+			dt=dt,
+			betas=config[K.DATA][K.DATA_B],
+			lams=config[K.DATA][K.DATA_L],
+			L=config[K.DATA][K.DATA_BIG_L],
+			alphas=(fb[K.FB_ALPHA_FUEL], fb[K.FB_ALPHA_COOL]),
+			heat_capacities=(fb[K.FB_HEAT_FUEL], fb[K.FB_HEAT_COOL]),
+			heat_transfer=fb[K.FB_TRANSFER],
+			heat_removal=fb[K.FB_REMOVAL],
+			method=config[K.METH],
+		)
+	return Result(times, reactivity_vals, power_vals, concentration_vals, temperatures, info=report)
+
+
+def _adaptive_solution(config: typing.Mapping) -> Result:
+	"""Solve with adaptive timesteps, evaluating the reactivity as needed."""
+	timing = config[K.TIME]
+	total = timing[K.TIME_TOTAL]
+	rxdict = dict(config[K.REAC])
+	rxtype = rxdict.pop(K.REAC_TYPE)
+	# The reactivity is evaluated as the steps are taken.
+	with tpke.profiler.phase("solve"):
+		times, reactivity_vals, power_vals, concentration_vals = tpke.marching.adaptive(
+			total=total,
+			rho_func=tpke.reactivity.get_reactivity_function(rxtype, **rxdict),
+			betas=config[K.DATA][K.DATA_B],
+			lams=config[K.DATA][K.DATA_L],
+			L=config[K.DATA][K.DATA_BIG_L],
+			rtol=timing[K.TIME_RTOL],
+			atol=timing.get(K.TIME_ATOL, 0),
+			dt_min=timing.get(K.TIME_DT_MIN, 0),
+			dt_max=timing.get(K.TIME_DT_MAX, total),
+			method=config[K.METH],
+		)
+	return Result(times, reactivity_vals, power_vals, concentration_vals, info={"steps": len(times) - 1})
@@ -4,6 +4,7 @@ Arguments
 Deal with argument parsing
 """
 import argparse
+import tpke.keys as K
 from tpke.actions import SchemaDumpAction, PlotOnlyAction
 
 
@@ -45,11 +46,39 @@ def get_arguments(args=None) -> argparse.Namespace:
 	                help="Validate the YAML input file and exit.")
 	ap.add_argument('-s', '--dump-schema', action=SchemaDumpAction,
 	                help="Dump the YAML schema to a file and exit.")
+	ap.add_argument('-f', '--format', type=str.lower, default=K.FORMAT_TXT, choices=K.FORMATS,
+	                help="Format to write the results in (default: txt). 'npz' and 'hdf5' "
+	                     "write one binary file with all the arrays and the run metadata.")
+	ap.add_argument('--stream', type=int, nargs="?", const=K.STREAM_CHUNK, default=None,
+	                metavar="CHUNK",
+	                help="March in chunks of CHUNK timesteps (default: %(const)s), appending each "
+	                     "to the output as it is produced, so memory does not grow with the total time. "
+	                     "Writes the 'txt' or 'hdf5' format; plots are skipped.")
+	ap.add_argument('--inverse', type=str, default=None, metavar="TRACE",
+	                help="Find the reactivity behind the (time, power) rows of TRACE (.csv, .txt, .npy, "
+	                     "or '-' for the standard input), using the 'data' block of the input file. "
+	                     "Filters and writes CHUNK rows at a time, as with --stream.")
+	ap.add_argument('--save-matrix', action="store_true", default=False,
+	                help="Also write the linear system: Matrix A as sparse triplets (A.npz) and Vector B.")
+	ap.add_argument('--profile', type=str.lower, nargs="?", const=K.PROFILE_MEMORY, default=None,
+	                choices=K.PROFILE_TYPES,
+	                help="Record the wall time and peak memory of each phase of the run, print a summary, "
+	                     "and write it to profile.json in the output directory. Tracing the memory slows "
+	                     "down Python code; use '--profile time' for the times alone.")
 	ap.add_argument("input_file", type=str,
 	                help="Path to the input YAML file.")
 	ap.add_argument('--study_timesteps', type=float, nargs="+", default=None,
 	                help="Run the same problem with a list of 'dt' values. "
 	                     "Report the difference in the final power vs. the smallest 'dt'. "
 	                     "For best results, the total time should be evenly divisible by all 'dt'.")
+	ap.add_argument('--study-tolerance', type=float, default=None,
+	                help="With --study_timesteps, recommend the largest 'dt' whose final power "
+	                     "is within this relative error of the Richardson-extrapolated power.")
+	ap.add_argument('-j', '--jobs', type=int, default=1,
+	                help="Number of timestep study cases to run in parallel (default: 1).")
+	ap.add_argument('--batch', type=str, nargs="+", default=None,
+	                help="Solve these input files together with 'input_file' in one vectorized pass. "
+	                     "All must share the time options, method, and number of delayed groups. "
+	                     "Each solution is written to a numbered subfolder of the output directory.")
 	
 	return ap.parse_args(args)
\ No newline at end of file
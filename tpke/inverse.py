@@ -0,0 +1,242 @@
+"""
+Inverse
+
+Inverse point kinetics: the reactivity behind a measured power trace.
+
+The precursor equations are linear in P, so with P taken as linear between
+samples they can be integrated exactly from one sample to the next:
+	C_{k+1} = E*C_k + (beta/L)*(w0*P_k + w1*P_{k+1}),  E = exp(-lam*h)
+which costs O(ndg) per sample, whatever the length of the trace.
+The power equation then gives the reactivity at each sample directly:
+	rho = 1 + L/beff * (dP/dt - sum(lam*C)) / P   [$]
+with dP/dt as the backward difference, so that each sample only needs
+the one before it. The trace is processed one chunk at a time, carrying
+the last sample and the precursors over, so it can be fed from a file of
+any size or from a live data feed.
+"""
+
+import itertools
+import os
+import queue
+import sys
+import threading
+import typing
+import numpy as np
+import scipy.signal
+from tpke import keys
+from tpke.marching import _initial_precursors
+from tpke.tping import T_arr
+
+# Steps within this relative spread are treated as evenly spaced,
+# to allow for the rounding of long time stamps.
+UNIFORM_RTOL = 1e-6
+
+
+def _live_lines(f: typing.TextIO, chunk: int, flush: float) -> typing.Iterator[typing.List[str]]:
+	"""Group the lines of a live feed into lists of up to 'chunk' lines.
+	
+	The lines are read as they arrive by a background thread, and those
+	read so far are handed on whenever none has come for 'flush' seconds,
+	instead of waiting for the chunk to fill.
+	"""
+	arrived = queue.Queue()
+	
+	def reader():
+		try:
+			for line in f:
+				arrived.put(line)
+			arrived.put(None)
+		except Exception as e:
+			arrived.put(e)
+	
+	threading.Thread(target=reader, daemon=True).start()
+	lines = []
+	while True:
+		try:
+			line = arrived.get(timeout=flush if lines else None)
+		except queue.Empty:
+			yield lines
+			lines = []
+			continue
+		if isinstance(line, Exception):
+			raise line
+		if line is None:
+			break
+		lines.append(line)
+		if len(lines) == chunk:
+			yield lines
+			lines = []
+	if lines:
+		yield lines
+
+
+def read_trace(
+		fpath: str,
+		chunk: int=keys.STREAM_CHUNK,
+		flush: float=keys.STREAM_FLUSH
+) -> typing.Iterator[typing.Tuple[T_arr, T_arr]]:
+	"""Read a power trace of (time, power) rows, one chunk at a time.
+	
+	A .npy file of shape [n x 2] is memory-mapped. Text files (or '-' for
+	the standard input) are parsed 'chunk' lines at a time by np.loadtxt,
+	comma-separated or not, skipping one header line if there is one.
+	The standard input and pipes are read line by line, and a shorter
+	chunk is yielded once no line has come for 'flush' seconds,
+	so that a live trace is processed as it arrives.
+	
+	Parameters:
+	-----------
+	fpath: str
+		Path to the .npy, .csv, or .txt file, or '-' for the standard input.
+	
+	chunk: int, optional.
+		Number of rows per chunk.
+		[Default: keys.STREAM_CHUNK]
+	
+	flush: float, optional.
+		Seconds to wait for more rows of a live trace.
+		[Default: keys.STREAM_FLUSH]
+	
+	Yields:
+	-------
+	times: np.ndarray
+		[1 x chunk] vector of times (s)
+	
+	powers: np.ndarray
+		[1 x chunk] vector of the powers at those times
+	"""
+	ext = os.path.splitext(fpath)[1].lower()
+	if ext == ".npy":
+		trace = np.load(fpath, mmap_mode='r')
+		if trace.ndim != 2 or trace.shape[1] != 2:
+			raise ValueError(f"Expected rows of (time, power) in: {fpath}")
+		for start in range(0, len(trace), chunk):
+			rows = np.array(trace[start:start + chunk], dtype=float)
+			yield rows[:, 0], rows[:, 1]
+		return
+	f = sys.stdin if fpath == "-" else open(fpath)
+	if fpath == "-" or not os.path.isfile(fpath):
+		batches = _live_lines(f, chunk, flush)
+	else:
+		batches = iter(lambda: list(itertools.islice(f, chunk)), [])
+	try:
+		delimiter = False
+		for lines in batches:
+			if delimiter is False:
+				# Comma-separated or not, as the first line shows.
+				delimiter = "," if "," in lines[0] else None
+				try:
+					[float(x) for x in lines[0].split(delimiter)]
+				except ValueError:
+					lines = lines[1:]
+					if not lines:
+						continue
+			rows = np.loadtxt(lines, delimiter=delimiter, ndmin=2)
+			if not rows.size:
+				continue
+			if rows.shape[1] != 2:
+				raise ValueError(f"Expected rows of (time, power) in: {fpath}")
+			yield rows[:, 0], rows[:, 1]
+	finally:
+		if f is not sys.stdin:
+			f.close()
+
+
+def _precursor_weights(h: T_arr, lams: T_arr) -> typing.Tuple[T_arr, T_arr, T_arr]:
+	"""Exact integration weights of the precursors over steps 'h' with linear P.
+	
+	Returns E, w0, w1, each [ndg x len(h)].
+	"""
+	x = np.outer(lams, h)
+	E = np.exp(-x)
+	one_minus_E = -np.expm1(-x)
+	a = one_minus_E/lams[:, None]           # integral of exp(-lam*(h-s))
+	w1 = (h - a)/x                          # ...times s/h
+	w0 = a - w1
+	return E, w0, w1
+
+
+def stream(
+		chunks: typing.Iterable[typing.Tuple[T_arr, T_arr]],
+		betas: T_arr,
+		lams: T_arr,
+		L: float,
+) -> typing.Iterator[typing.Tuple[T_arr, T_arr, T_arr, T_arr]]:
+	"""Filter a power trace into reactivities, one chunk at a time.
+	
+	The precursors start in equilibrium with the first power, so the first
+	reactivity is 0. Only the last sample and the precursors are carried
+	from one chunk to the next. Chunks with evenly spaced times are
+	filtered with scipy.signal.lfilter(); others sample by sample.
+	
+	Parameters:
+	-----------
+	chunks: iterable of (np.ndarray, np.ndarray)
+		Increasing times (s) and the positive powers at those times,
+		as from read_trace(). They may be of any length.
+	
+	betas: np.ndarray(float)
+		Array of delayed neutron precursor fission yields.
+	
+	lams: np.ndarray(float)
+		Array of delayed neutron precursor decay constants (s^-1).
+	
+	L: float
+		Prompt neutron lifetime (s).
+	
+	Yields:
+	-------
+	times: np.ndarray
+		[1 x chunk] vector of times (s)
+	
+	rhos: np.ndarray
+		[1 x chunk] vector of the reactivities at those times ($)
+	
+	P: np.ndarray
+		[1 x chunk] vector of powers
+	
+	C: np.ndarray
+		[ndg x chunk] array of precursor group concentrations
+	"""
+	betas = np.asarray(betas)
+	lams = np.asarray(lams)
+	beff = betas.sum()
+	sources = betas/L
+	t_last = P_last = C_last = None
+	for times, powers in chunks:
+		times = np.asarray(times, dtype=float)
+		powers = np.asarray(powers, dtype=float)
+		if not times.size:
+			continue
+		if np.any(powers <= 0):
+			raise ValueError("Powers must be >0.")
+		if t_last is None:
+			# Start in equilibrium: the first sample has no past.
+			t_last, P_last = times[0], powers[0]
+			C_last = _initial_precursors(P_last, None, betas, lams, L)
+			yield np.array([t_last]), np.zeros(1), np.array([P_last]), C_last[:, None]
+			times, powers = times[1:], powers[1:]
+			if not times.size:
+				continue
+		h = np.diff(times, prepend=t_last)
+		if np.any(h <= 0):
+			raise ValueError("Times must be strictly increasing.")
+		P_prev = np.concatenate(([P_last], powers[:-1]))
+		if np.ptp(h) <= UNIFORM_RTOL*h[0]:
+			E, w0, w1 = _precursor_weights(h.mean(keepdims=True), lams)
+			u = sources[:, None]*(w0*P_prev + w1*powers)
+			C = np.empty((len(lams), len(times)))
+			for i, e in enumerate(E[:, 0]):
+				C[i], _ = scipy.signal.lfilter([1.0], [1.0, -e], u[i], zi=[e*C_last[i]])
+		else:
+			E, w0, w1 = _precursor_weights(h, lams)
+			u = sources[:, None]*(w0*P_prev + w1*powers)
+			C = np.empty((len(lams), len(times)))
+			c = C_last
+			for k in range(len(times)):
+				c = E[:, k]*c + u[:, k]
+				C[:, k] = c
+		dPdt = (powers - P_prev)/h
+		rhos = 1 + L/beff*(dPdt - lams @ C)/powers
+		yield times, rhos, powers, C
+		t_last, P_last, C_last = times[-1], powers[-1], C[:, -1].copy()
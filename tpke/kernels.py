@@ -0,0 +1,68 @@
+"""
+Kernels
+
+Compiled inner loops for the time-marching solvers.
+
+When Numba is importable, the per-step recurrences of marching.implicit_euler()
+and marching.explicit_euler() run here as compiled loops over the steps and
+groups. Otherwise (or with the environment variable TPKE_DISABLE_JIT set),
+marching falls back to its NumPy loops, which give the same results to
+within rounding. The compiled code is cached next to this file, so only
+the first run pays for compiling it.
+"""
+import functools
+import importlib.util
+import os
+from tpke.tping import T_arr
+
+# Whether marching uses these kernels; may be switched off at run time.
+JIT = importlib.util.find_spec("numba") is not None and not os.environ.get("TPKE_DISABLE_JIT")
+
+
+def _jit(function):
+	"""Compile 'function' with Numba the first time it is called.
+	
+	Numba is only imported then, as it takes a while.
+	"""
+	compiled = None
+	
+	@functools.wraps(function)
+	def dispatch(*args):
+		nonlocal compiled
+		if compiled is None:
+			import numba
+			compiled = numba.njit(cache=True, nogil=True)(function)
+		return compiled(*args)
+	return dispatch
+
+
+@_jit
+def implicit_euler(P: T_arr, C: T_arr, denoms: T_arr, feed: T_arr, decay: T_arr, source: T_arr):
+	"""Fill P[1:] and C[:, 1:] in place; see marching.implicit_euler()."""
+	ndg, n = C.shape
+	c = C[:, 0].copy()
+	for ip in range(n - 1):
+		delayed = 0.0
+		for k in range(ndg):
+			delayed += feed[k]*c[k]
+		p = (P[ip] + delayed)/denoms[ip]
+		P[ip+1] = p
+		for k in range(ndg):
+			c[k] = decay[k]*c[k] + source[k]*p
+			C[k, ip+1] = c[k]
+
+
+@_jit
+def explicit_euler(P: T_arr, C: T_arr, gains: T_arr, feed: T_arr, decay: T_arr, source: T_arr):
+	"""Fill P[1:] and C[:, 1:] in place; see marching.explicit_euler()."""
+	ndg, n = C.shape
+	c = C[:, 0].copy()
+	for ip in range(n - 1):
+		delayed = 0.0
+		for k in range(ndg):
+			delayed += feed[k]*c[k]
+		p = P[ip]
+		P[ip+1] = gains[ip]*p + delayed
+		for k in range(ndg):
+			c[k] = decay[k]*c[k] + source[k]*p
+			C[k, ip+1] = c[k]
@@ -6,22 +6,68 @@ Hardcoding is bad. Use these constants instead.
 
 IMPLICIT_NAMES = ("implicit euler", "implicit", "backward euler", "backward")
 EXPLICIT_NAMES = ("explicit euler", "explicit", "forward euler", "forward")
+CRANK_NICOLSON_NAMES = ("crank-nicolson", "crank nicolson", "trapezoidal", "cn")
+BDF2_NAMES = ("bdf2", "bdf-2", "backward differentiation")
+SDIRK_NAMES = ("sdirk", "sdirk2", "diagonally implicit runge-kutta")
+SDIRK3_NAMES = ("sdirk3", "sdirk-3")
+EXPONENTIAL_NAMES = ("exponential", "exponential integrator", "matrix exponential")
+METHOD_NAMES = (*IMPLICIT_NAMES, *EXPLICIT_NAMES, *CRANK_NICOLSON_NAMES,
+                *BDF2_NAMES, *SDIRK_NAMES, *SDIRK3_NAMES, *EXPONENTIAL_NAMES)
+# Methods of each solver, checked against their tables in matrices and marching,
+# so that inputs can be validated without importing those (and SciPy).
+MATRIX_METHOD_NAMES = (*IMPLICIT_NAMES, *EXPLICIT_NAMES, *CRANK_NICOLSON_NAMES,
+                       *BDF2_NAMES, *SDIRK_NAMES, *SDIRK3_NAMES)
+OPERATOR_METHOD_NAMES = (*IMPLICIT_NAMES, *EXPLICIT_NAMES)
+MARCHING_METHOD_NAMES = METHOD_NAMES
+ADAPTIVE_METHOD_NAMES = (*IMPLICIT_NAMES, *SDIRK_NAMES)
+FEEDBACK_METHOD_NAMES = (*IMPLICIT_NAMES, *CRANK_NICOLSON_NAMES)
 METH = "method"
 
+# Linear solvers
+SOLVER = "solver"
+SOLVER_DENSE = "dense"
+SOLVER_SPARSE = "sparse"
+SOLVER_BANDED = "banded"
+SOLVER_MARCH = "marching"
+SOLVER_GMRES = "gmres"
+SOLVER_BICGSTAB = "bicgstab"
+SOLVER_NAMES = (SOLVER_DENSE, SOLVER_SPARSE, SOLVER_BANDED, SOLVER_GMRES, SOLVER_BICGSTAB, SOLVER_MARCH)
+KRYLOV_SOLVER_NAMES = (SOLVER_GMRES, SOLVER_BICGSTAB)
+PRECOND = "preconditioner"
+PRECOND_FROZEN = "frozen"
+PRECOND_SWEEP = "sweep"
+PRECOND_TYPES = (PRECOND_FROZEN, PRECOND_SWEEP)
+PRECOND_SEGMENTS = 16  # Spans of frozen reactivity for PRECOND_FROZEN
+
 # Reactivity functions
 REAC = "reactivity"
 REAC_TYPE = "type"
 RHO = "rho"
+REAC_START = "start"
+REAC_STOP = "stop"
 STEP = "step"
 RAMP = "ramp"
 RAMP_SLOPE = "slope"
 SINE = "sine"
 SINE_OMEGA = "frequency"
+TABLE = "table"
+TABLE_FILE = "file"
+TABLE_INTERP = "interpolation"
+INTERP_LINEAR = "linear"
+INTERP_PCHIP = "pchip"
+INTERP_TYPES = (INTERP_LINEAR, INTERP_PCHIP)
+TABLE_EXTENSIONS = (".csv", ".txt", ".npy")
+TABLE_CHUNK = 2**18  # Times to interpolate at once
 
 # Time options
 TIME = "time"
 TIME_TOTAL = "total"
 TIME_DELTA = "dt"
+# Adaptive time stepping, instead of TIME_DELTA
+TIME_RTOL = "rtol"
+TIME_ATOL = "atol"
+TIME_DT_MIN = "dt_min"
+TIME_DT_MAX = "dt_max"
 
 # Plot options
 PLOT = "plots"
@@ -33,12 +79,22 @@ PLOT_LINEAR = "linear"
 PLOT_SEMLOG = "semilog"
 PLOT_LOGLOG = "loglog"
 PLOT_TYPES = (PLOT_LINEAR, PLOT_SEMLOG, PLOT_LOGLOG)
+PLOT_POINTS = "max_points"
+PLOT_POINTS_DEFAULT = 4000
 
 # PKRE data inputs
 DATA = "data"
 DATA_B = "delay_fractions"
 DATA_L = "decay_constants"
 DATA_BIG_L = "Lambda"
+# Lumped temperature feedback, in the units of P
+DATA_FEEDBACK = "feedback"
+FB_ALPHA_FUEL = "fuel_coefficient"      # $/K
+FB_ALPHA_COOL = "coolant_coefficient"   # $/K
+FB_HEAT_FUEL = "fuel_heat_capacity"     # P*s/K
+FB_HEAT_COOL = "coolant_heat_capacity"  # P*s/K
+FB_TRANSFER = "heat_transfer"           # P/K, fuel to coolant
+FB_REMOVAL = "heat_removal"             # P/K, from the coolant
 
 # Plot names
 EXT = ".pdf"  # consider making this user-configurable
@@ -52,7 +108,36 @@ FNAME_TIME = "times.txt"
 FNAME_RHO = "reactivities.txt"
 FNAME_P = "powers.txt"
 FNAME_C = "concentrations.txt"
+FNAME_T = "temperatures.txt"
 FNAME_MATRIX_A = "A.txt"
+FNAME_MATRIX_A_SPARSE = "A.npz"
 FNAME_MATRIX_B = "B.txt"
 FNAME_DT = "dt.txt"
+FNAME_RESIDUALS = "residuals.txt"
 FNAME_REPORT = "timestep_report.txt"
+FNAME_PROFILE = "profile.json"
+
+# Output formats
+FORMAT_TXT = "txt"
+FORMAT_NPZ = "npz"
+FORMAT_HDF5 = "hdf5"
+FORMATS = (FORMAT_TXT, FORMAT_NPZ, FORMAT_HDF5)
+FNAME_RESULTS_NPZ = "results.npz"
+FNAME_RESULTS_HDF5 = "results.h5"
+
+# Profiling
+PROFILE_TIME = "time"
+PROFILE_MEMORY = "memory"  # and time
+PROFILE_TYPES = (PROFILE_TIME, PROFILE_MEMORY)
+
+# Number of timesteps per chunk when streaming
+STREAM_CHUNK = 65536
+# Seconds to wait for more of a live trace before filtering what has come
+STREAM_FLUSH = 0.5
+
+# Dataset names
+DSET_TIME = "times"
+DSET_RHO = "reactivities"
+DSET_P = "powers"
+DSET_C = "concentrations"
+DSET_T = "temperatures"
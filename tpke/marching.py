@@ -0,0 +1,1109 @@
+"""
+Marching
+
+Time-marching solvers for Point Kinetics Equations
+
+The time schemes are short recurrences, so there is no need to assemble
+the global system from matrices.py. Each step only couples P and the ndg
+precursor groups at two (or three, for BDF2) consecutive times, which
+costs O(ndg) per step and O(n*ndg) in total.
+
+The exponential integrator and adaptive time stepping are only available here.
+Implicit and explicit Euler run their steps in compiled loops from
+kernels.py when Numba is installed.
+"""
+
+import functools
+import warnings
+import numpy as np
+import scipy.linalg as la
+import typing
+from tpke import keys, kernels
+from tpke.matrices import (
+	_check_inputs, kinetics_matrix,
+	sdirk_propagators, sdirk3_propagators, sdirk3_stage_reactivities, SDIRK_GAMMA)
+from tpke.tping import T_arr
+
+
+def _initial_precursors(P0: float, C0: T_arr, betas: T_arr, lams: T_arr, L: float) -> T_arr:
+	"""Starting precursor concentrations: C0 if given, else in equilibrium with P0."""
+	if C0 is None:
+		return (P0*np.asarray(betas))/(np.asarray(lams)*L)
+	return C0
+
+
+def implicit_euler(
+		n: int,
+		rho_vec: T_arr,
+		dt: float,
+		betas: T_arr,
+		lams: T_arr,
+		L: float,
+		P0: float=1,
+		C0: T_arr=None,
+) -> typing.Tuple[T_arr, T_arr]:
+	"""March the PKE forward using Implicit Euler.
+
+	Each step is the (1+ndg)x(1+ndg) system from matrices.implicit_euler,
+	solved by eliminating the precursors:
+
+		C_{k,n+1} = (C_{k,n} + dt*beta_k/L P_{n+1}) / (1 + dt*lambda_k)
+
+	which leaves a single scalar equation for P_{n+1}.
+
+	Parameters:
+	-----------
+	n: int
+		Number of timesteps
+
+	rho_vec: np.ndarray(float)
+		Array of reactivities at each timestep ($).
+
+	dt: float
+		Timestep size (s).
+
+	betas: np.ndarray(float)
+		Array of delayed neutron precursor fission yields.
+
+	lams: np.ndarray(float)
+		Array of delayed neutron precursor decay constants (s^-1).
+
+	L: float
+		Prompt neutron lifetime (s).
+
+	P0: float, optional.
+		Starting power.
+		[Default: 1]
+
+	C0: np.ndarray(float), optional.
+		Starting precursor concentrations.
+		[Default: None -> in equilibrium with P0]
+
+	Returns:
+	--------
+	P: np.ndarray
+		[1 x n] vector of powers
+
+	C: np.ndarray
+		[ndg x n] array of precursor group concentrations
+	"""
+	_check_inputs(n, rho_vec, betas, lams)
+	ndg = len(betas)    # number of delayed groups
+	beff = sum(betas)   # beta effective
+	rho_vec = np.asarray(rho_vec)*beff  # convert from $
+	P = np.empty(n)
+	C = np.empty((ndg, n))
+	P[0] = P0
+	C[:, 0] = _initial_precursors(P0, C0, betas, lams, L)
+	decay = 1/(1 + dt*lams)     # C_{k,n} -> C_{k,n+1}
+	source = dt*betas/L*decay   # P_{n+1} -> C_{k,n+1}
+	feed = dt*lams*decay        # C_{k,n} -> P_{n+1}
+	denoms = 1 - dt*(rho_vec[1:] - beff)/L - np.dot(dt*lams, source)
+	if kernels.JIT:
+		kernels.implicit_euler(P, C, denoms, feed, decay, source)
+		return P, C
+	for ip in range(n - 1):
+		P[ip+1] = (P[ip] + np.dot(feed, C[:, ip]))/denoms[ip]
+		C[:, ip+1] = decay*C[:, ip] + source*P[ip+1]
+	return P, C
+
+
+def explicit_euler(
+		n: int,
+		rho_vec: T_arr,
+		dt: float,
+		betas: T_arr,
+		lams: T_arr,
+		L: float,
+		P0: float=1,
+		C0: T_arr=None,
+) -> typing.Tuple[T_arr, T_arr]:
+	"""March the PKE forward using Explicit Euler.
+
+	Each step is the direct update from matrices.explicit_euler:
+
+		P_{n+1} = [1 + dt*(rho - beta)/L] P_n + dt*sum(lambda_k C_{k,n})
+		C_{k,n+1} = [1 - dt*lambda_k] C_{k,n} + dt*beta_k/L P_n
+
+	Parameters:
+	-----------
+	n: int
+		Number of timesteps
+
+	rho_vec: np.ndarray(float)
+		Array of reactivities at each timestep ($).
+
+	dt: float
+		Timestep size (s).
+
+	betas: np.ndarray(float)
+		Array of delayed neutron precursor fission yields.
+
+	lams: np.ndarray(float)
+		Array of delayed neutron precursor decay constants (s^-1).
+
+	L: float
+		Prompt neutron lifetime (s).
+
+	P0: float, optional.
+		Starting power.
+		[Default: 1]
+
+	C0: np.ndarray(float), optional.
+		Starting precursor concentrations.
+		[Default: None -> in equilibrium with P0]
+
+	Returns:
+	--------
+	P: np.ndarray
+		[1 x n] vector of powers
+
+	C: np.ndarray
+		[ndg x n] array of precursor group concentrations
+	"""
+	_check_inputs(n, rho_vec, betas, lams)
+	ndg = len(betas)    # number of delayed groups
+	beff = sum(betas)   # beta effective
+	rho_vec = np.asarray(rho_vec)*beff  # convert from $
+	P = np.empty(n)
+	C = np.empty((ndg, n))
+	P[0] = P0
+	C[:, 0] = _initial_precursors(P0, C0, betas, lams, L)
+	decay = 1 - dt*lams     # C_{k,n} -> C_{k,n+1}
+	source = dt*betas/L     # P_n -> C_{k,n+1}
+	feed = dt*lams          # C_{k,n} -> P_{n+1}
+	gains = 1 + dt*(rho_vec[:-1] - beff)/L
+	if kernels.JIT:
+		kernels.explicit_euler(P, C, gains, feed, decay, source)
+		return P, C
+	for ip in range(n - 1):
+		P[ip+1] = gains[ip]*P[ip] + np.dot(feed, C[:, ip])
+		C[:, ip+1] = decay*C[:, ip] + source*P[ip]
+	return P, C
+
+
+def crank_nicolson(
+		n: int,
+		rho_vec: T_arr,
+		dt: float,
+		betas: T_arr,
+		lams: T_arr,
+		L: float,
+		P0: float=1,
+		C0: T_arr=None,
+) -> typing.Tuple[T_arr, T_arr]:
+	"""March the PKE forward using Crank-Nicolson.
+
+	Each step takes the explicit half-step from y_n, then solves the
+	implicit half-step for y_{n+1} as in implicit_euler(), with h = dt/2.
+
+	Parameters:
+	-----------
+	n: int
+		Number of timesteps
+
+	rho_vec: np.ndarray(float)
+		Array of reactivities at each timestep ($).
+
+	dt: float
+		Timestep size (s).
+
+	betas: np.ndarray(float)
+		Array of delayed neutron precursor fission yields.
+
+	lams: np.ndarray(float)
+		Array of delayed neutron precursor decay constants (s^-1).
+
+	L: float
+		Prompt neutron lifetime (s).
+
+	P0: float, optional.
+		Starting power.
+		[Default: 1]
+
+	C0: np.ndarray(float), optional.
+		Starting precursor concentrations.
+		[Default: None -> in equilibrium with P0]
+
+	Returns:
+	--------
+	P: np.ndarray
+		[1 x n] vector of powers
+
+	C: np.ndarray
+		[ndg x n] array of precursor group concentrations
+	"""
+	_check_inputs(n, rho_vec, betas, lams)
+	ndg = len(betas)    # number of delayed groups
+	beff = sum(betas)   # beta effective
+	rho_vec = np.asarray(rho_vec)*beff  # convert from $
+	h = dt/2
+	P = np.empty(n)
+	C = np.empty((ndg, n))
+	P[0] = P0
+	C[:, 0] = _initial_precursors(P0, C0, betas, lams, L)
+	# Explicit half
+	gains = 1 + h*(rho_vec[:-1] - beff)/L
+	# Implicit half
+	decay = 1/(1 + h*lams)
+	source = h*betas/L*decay
+	feed = h*lams*decay
+	denoms = 1 - h*(rho_vec[1:] - beff)/L - np.dot(h*lams, source)
+	for ip in range(n - 1):
+		rhsP = gains[ip]*P[ip] + np.dot(h*lams, C[:, ip])
+		rhsC = (1 - h*lams)*C[:, ip] + h*betas/L*P[ip]
+		P[ip+1] = (rhsP + np.dot(feed, rhsC))/denoms[ip]
+		C[:, ip+1] = decay*rhsC + source*P[ip+1]
+	return P, C
+
+
+def bdf2(
+		n: int,
+		rho_vec: T_arr,
+		dt: float,
+		betas: T_arr,
+		lams: T_arr,
+		L: float,
+		P0: float=1,
+		C0: T_arr=None,
+) -> typing.Tuple[T_arr, T_arr]:
+	"""March the PKE forward using the second-order Backward Differentiation Formula.
+
+		y_{n+1} - 2*dt/3 M_{n+1} y_{n+1} = 4/3 y_n - 1/3 y_{n-1}
+
+	solved as in implicit_euler(), with h = 2*dt/3.
+	The first step is taken with Implicit Euler.
+
+	Parameters:
+	-----------
+	n: int
+		Number of timesteps
+
+	rho_vec: np.ndarray(float)
+		Array of reactivities at each timestep ($).
+
+	dt: float
+		Timestep size (s).
+
+	betas: np.ndarray(float)
+		Array of delayed neutron precursor fission yields.
+
+	lams: np.ndarray(float)
+		Array of delayed neutron precursor decay constants (s^-1).
+
+	L: float
+		Prompt neutron lifetime (s).
+
+	P0: float, optional.
+		Starting power.
+		[Default: 1]
+
+	C0: np.ndarray(float), optional.
+		Starting precursor concentrations.
+		[Default: None -> in equilibrium with P0]
+
+	Returns:
+	--------
+	P: np.ndarray
+		[1 x n] vector of powers
+
+	C: np.ndarray
+		[ndg x n] array of precursor group concentrations
+	"""
+	_check_inputs(n, rho_vec, betas, lams)
+	P, C = implicit_euler(min(n, 2), rho_vec[:2], dt, betas, lams, L, P0, C0)
+	P = np.concatenate((P, np.empty(n - len(P))))
+	C = np.concatenate((C, np.empty((len(betas), n - C.shape[1]))), axis=1)
+	beff = sum(betas)   # beta effective
+	rho_vec = np.asarray(rho_vec)*beff  # convert from $
+	h = 2*dt/3
+	decay = 1/(1 + h*lams)
+	source = h*betas/L*decay
+	feed = h*lams*decay
+	denoms = 1 - h*(rho_vec[1:] - beff)/L - np.dot(h*lams, source)
+	for ip in range(1, n - 1):
+		rhsP = (4*P[ip] - P[ip-1])/3
+		rhsC = (4*C[:, ip] - C[:, ip-1])/3
+		P[ip+1] = (rhsP + np.dot(feed, rhsC))/denoms[ip]
+		C[:, ip+1] = decay*rhsC + source*P[ip+1]
+	return P, C
+
+
+def sdirk(
+		n: int,
+		rho_vec: T_arr,
+		dt: float,
+		betas: T_arr,
+		lams: T_arr,
+		L: float,
+		P0: float=1,
+		C0: T_arr=None,
+		chunk: int=4096,
+) -> typing.Tuple[T_arr, T_arr]:
+	"""March the PKE forward using a 2-stage, L-stable SDIRK method.
+
+	The one-step propagators from matrices.sdirk_propagators()
+	are computed for 'chunk' steps at a time, then applied in turn.
+
+	Parameters:
+	-----------
+	n: int
+		Number of timesteps
+
+	rho_vec: np.ndarray(float)
+		Array of reactivities at each timestep ($).
+
+	dt: float
+		Timestep size (s).
+
+	betas: np.ndarray(float)
+		Array of delayed neutron precursor fission yields.
+
+	lams: np.ndarray(float)
+		Array of delayed neutron precursor decay constants (s^-1).
+
+	L: float
+		Prompt neutron lifetime (s).
+
+	P0: float, optional.
+		Starting power.
+		[Default: 1]
+
+	C0: np.ndarray(float), optional.
+		Starting precursor concentrations.
+		[Default: None -> in equilibrium with P0]
+
+	chunk: int, optional.
+		Number of propagators to compute at once.
+		[Default: 4096]
+
+	Returns:
+	--------
+	P: np.ndarray
+		[1 x n] vector of powers
+
+	C: np.ndarray
+		[ndg x n] array of precursor group concentrations
+	"""
+	_check_inputs(n, rho_vec, betas, lams)
+	rho_vec = np.asarray(rho_vec)*sum(betas)    # convert from $
+	stages = (rho_vec[:-1], rho_vec[1:])
+	return _march_propagators(sdirk_propagators, stages, n, dt, betas, lams, L, P0, C0, chunk)
+
+
+def sdirk3(
+		n: int,
+		rho_vec: T_arr,
+		dt: float,
+		betas: T_arr,
+		lams: T_arr,
+		L: float,
+		P0: float=1,
+		C0: T_arr=None,
+		chunk: int=4096,
+) -> typing.Tuple[T_arr, T_arr]:
+	"""March the PKE forward using a 3-stage, L-stable SDIRK method (third order).
+
+	The one-step propagators from matrices.sdirk3_propagators()
+	are computed for 'chunk' steps at a time, then applied in turn.
+
+	Parameters:
+	-----------
+	n: int
+		Number of timesteps
+
+	rho_vec: np.ndarray(float)
+		Array of reactivities at each timestep ($).
+
+	dt: float
+		Timestep size (s).
+
+	betas: np.ndarray(float)
+		Array of delayed neutron precursor fission yields.
+
+	lams: np.ndarray(float)
+		Array of delayed neutron precursor decay constants (s^-1).
+
+	L: float
+		Prompt neutron lifetime (s).
+
+	P0: float, optional.
+		Starting power.
+		[Default: 1]
+
+	C0: np.ndarray(float), optional.
+		Starting precursor concentrations.
+		[Default: None -> in equilibrium with P0]
+
+	chunk: int, optional.
+		Number of propagators to compute at once.
+		[Default: 4096]
+
+	Returns:
+	--------
+	P: np.ndarray
+		[1 x n] vector of powers
+
+	C: np.ndarray
+		[ndg x n] array of precursor group concentrations
+	"""
+	_check_inputs(n, rho_vec, betas, lams)
+	rho_vec = np.asarray(rho_vec)*sum(betas)    # convert from $
+	stages = sdirk3_stage_reactivities(rho_vec)
+	return _march_propagators(sdirk3_propagators, stages, n, dt, betas, lams, L, P0, C0, chunk)
+
+
+def _march_propagators(propagators, stages, n, dt, betas, lams, L, P0, C0, chunk):
+	"""March a one-step method given by its propagators, 'chunk' steps at a time.
+	
+	'stages' are the reactivities the propagators take, one entry per step.
+	"""
+	ndg = len(betas)    # number of delayed groups
+	Y = np.empty((n, 1 + ndg))
+	Y[0, 0] = P0
+	Y[0, 1:] = _initial_precursors(P0, C0, betas, lams, L)
+	for start in range(0, n - 1, chunk):
+		stop = min(start + chunk, n - 1)
+		S = propagators(*(rho[start:stop] for rho in stages), dt, betas, lams, L)
+		for ip in range(start, stop):
+			Y[ip+1] = S[ip - start] @ Y[ip]
+	return Y[:, 0], Y[:, 1:].T
+
+
+def _propagate(Y: T_arr, start: int, num: int, E: T_arr):
+	"""Fill Y[start+1:start+num+1] from Y[start] with a constant propagator E.
+	
+	Instead of applying E once per step, the rows already known are
+	advanced together by E^S, and E^S is squared to double S.
+	This takes O(log(num)) matrix products.
+	"""
+	done = 0    # Rows filled after 'start'
+	ES = E      # Propagator over S = done + 1 steps
+	while True:
+		S = done + 1
+		count = min(S, num - done)
+		Y[start+S:start+S+count] = Y[start:start+count] @ ES.T
+		done += count
+		if done >= num:
+			return
+		ES = ES @ ES
+
+
+def exponential(
+		n: int,
+		rho_vec: T_arr,
+		dt: float,
+		betas: T_arr,
+		lams: T_arr,
+		L: float,
+		P0: float=1,
+		C0: T_arr=None,
+		cache_size: int=32,
+) -> typing.Tuple[T_arr, T_arr]:
+	"""March the PKE forward using an exponential integrator.
+	
+	The reactivity over each step is held at the average of its endpoints,
+	and the state is advanced exactly by expm(M*dt):
+	
+		y_{n+1} = expm(M(rho_{n+1/2})*dt) y_n
+	
+	This has no time discretisation error for piecewise-constant reactivity.
+	The propagator for each distinct reactivity is cached, and each
+	stretch of constant reactivity is filled by repeated squaring.
+	
+	Parameters:
+	-----------
+	n: int
+		Number of timesteps
+	
+	rho_vec: np.ndarray(float)
+		Array of reactivities at each timestep ($).
+	
+	dt: float
+		Timestep size (s).
+	
+	betas: np.ndarray(float)
+		Array of delayed neutron precursor fission yields.
+	
+	lams: np.ndarray(float)
+		Array of delayed neutron precursor decay constants (s^-1).
+	
+	L: float
+		Prompt neutron lifetime (s).
+	
+	P0: float, optional.
+		Starting power.
+		[Default: 1]
+	
+	C0: np.ndarray(float), optional.
+		Starting precursor concentrations.
+		[Default: None -> in equilibrium with P0]
+	
+	cache_size: int, optional.
+		Number of propagators to keep in the LRU cache.
+		[Default: 32]
+	
+	Returns:
+	--------
+	P: np.ndarray
+		[1 x n] vector of powers
+	
+	C: np.ndarray
+		[ndg x n] array of precursor group concentrations
+	"""
+	_check_inputs(n, rho_vec, betas, lams)
+	ndg = len(betas)    # number of delayed groups
+	beff = sum(betas)   # beta effective
+	rho_vec = np.asarray(rho_vec)*beff  # convert from $
+	rho_mids = (rho_vec[:-1] + rho_vec[1:])/2
+	
+	@functools.lru_cache(maxsize=cache_size)
+	def propagator(rho):
+		return la.expm(dt*kinetics_matrix(rho, betas, lams, L))
+	
+	Y = np.empty((n, 1 + ndg))
+	Y[0, 0] = P0
+	Y[0, 1:] = _initial_precursors(P0, C0, betas, lams, L)
+	# Split the transient into stretches of constant reactivity.
+	changes = np.flatnonzero(np.diff(rho_mids)) + 1
+	starts = np.concatenate(([0], changes))
+	stops = np.concatenate((changes, [n - 1]))
+	for start, stop in zip(starts, stops):
+		if stop > start:
+			_propagate(Y, start, stop - start, propagator(rho_mids[start]))
+	return Y[:, 0], Y[:, 1:].T
+
+
+def batch(
+		n: int,
+		rho_vecs: T_arr,
+		dt: float,
+		betas: T_arr,
+		lams: T_arr,
+		L: T_arr,
+		P0: float=1,
+		method: str=keys.IMPLICIT_NAMES[0],
+) -> typing.Tuple[T_arr, T_arr]:
+	"""March a batch of scenarios forward together.
+	
+	Each step is the theta method (Explicit Euler, Crank-Nicolson, or
+	Implicit Euler) applied to every scenario at once, with the state
+	stored as [batch x (1+ndg)] arrays.
+	All scenarios share the timestep and the number of delayed groups,
+	but may have their own reactivities and kinetics data.
+	
+	Parameters:
+	-----------
+	n: int
+		Number of timesteps
+	
+	rho_vecs: np.ndarray(float)
+		[batch x n] array of reactivities at each timestep ($).
+	
+	dt: float
+		Timestep size (s).
+	
+	betas: np.ndarray(float)
+		[batch x ndg] array of delayed neutron precursor fission yields,
+		or [1 x ndg] if shared.
+	
+	lams: np.ndarray(float)
+		[batch x ndg] array of delayed neutron precursor decay constants (s^-1),
+		or [1 x ndg] if shared.
+	
+	L: float or np.ndarray(float)
+		Prompt neutron lifetimes (s), for each scenario or shared.
+	
+	P0: float or np.ndarray(float), optional.
+		Starting powers, for each scenario or shared.
+		[Default: 1]
+	
+	method: str, optional.
+		Name of the time scheme; see BATCH_METHODS.
+		[Default: 'implicit euler']
+	
+	Returns:
+	--------
+	P: np.ndarray
+		[batch x n] array of powers
+	
+	C: np.ndarray
+		[batch x ndg x n] array of precursor group concentrations
+	"""
+	theta = BATCH_METHODS[method.lower()]
+	rho_vecs = np.atleast_2d(rho_vecs)
+	nb = rho_vecs.shape[0]
+	betas = np.broadcast_to(np.atleast_2d(betas), (nb, np.shape(betas)[-1]))
+	lams = np.broadcast_to(np.atleast_2d(lams), betas.shape)
+	L = np.broadcast_to(L, (nb,))[:, None]
+	assert rho_vecs.shape[1] == n, f"Expected {n} reactivities; got {rho_vecs.shape[1]}."
+	beff = betas.sum(axis=1)[:, None]   # beta effective
+	rho_vecs = rho_vecs*beff            # convert from $
+	P = np.empty((nb, n))
+	C = np.empty((nb, betas.shape[1], n))
+	P[:, 0] = P0
+	C[:, :, 0] = (P[:, :1]*betas)/(lams*L)  # Initial precursor concentrations
+	# Explicit part, y_n -> y_n + (1 - theta)*dt*M_n y_n
+	he = (1 - theta)*dt
+	gains = 1 + he*(rho_vecs[:, :-1] - beff)/L
+	# Implicit part, as in implicit_euler() with h = theta*dt
+	h = theta*dt
+	decay = 1/(1 + h*lams)
+	source = h*betas/L*decay
+	feed = h*lams*decay
+	denoms = 1 - h*(rho_vecs[:, 1:] - beff)/L - np.sum(h*lams*source, axis=1)[:, None]
+	for ip in range(n - 1):
+		Pn = P[:, ip]
+		Cn = C[:, :, ip]
+		rhsP = gains[:, ip]*Pn + np.sum(he*lams*Cn, axis=1)
+		rhsC = (1 - he*lams)*Cn + he*betas/L*Pn[:, None]
+		P[:, ip+1] = (rhsP + np.sum(feed*rhsC, axis=1))/denoms[:, ip]
+		C[:, :, ip+1] = decay*rhsC + source*P[:, ip+1, None]
+	return P, C
+
+
+def feedback(
+		n: int,
+		rho_vec: T_arr,
+		dt: float,
+		betas: T_arr,
+		lams: T_arr,
+		L: float,
+		alphas: T_arr,
+		heat_capacities: T_arr,
+		heat_transfer: float,
+		heat_removal: float,
+		P0: float=1,
+		method: str=keys.IMPLICIT_NAMES[0],
+		rtol: float=1e-10,
+		maxiter: int=8,
+) -> typing.Tuple[T_arr, T_arr, T_arr, T_arr, typing.Dict]:
+	"""March the PKE forward with lumped fuel and coolant temperature feedback.
+	
+	The temperatures are changes from the initial steady state:
+	
+		Cf dTf/dt = (P - P0) - h (Tf - Tc)
+		Cc dTc/dt = h (Tf - Tc) - H Tc
+		rho = rho_ext + alpha_f Tf + alpha_c Tc
+	
+	Each step of the theta method is solved by eliminating the precursors
+	and temperatures, which are linear in P_{n+1}, as in implicit_euler().
+	Since rho*P is bilinear, this leaves one nonlinear equation g(P_{n+1}) = 0,
+	solved by Newton iterations. The derivative g' (the Schur complement of
+	the Jacobian of the step) is kept from step to step, and only re-evaluated
+	when the iterations stop contracting quickly.
+	
+	Parameters:
+	-----------
+	n: int
+		Number of timesteps
+	
+	rho_vec: np.ndarray(float)
+		Array of external reactivities at each timestep ($).
+	
+	dt: float
+		Timestep size (s).
+	
+	betas: np.ndarray(float)
+		Array of delayed neutron precursor fission yields.
+	
+	lams: np.ndarray(float)
+		Array of delayed neutron precursor decay constants (s^-1).
+	
+	L: float
+		Prompt neutron lifetime (s).
+	
+	alphas: np.ndarray(float)
+		Fuel and coolant temperature coefficients ($/K).
+	
+	heat_capacities: np.ndarray(float)
+		Fuel and coolant heat capacities (power*s/K).
+	
+	heat_transfer: float
+		Fuel to coolant heat transfer coefficient, h (power/K).
+	
+	heat_removal: float
+		Heat removed from the coolant per degree, H (power/K).
+	
+	P0: float, optional.
+		Starting power.
+		[Default: 1]
+	
+	method: str, optional.
+		Name of the time scheme; see FEEDBACK_METHODS.
+		[Default: 'implicit euler']
+	
+	rtol: float, optional.
+		Newton iterations stop when the update is within rtol*(|P| + 1).
+		[Default: 1e-10]
+	
+	maxiter: int, optional.
+		Most Newton iterations per step.
+		[Default: 8]
+	
+	Returns:
+	--------
+	P: np.ndarray
+		[1 x n] vector of powers
+	
+	C: np.ndarray
+		[ndg x n] array of precursor group concentrations
+	
+	T: np.ndarray
+		[2 x n] array of fuel and coolant temperature changes (K)
+	
+	rho: np.ndarray
+		[1 x n] vector of the total reactivities ($)
+	
+	report: dict
+		Number of "jacobians" evaluated and Newton "iterations",
+		and the number of steps which "failed" to converge.
+	"""
+	_check_inputs(n, rho_vec, betas, lams)
+	theta = FEEDBACK_METHODS[method.lower()]
+	betas = np.asarray(betas)
+	lams = np.asarray(lams)
+	ndg = len(betas)    # number of delayed groups
+	beff = sum(betas)   # beta effective
+	alphas = np.asarray(alphas, dtype=float)
+	Cf, Cc = heat_capacities
+	rho_vec = np.asarray(rho_vec)
+	# Temperatures: dT/dt = B T + (P - P0)/Cf e_f
+	B = np.array([
+		[-heat_transfer/Cf, heat_transfer/Cf],
+		[heat_transfer/Cc, -(heat_transfer + heat_removal)/Cc],
+	])
+	e_f = np.array([1/Cf, 0])
+	h = theta*dt        # implicit part
+	he = (1 - theta)*dt # explicit part
+	decay = 1/(1 + h*lams)      # C_{k,n} -> C_{k,n+1}
+	source = h*betas/L*decay    # P_{n+1} -> C_{k,n+1}
+	Minv = np.linalg.inv(np.eye(2) - h*B)
+	T_P = h*Minv @ e_f          # P_{n+1} -> T_{n+1}
+	a_P = alphas @ T_P          # P_{n+1} -> feedback reactivity
+	gain = beff/L
+	prompt = 1 + h*gain - h*np.dot(lams, source)
+	
+	P = np.empty(n)
+	C = np.empty((ndg, n))
+	T = np.empty((2, n))
+	P[0] = P0
+	C[:, 0] = _initial_precursors(P0, None, betas, lams, L)
+	T[:, 0] = 0
+	report = {"jacobians": 0, "iterations": 0, "failed": 0}
+	dg = None
+	for ip in range(n - 1):
+		Pn, Cn, Tn = P[ip], C[:, ip], T[:, ip]
+		# Right-hand side: y_n + (1 - theta)*dt*f(y_n)
+		rP, rC, rT = Pn, Cn, Tn
+		if he:
+			rho_n = rho_vec[ip] + alphas @ Tn
+			rP = Pn + he*(gain*(rho_n - 1)*Pn + np.dot(lams, Cn))
+			rC = Cn + he*(betas/L*Pn - lams*Cn)
+			rT = Tn + he*(B @ Tn + (Pn - P0)*e_f)
+		C_r = decay*rC
+		T_r = Minv @ (rT - h*P0*e_f)
+		# g(P) = (prompt - h*gain*rho(P))*P - known, with rho(P) = rho_0 + a_P*P
+		rho_0 = rho_vec[ip+1] + alphas @ T_r
+		known = rP + h*np.dot(lams, C_r)
+		x = 2*Pn - P[ip-1] if ip else Pn  # Linear extrapolation
+		last = np.inf
+		converged = False
+		for i in range(maxiter):
+			g = (prompt - h*gain*(rho_0 + a_P*x))*x - known
+			if dg is None:
+				dg = prompt - h*gain*(rho_0 + 2*a_P*x)
+				report["jacobians"] += 1
+			dx = -g/dg
+			x += dx
+			size = abs(dx)/(rtol*(abs(x) + 1))
+			report["iterations"] += 1
+			if size <= 1:
+				converged = True
+				break
+			if size > 0.1*last:
+				# Contracting too slowly: the derivative is out of date.
+				dg = None
+			last = size
+		report["failed"] += not converged
+		P[ip+1] = x
+		C[:, ip+1] = C_r + source*x
+		T[:, ip+1] = T_r + T_P*x
+	if report["failed"]:
+		warnings.warn(f"Newton iterations did not converge for {report['failed']} steps.",
+		              RuntimeWarning)
+	rhos = rho_vec + alphas @ T
+	return P, C, T, rhos, report
+
+
+def _implicit_euler_step(y, rho_func, t, dt, beff, betas, lams, L):
+	"""Take one Implicit Euler step, and estimate its local error.
+	
+	The error estimate is the difference from the trapezoidal rule,
+	dt/2*(M_{n+1} y_{n+1} - M_n y_n).
+	"""
+	eye = np.eye(len(y))
+	M0 = kinetics_matrix(rho_func(t)*beff, betas, lams, L)
+	M1 = kinetics_matrix(rho_func(t + dt)*beff, betas, lams, L)
+	y1 = np.linalg.solve(eye - dt*M1, y)
+	return y1, dt/2*(M1 @ y1 - M0 @ y)
+
+
+def _sdirk_step(y, rho_func, t, dt, beff, betas, lams, L):
+	"""Take one 2-stage SDIRK step, and estimate its local error.
+	
+	The embedded first-order solution is y_n + dt*k_1,
+	so the error estimate is g*dt*(k_2 - k_1).
+	"""
+	g = SDIRK_GAMMA
+	eye = np.eye(len(y))
+	Mg = kinetics_matrix(rho_func(t + g*dt)*beff, betas, lams, L)
+	M1 = kinetics_matrix(rho_func(t + dt)*beff, betas, lams, L)
+	k1 = Mg @ np.linalg.solve(eye - g*dt*Mg, y)
+	y1 = np.linalg.solve(eye - g*dt*M1, y + (1 - g)*dt*k1)
+	k2 = M1 @ y1
+	return y1, g*dt*(k2 - k1)
+
+
+def adaptive(
+		total: float,
+		rho_func: typing.Callable,
+		betas: T_arr,
+		lams: T_arr,
+		L: float,
+		rtol: float,
+		atol: float,
+		dt_min: float,
+		dt_max: float,
+		method: str=keys.SDIRK_NAMES[0],
+		P0: float=1,
+) -> typing.Tuple[T_arr, T_arr, T_arr, T_arr]:
+	"""March the PKE forward with adaptive time steps.
+	
+	Each step is accepted if its estimated local error, scaled by
+	atol + rtol*|y|, has an RMS norm of at most 1. The next step size is
+	then chosen from the same estimate. The reactivity is evaluated
+	at the times the method needs, rather than on a fixed grid.
+	
+	Parameters:
+	-----------
+	total: float
+		Total time (s).
+	
+	rho_func: callable
+		Reactivity ($) as a function of time (s), for a time or an array of times.
+	
+	betas: np.ndarray(float)
+		Array of delayed neutron precursor fission yields.
+	
+	lams: np.ndarray(float)
+		Array of delayed neutron precursor decay constants (s^-1).
+	
+	L: float
+		Prompt neutron lifetime (s).
+	
+	rtol: float
+		Relative tolerance on the local error.
+	
+	atol: float
+		Absolute tolerance on the local error.
+	
+	dt_min: float
+		Smallest timestep size allowed (s).
+		Steps of this size are accepted even if they fail the tolerance.
+	
+	dt_max: float
+		Largest timestep size allowed (s).
+	
+	method: str, optional.
+		Name of the time scheme; see ADAPTIVE_METHODS.
+		[Default: 'sdirk']
+	
+	P0: float, optional.
+		Starting power.
+		[Default: 1]
+	
+	Returns:
+	--------
+	times: np.ndarray
+		[1 x n] vector of the accepted times (s)
+	
+	rhos: np.ndarray
+		[1 x n] vector of the reactivities at those times ($)
+	
+	P: np.ndarray
+		[1 x n] vector of powers
+	
+	C: np.ndarray
+		[ndg x n] array of precursor group concentrations
+	"""
+	step = ADAPTIVE_METHODS[method.lower()]
+	betas = np.asarray(betas)
+	lams = np.asarray(lams)
+	beff = sum(betas)   # beta effective
+	y = np.concatenate(([P0], (P0*betas)/(lams*L)))
+	times = [0.0]
+	states = [y]
+	t = 0.0
+	dt = min(max(dt_min, total*1e-6), dt_max)
+	n_forced = 0
+	while t < total:
+		last = dt >= total - t
+		if last:
+			dt = total - t
+		y1, est = step(y, rho_func, t, dt, beff, betas, lams, L)
+		scale = atol + rtol*np.maximum(abs(y), abs(y1))
+		err = np.sqrt(np.mean((est/scale)**2))
+		if err <= 1 or dt <= dt_min:
+			n_forced += err > 1
+			t = total if last else t + dt
+			y = y1
+			times.append(t)
+			states.append(y)
+		# Both error estimates are second order in dt.
+		factor = 0.9/np.sqrt(err) if err > 0 else 5
+		dt = min(max(dt*min(max(factor, 0.2), 5), dt_min), dt_max)
+	if n_forced:
+		warnings.warn(f"{n_forced} steps at dt_min={dt_min} did not meet the tolerance.",
+		              RuntimeWarning)
+	times = np.array(times)
+	states = np.array(states)
+	rhos = rho_func(times)
+	return times, rhos, states[:, 0], states[:, 1:].T
+
+
+def stream(
+		total: float,
+		dt: float,
+		rho_func: typing.Callable,
+		betas: T_arr,
+		lams: T_arr,
+		L: float,
+		method: str=keys.IMPLICIT_NAMES[0],
+		chunk: int=keys.STREAM_CHUNK,
+		P0: float=1,
+) -> typing.Iterator[typing.Tuple[T_arr, T_arr, T_arr, T_arr]]:
+	"""March the PKE forward with a fixed timestep, one chunk at a time.
+	
+	Each chunk restarts the method from the last state of the previous one,
+	so only 'chunk' steps are ever held in memory. The reactivity is
+	evaluated for each chunk as it is needed.
+	
+	Parameters:
+	-----------
+	total: float
+		Total time (s).
+	
+	dt: float
+		Timestep size (s).
+	
+	rho_func: callable
+		Reactivity ($) as a function of time (s), for a time or an array of times.
+	
+	betas: np.ndarray(float)
+		Array of delayed neutron precursor fission yields.
+	
+	lams: np.ndarray(float)
+		Array of delayed neutron precursor decay constants (s^-1).
+	
+	L: float
+		Prompt neutron lifetime (s).
+	
+	method: str, optional.
+		Name of the time scheme; see STREAM_METHODS.
+		[Default: 'implicit euler']
+	
+	chunk: int, optional.
+		Number of timesteps per chunk.
+		[Default: keys.STREAM_CHUNK]
+	
+	P0: float, optional.
+		Starting power.
+		[Default: 1]
+	
+	Yields:
+	-------
+	times: np.ndarray
+		[1 x chunk] vector of times (s)
+	
+	rhos: np.ndarray
+		[1 x chunk] vector of the reactivities at those times ($)
+	
+	P: np.ndarray
+		[1 x chunk] vector of powers
+	
+	C: np.ndarray
+		[ndg x chunk] array of precursor group concentrations
+	"""
+	march = STREAM_METHODS[method.lower()]
+	betas = np.asarray(betas)
+	lams = np.asarray(lams)
+	num_steps = int(np.ceil(total/dt))  # Will raise total if not divisible
+	P, C = P0, _initial_precursors(P0, None, betas, lams, L)
+	start = 0
+	while start <= num_steps:
+		stop = min(start + chunk, num_steps + 1)
+		# After the first chunk, march on from the last point already yielded.
+		first = max(start - 1, 0)
+		times = np.arange(first, stop)*dt
+		rhos = rho_func(times)
+		P_chunk, C_chunk = march(len(times), rhos, dt, betas, lams, L, P0=P, C0=C)
+		skip = start - first
+		yield times[skip:], rhos[skip:], P_chunk[skip:], C_chunk[:, skip:]
+		P, C = P_chunk[-1], C_chunk[:, -1].copy()
+		start = stop
+
+
+METHODS = {
+	key: implicit_euler for key in keys.IMPLICIT_NAMES
+} | {
+	key: explicit_euler for key in keys.EXPLICIT_NAMES
+} | {
+	key: crank_nicolson for key in keys.CRANK_NICOLSON_NAMES
+} | {
+	key: bdf2 for key in keys.BDF2_NAMES
+} | {
+	key: sdirk for key in keys.SDIRK_NAMES
+} | {
+	key: sdirk3 for key in keys.SDIRK3_NAMES
+} | {
+	key: exponential for key in keys.EXPONENTIAL_NAMES
+}
+assert set(METHODS) == set(keys.MARCHING_METHOD_NAMES)
+# Methods with an embedded error estimate, for adaptive()
+ADAPTIVE_METHODS = {
+	key: _implicit_euler_step for key in keys.IMPLICIT_NAMES
+} | {
+	key: _sdirk_step for key in keys.SDIRK_NAMES
+}
+assert set(ADAPTIVE_METHODS) == set(keys.ADAPTIVE_METHOD_NAMES)
+# Theta of the methods available for batch()
+BATCH_METHODS = {
+	key: 1.0 for key in keys.IMPLICIT_NAMES
+} | {
+	key: 0.5 for key in keys.CRANK_NICOLSON_NAMES
+} | {
+	key: 0.0 for key in keys.EXPLICIT_NAMES
+}
+# Formal order of accuracy of each method
+ORDERS = {
+	key: 1 for key in (*keys.IMPLICIT_NAMES, *keys.EXPLICIT_NAMES)
+} | {
+	key: 2 for key in (*keys.CRANK_NICOLSON_NAMES, *keys.BDF2_NAMES,
+	                   *keys.SDIRK_NAMES, *keys.EXPONENTIAL_NAMES)
+} | {
+	key: 3 for key in keys.SDIRK3_NAMES
+}
+# BDF2 would drop to first order at each restart, and SDIRK3
+# interpolates the reactivity from the step before.
+STREAM_METHODS = {
+	key: func for key, func in METHODS.items()
+	if key not in (*keys.BDF2_NAMES, *keys.SDIRK3_NAMES)
+}
+# Theta of the methods available for feedback()
+FEEDBACK_METHODS = {
+	key: 1.0 for key in keys.IMPLICIT_NAMES
+} | {
+	key: 0.5 for key in keys.CRANK_NICOLSON_NAMES
+}
+assert set(FEEDBACK_METHODS) == set(keys.FEEDBACK_METHOD_NAMES)
@@ -5,12 +5,14 @@ Matrix builders for Point Kinetics Equations
 """
 
 import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
 import typing
 from tpke import keys
 from tpke.tping import T_arr
 
 
-def __check_inputs(n, rho_vec, betas, lams):
+def _check_inputs(n, rho_vec, betas, lams):
     """Check the lenghts of inputs for matrix builders."""
     len_rho = len(rho_vec)
     assert len_rho == n, f"Expected {n} reactivities; got {len_rho}."
@@ -21,6 +23,68 @@ def __check_inputs(n, rho_vec, betas, lams):
          f"number of delayed neutron decay constants ({len_lams}).")
 
 
+def _assemble(size, entries, sparse=False):
+    """Assemble a square matrix from (row, col, value) entries.
+    
+    Each entry is a tuple of broadcastable arrays of row indices,
+    column indices, and values, so that whole blocks of the matrix
+    can be placed at once without looping over timesteps or groups.
+    
+    Parameters:
+    -----------
+    size: int
+        Size of the square matrix.
+    
+    entries: iterable of (array-like, array-like, array-like)
+        (rows, cols, values) to place in the matrix.
+        No (row, col) position may be repeated.
+    
+    sparse: bool, optional.
+        Whether to return a scipy.sparse CSR matrix.
+        [Default: False]
+    
+    Returns:
+    --------
+    A: np.ndarray or scipy.sparse.csr_matrix
+        Square [size x size] matrix.
+    """
+    triplets = [np.broadcast_arrays(*entry) for entry in entries]
+    rows, cols, vals = (np.concatenate([t[i].ravel() for t in triplets]) for i in range(3))
+    if sparse:
+        A = sp.csr_matrix((vals, (rows, cols)), shape=(size, size))
+        A.eliminate_zeros()
+        return A
+    A = np.zeros((size, size))
+    A[rows, cols] = vals
+    return A
+
+
+def _initial_conditions(n, betas, lams, L, P0):
+    """Get the entries of A and the vector B for the initial conditions.
+    
+    Returns:
+    --------
+    entries: list of (rows, cols, values)
+        Matrix entries for the initial condition rows of A.
+    
+    B: np.ndarray
+        Vector [Nx1] array, for RHS of matrix solution.
+    """
+    ndg = len(betas)
+    k = np.arange(ndg)
+    B = np.zeros((1 + ndg)*n)
+    C0s = (P0*betas)/(lams*L)  # Initial precursor concentrations
+    # Initial Condition: P
+    B[n-1] = P0
+    # Initial Condition: C
+    B[n*(k+2)-1] = C0s
+    entries = [
+        (n-1, 0, 1),
+        (n*(k+2)-1, n*(k+1), 1),
+    ]
+    return entries, B
+
+
 def implicit_euler(
         n: int,
         rho_vec: T_arr,
@@ -29,6 +93,7 @@ def implicit_euler(
         lams: T_arr,
         L: float,
         P0: float=1,
+        sparse: bool=False,
 ) -> typing.Tuple[T_arr, T_arr]:
     """Build A and B matrices using Implicit Euler.
     
@@ -64,43 +129,41 @@ def implicit_euler(
         Starting power.
         [Default: 1]
     
+    sparse: bool, optional.
+        Whether to assemble A as a scipy.sparse CSR matrix.
+        Memory then scales with the number of nonzeros, O(n*ndg).
+        [Default: False]
+    
     Returns:
     --------
-    A: np.ndarray
+    A: np.ndarray or scipy.sparse.csr_matrix
         Square [NxN] array, for LHS of matrix solution.
     
     B: np.ndarray
         Vector [Nx1] array, for RHS of matrix solution.
     """
-    __check_inputs(n, rho_vec, betas, lams)
+    _check_inputs(n, rho_vec, betas, lams)
     ndg = len(betas)    # number of delayed groups
     beff = sum(betas)   # beta effective
     rho_vec *= beff     # convert from $
     size = (1 + ndg)*n
-    A = np.zeros((size, size))
-    B = np.zeros(size)
-    C0s = (P0*betas)/(lams*L)  # Initial precursor concentrations
-    for ip in range(n-1):
-        rho1 = rho_vec[ip+1]
-        dtrbl = dt*(rho1 - beff)/L
+    ip = np.arange(n-1)             # P_n
+    ic = ip + n*(np.arange(ndg)[:, None] + 1)    # C_{k,n}; [ndg x n-1]
+    lams_k = np.asarray(lams)[:, None]
+    betas_k = np.asarray(betas)[:, None]
+    dtrbl = dt*(rho_vec[1:] - beff)/L
+    entries, B = _initial_conditions(n, betas, lams, L, P0)
+    entries += [
         # P, normal nodes
-        A[ip, ip] = -1            # P_n
-        A[ip, ip+1] =  1 - dtrbl  # P_{n+1}
-        for k in range(ndg):
-            ic = ip + n*(k+1)
-            A[ip, ic+1] = -dt*lams[k]       # C_{k,n+1}
-            # C, normal nodes
-            A[ic, ip+1] = -dt*betas[k]/L    # P_{n+1}
-            A[ic, ic] = -1                  # C_{n,k}
-            A[ic, ic+1] = 1 + dt*lams[k]    # C_{n,k+1}
-    # Boundary Conditions
-    # Initial Condition: P
-    A[n-1, 0] = 1
-    B[n-1] = P0
-    # Initial Condition: C
-    for k in range(ndg):
-        A[n*(k+2)-1, n*(k+1)] = 1
-        B[n*(k+2)-1] = C0s[k]
+        (ip, ip, -1),                   # P_n
+        (ip, ip+1, 1 - dtrbl),          # P_{n+1}
+        (ip, ic+1, -dt*lams_k),         # C_{k,n+1}
+        # C, normal nodes
+        (ic, ip+1, -dt*betas_k/L),      # P_{n+1}
+        (ic, ic, -1),                   # C_{n,k}
+        (ic, ic+1, 1 + dt*lams_k),      # C_{n,k+1}
+    ]
+    A = _assemble(size, entries, sparse)
     return A, B
 
 
@@ -112,6 +175,7 @@ def explicit_euler(
         lams: T_arr,
         L: float,
         P0: float = 1,
+        sparse: bool = False,
 ) -> typing.Tuple[T_arr, T_arr]:
     """Build A and B matrices using Explicit Euler.
 
@@ -147,43 +211,530 @@ def explicit_euler(
         Starting power.
         [Default: 1]
 
+    sparse: bool, optional.
+        Whether to assemble A as a scipy.sparse CSR matrix.
+        Memory then scales with the number of nonzeros, O(n*ndg).
+        [Default: False]
+
     Returns:
     --------
-    A: np.ndarray
+    A: np.ndarray or scipy.sparse.csr_matrix
         Square [NxN] array, for LHS of matrix solution.
 
     B: np.ndarray
         Vector [Nx1] array, for RHS of matrix solution.
     """
-    __check_inputs(n, rho_vec, betas, lams)
+    _check_inputs(n, rho_vec, betas, lams)
     ndg = len(betas)    # number of delayed groups
     beff = sum(betas)   # beta effective
     rho_vec *= beff     # convert from $
     size = (1 + ndg)*n
-    A = np.zeros((size, size))
-    B = np.zeros(size)
-    C0s = (P0*betas)/(lams*L)  # Initial precursor concentrations
-    for ip in range(n - 1):
-        rho0 = rho_vec[ip]
-        dtrbl = dt*(rho0 - beff)/L
+    ip = np.arange(n-1)             # P_n
+    ic = ip + n*(np.arange(ndg)[:, None] + 1)    # C_{k,n}; [ndg x n-1]
+    lams_k = np.asarray(lams)[:, None]
+    betas_k = np.asarray(betas)[:, None]
+    dtrbl = dt*(rho_vec[:-1] - beff)/L
+    entries, B = _initial_conditions(n, betas, lams, L, P0)
+    entries += [
         # P, normal nodes
-        A[ip, ip] = -1 - dtrbl  # P_n
-        A[ip, ip+1] = 1         # P_{n+1}
-        for k in range(ndg):
-            ic = ip + n*(k + 1)
-            A[ip, ic] = -dt*lams[k]     # C_{k,n}
-            # C, normal nodes
-            A[ic, ip] = -dt*betas[k]/L  # P_{n}
-            A[ic, ic] = -1 + dt*lams[k] # C_{k,n}
-            A[ic, ic+1] = 1             # next C
-    # Boundary Conditions
-    # Initial Condition: P
-    A[n-1, 0] = 1
-    B[n-1] = P0
-    # Initial Condition: C
-    for k in range(ndg):
-        A[n*(k+2)-1, n*(k+1)] = 1
-        B[n*(k+2)-1] = C0s[k]
+        (ip, ip, -1 - dtrbl),           # P_n
+        (ip, ip+1, 1),                  # P_{n+1}
+        (ip, ic, -dt*lams_k),           # C_{k,n}
+        # C, normal nodes
+        (ic, ip, -dt*betas_k/L),        # P_{n}
+        (ic, ic, -1 + dt*lams_k),       # C_{k,n}
+        (ic, ic+1, 1),                  # next C
+    ]
+    A = _assemble(size, entries, sparse)
+    return A, B
+
+
+def crank_nicolson(
+        n: int,
+        rho_vec: T_arr,
+        dt: float,
+        betas: T_arr,
+        lams: T_arr,
+        L: float,
+        P0: float = 1,
+        sparse: bool = False,
+) -> typing.Tuple[T_arr, T_arr]:
+    """Build A and B matrices using Crank-Nicolson (second order).
+
+    Example for 1 delayed group, with h = dt/2:
+
+        [-1 - h*(rho_n - beta)/L] P_n  +  [1 - h*(rho_{n+1} - beta)/L] P_{n+1}  +  [-h*lambda_k] (C_{k,n} + C_{k,n+1}) = 0
+        [+1]                      P_0                                                                                 = P0
+        [-h*beta_k/Lambda] (P_n + P_{n+1})  +  [-1 + h*lambda_k] C_{k,n}  +  [1 + h*lambda_k] C_{k,n+1}             = 0
+                                                                [+1] C_{k,n}                                          = C0_k
+
+
+    Parameters:
+    -----------
+    n: int
+        Number of timesteps
+
+    rho_vec: np.ndarray(float)
+        Array of reactivities at each timestep ($).
+
+    dt: float
+        Timestep size (s).
+
+    betas: np.ndarray(float)
+        Array of delayed neutron precursor fission yields.
+
+    lams: np.ndarray(float)
+        Array of delayed neutron precursor decay constants (s^-1).
+
+    L: float
+        Prompt neutron lifetime (s).
+
+    P0: float, optional.
+        Starting power.
+        [Default: 1]
+
+    sparse: bool, optional.
+        Whether to assemble A as a scipy.sparse CSR matrix.
+        [Default: False]
+
+    Returns:
+    --------
+    A: np.ndarray or scipy.sparse.csr_matrix
+        Square [NxN] array, for LHS of matrix solution.
+
+    B: np.ndarray
+        Vector [Nx1] array, for RHS of matrix solution.
+    """
+    _check_inputs(n, rho_vec, betas, lams)
+    ndg = len(betas)    # number of delayed groups
+    beff = sum(betas)   # beta effective
+    rho_vec *= beff     # convert from $
+    size = (1 + ndg)*n
+    h = dt/2
+    ip = np.arange(n-1)             # P_n
+    ic = ip + n*(np.arange(ndg)[:, None] + 1)    # C_{k,n}; [ndg x n-1]
+    lams_k = np.asarray(lams)[:, None]
+    betas_k = np.asarray(betas)[:, None]
+    hrbl0 = h*(rho_vec[:-1] - beff)/L
+    hrbl1 = h*(rho_vec[1:] - beff)/L
+    entries, B = _initial_conditions(n, betas, lams, L, P0)
+    entries += [
+        # P, normal nodes
+        (ip, ip, -1 - hrbl0),           # P_n
+        (ip, ip+1, 1 - hrbl1),          # P_{n+1}
+        (ip, ic, -h*lams_k),            # C_{k,n}
+        (ip, ic+1, -h*lams_k),          # C_{k,n+1}
+        # C, normal nodes
+        (ic, ip, -h*betas_k/L),         # P_n
+        (ic, ip+1, -h*betas_k/L),       # P_{n+1}
+        (ic, ic, -1 + h*lams_k),        # C_{k,n}
+        (ic, ic+1, 1 + h*lams_k),       # C_{k,n+1}
+    ]
+    A = _assemble(size, entries, sparse)
+    return A, B
+
+
+def bdf2(
+        n: int,
+        rho_vec: T_arr,
+        dt: float,
+        betas: T_arr,
+        lams: T_arr,
+        L: float,
+        P0: float = 1,
+        sparse: bool = False,
+) -> typing.Tuple[T_arr, T_arr]:
+    """Build A and B matrices using the second-order Backward Differentiation Formula.
+
+    Example for 1 delayed group, with h = 2*dt/3:
+
+        [+1/3] P_{n-1}  +  [-4/3] P_n  +  [1 - h*(rho - beta)/L] P_{n+1}  +  [-h*lambda_k] C_{k,n+1}          = 0
+        [+1]   P_0                                                                                            = P0
+        [-h*beta_k/Lambda] P_{n+1}  +  [+1/3] C_{k,n-1}  +  [-4/3] C_{k,n}  +  [1 + h*lambda_k] C_{k,n+1}     = 0
+                                                            [+1] C_{k,n}                                      = C0_k
+
+    The first step, which has no P_{n-1}, is taken with Implicit Euler.
+
+
+    Parameters:
+    -----------
+    n: int
+        Number of timesteps
+
+    rho_vec: np.ndarray(float)
+        Array of reactivities at each timestep ($).
+
+    dt: float
+        Timestep size (s).
+
+    betas: np.ndarray(float)
+        Array of delayed neutron precursor fission yields.
+
+    lams: np.ndarray(float)
+        Array of delayed neutron precursor decay constants (s^-1).
+
+    L: float
+        Prompt neutron lifetime (s).
+
+    P0: float, optional.
+        Starting power.
+        [Default: 1]
+
+    sparse: bool, optional.
+        Whether to assemble A as a scipy.sparse CSR matrix.
+        [Default: False]
+
+    Returns:
+    --------
+    A: np.ndarray or scipy.sparse.csr_matrix
+        Square [NxN] array, for LHS of matrix solution.
+
+    B: np.ndarray
+        Vector [Nx1] array, for RHS of matrix solution.
+    """
+    _check_inputs(n, rho_vec, betas, lams)
+    ndg = len(betas)    # number of delayed groups
+    beff = sum(betas)   # beta effective
+    rho_vec *= beff     # convert from $
+    size = (1 + ndg)*n
+    ip = np.arange(n-1)             # P_n
+    ic = ip + n*(np.arange(ndg)[:, None] + 1)    # C_{k,n}; [ndg x n-1]
+    lams_k = np.asarray(lams)[:, None]
+    betas_k = np.asarray(betas)[:, None]
+    # Implicit Euler for the first step; BDF2 afterwards
+    h = np.full(n-1, 2*dt/3)
+    h[0] = dt
+    now = np.full(n-1, -4/3)
+    now[0] = -1
+    hrbl = h*(rho_vec[1:] - beff)/L
+    entries, B = _initial_conditions(n, betas, lams, L, P0)
+    entries += [
+        # P, normal nodes
+        (ip[1:], ip[1:]-1, 1/3),        # P_{n-1}
+        (ip, ip, now),                  # P_n
+        (ip, ip+1, 1 - hrbl),           # P_{n+1}
+        (ip, ic+1, -h*lams_k),          # C_{k,n+1}
+        # C, normal nodes
+        (ic, ip+1, -h*betas_k/L),       # P_{n+1}
+        (ic[:, 1:], ic[:, 1:]-1, 1/3),  # C_{k,n-1}
+        (ic, ic, now),                  # C_{k,n}
+        (ic, ic+1, 1 + h*lams_k),       # C_{k,n+1}
+    ]
+    A = _assemble(size, entries, sparse)
+    return A, B
+
+
+def kinetics_matrix(rho, betas: T_arr, lams: T_arr, L: float) -> T_arr:
+    """Get the matrix M of the point kinetics equations, dy/dt = M y
+
+    The state is y = [P, C_1, ..., C_ndg].
+
+    Parameters:
+    -----------
+    rho: float or np.ndarray(float)
+        Reactivity (absolute, not $), or an array of them.
+
+    betas: np.ndarray(float)
+        Array of delayed neutron precursor fission yields.
+
+    lams: np.ndarray(float)
+        Array of delayed neutron precursor decay constants (s^-1).
+
+    L: float
+        Prompt neutron lifetime (s).
+
+    Returns:
+    --------
+    M: np.ndarray
+        Square [(1+ndg) x (1+ndg)] array, or a stack of them
+        with the same leading shape as 'rho'.
+    """
+    rho = np.asarray(rho, dtype=float)
+    ndg = len(betas)
+    M = np.zeros(rho.shape + (1 + ndg, 1 + ndg))
+    M[..., 0, 0] = (rho - sum(betas))/L
+    M[..., 0, 1:] = lams
+    M[..., 1:, 0] = np.asarray(betas)/L
+    M[..., 1:, 1:] = np.diag(-np.asarray(lams))
+    return M
+
+
+SDIRK_GAMMA = 1 - 1/np.sqrt(2)
+
+
+def sdirk_propagators(
+        rho0: T_arr,
+        rho1: T_arr,
+        dt: float,
+        betas: T_arr,
+        lams: T_arr,
+        L: float,
+) -> T_arr:
+    """Get the one-step propagators of the 2-stage, L-stable SDIRK method.
+
+    With g = 1 - 1/sqrt(2), and the reactivity interpolated linearly
+    to the first stage at t + g*dt:
+
+        (I - g*dt*M_g) Y_1 = y_n
+        (I - g*dt*M_1) y_{n+1} = y_n + (1 - g)*dt*M_g Y_1
+
+    so that y_{n+1} = S y_n.
+
+    Parameters:
+    -----------
+    rho0, rho1: np.ndarray(float)
+        Reactivities (absolute, not $) at the start and end of each step.
+
+    dt: float
+        Timestep size (s).
+
+    betas: np.ndarray(float)
+        Array of delayed neutron precursor fission yields.
+
+    lams: np.ndarray(float)
+        Array of delayed neutron precursor decay constants (s^-1).
+
+    L: float
+        Prompt neutron lifetime (s).
+
+    Returns:
+    --------
+    S: np.ndarray
+        Stack of [(1+ndg) x (1+ndg)] propagators, one per step.
+    """
+    g = SDIRK_GAMMA
+    rho0 = np.asarray(rho0)
+    rho1 = np.asarray(rho1)
+    eye = np.eye(1 + len(betas))
+    Mg = kinetics_matrix((1 - g)*rho0 + g*rho1, betas, lams, L)
+    M1 = kinetics_matrix(rho1, betas, lams, L)
+    Y1 = np.linalg.solve(eye - g*dt*Mg, np.broadcast_to(eye, Mg.shape))
+    return np.linalg.solve(eye - g*dt*M1, eye + (1 - g)*dt*(Mg @ Y1))
+
+
+def sdirk(
+        n: int,
+        rho_vec: T_arr,
+        dt: float,
+        betas: T_arr,
+        lams: T_arr,
+        L: float,
+        P0: float = 1,
+        sparse: bool = False,
+) -> typing.Tuple[T_arr, T_arr]:
+    """Build A and B matrices using a 2-stage SDIRK method (second order).
+
+    The stages are eliminated within each step (see sdirk_propagators()),
+    so each step is a full [(1+ndg) x (1+ndg)] block:
+
+        [-S_n] y_n  +  [I] y_{n+1} = 0
+        [I]    y_0                 = [P0, C0_k]
+
+
+    Parameters:
+    -----------
+    n: int
+        Number of timesteps
+
+    rho_vec: np.ndarray(float)
+        Array of reactivities at each timestep ($).
+
+    dt: float
+        Timestep size (s).
+
+    betas: np.ndarray(float)
+        Array of delayed neutron precursor fission yields.
+
+    lams: np.ndarray(float)
+        Array of delayed neutron precursor decay constants (s^-1).
+
+    L: float
+        Prompt neutron lifetime (s).
+
+    P0: float, optional.
+        Starting power.
+        [Default: 1]
+
+    sparse: bool, optional.
+        Whether to assemble A as a scipy.sparse CSR matrix.
+        [Default: False]
+
+    Returns:
+    --------
+    A: np.ndarray or scipy.sparse.csr_matrix
+        Square [NxN] array, for LHS of matrix solution.
+
+    B: np.ndarray
+        Vector [Nx1] array, for RHS of matrix solution.
+    """
+    _check_inputs(n, rho_vec, betas, lams)
+    rho_vec *= sum(betas)   # convert from $
+    S = sdirk_propagators(rho_vec[:-1], rho_vec[1:], dt, betas, lams, L)
+    return _propagator_system(S, n, betas, lams, L, P0, sparse)
+
+
+SDIRK3_GAMMA = 0.43586652150845899942
+
+
+def sdirk3_stage_reactivities(rho_vec: T_arr) -> typing.Tuple[T_arr, T_arr, T_arr]:
+    """Interpolate the reactivity to the stages of sdirk3_propagators().
+
+    Linear interpolation would limit the method to second order, so the
+    reactivity is interpolated quadratically through rho_{n-1}, rho_n and
+    rho_{n+1} (rho_0, rho_1 and rho_2 for the first step).
+
+    Parameters:
+    -----------
+    rho_vec: np.ndarray(float)
+        Array of reactivities at each timestep.
+
+    Returns:
+    --------
+    rho1, rho2, rho3: np.ndarray
+        Reactivities at the three stages of each step.
+    """
+    rho_vec = np.asarray(rho_vec)
+    g = SDIRK3_GAMMA
+    c = np.array([g, (1 + g)/2])[:, None]
+    if len(rho_vec) < 3:
+        rho0, rho1 = rho_vec[:-1], rho_vec[1:]
+        return (*((1 - c)*rho0 + c*rho1), rho1)
+    # Nodes at -1, 0, 1 steps for the stencil behind, 0, 1, 2 ahead
+    behind = (c*(c - 1)/2*rho_vec[:-2] + (1 - c)*(1 + c)*rho_vec[1:-1]
+              + c*(c + 1)/2*rho_vec[2:])
+    ahead = ((c - 1)*(c - 2)/2*rho_vec[0] + c*(2 - c)*rho_vec[1]
+             + c*(c - 1)/2*rho_vec[2])
+    stages = np.concatenate((ahead, behind), axis=1)
+    return stages[0], stages[1], rho_vec[1:]
+
+
+def sdirk3_propagators(
+        rho1: T_arr,
+        rho2: T_arr,
+        rho3: T_arr,
+        dt: float,
+        betas: T_arr,
+        lams: T_arr,
+        L: float,
+) -> T_arr:
+    """Get the one-step propagators of the 3-stage, L-stable SDIRK method.
+
+    This is Alexander's third-order method, with g the root of
+    g^3 - 3g^2 + 3g/2 - 1/6 = 0 in (1/6, 1/2), and M_i evaluated
+    at the stage times t + c_i*dt:
+
+        (I - g*dt*M_1) Y_1 = y_n
+        (I - g*dt*M_2) Y_2 = y_n + a21*dt*M_1 Y_1
+        (I - g*dt*M_3) y_{n+1} = y_n + dt*(b1*M_1 Y_1 + b2*M_2 Y_2)
+
+    with c = (g, (1 + g)/2, 1), so that y_{n+1} = S y_n.
+
+    Parameters:
+    -----------
+    rho1, rho2, rho3: np.ndarray(float)
+        Reactivities (absolute, not $) at the stages of each step;
+        see sdirk3_stage_reactivities().
+
+    dt: float
+        Timestep size (s).
+
+    betas: np.ndarray(float)
+        Array of delayed neutron precursor fission yields.
+
+    lams: np.ndarray(float)
+        Array of delayed neutron precursor decay constants (s^-1).
+
+    L: float
+        Prompt neutron lifetime (s).
+
+    Returns:
+    --------
+    S: np.ndarray
+        Stack of [(1+ndg) x (1+ndg)] propagators, one per step.
+    """
+    g = SDIRK3_GAMMA
+    a21 = (1 - g)/2
+    b1 = -(6*g**2 - 16*g + 1)/4
+    b2 = (6*g**2 - 20*g + 5)/4
+    eye = np.eye(1 + len(betas))
+    M1 = kinetics_matrix(np.asarray(rho1), betas, lams, L)
+    M2 = kinetics_matrix(np.asarray(rho2), betas, lams, L)
+    M3 = kinetics_matrix(np.asarray(rho3), betas, lams, L)
+    K1 = M1 @ np.linalg.solve(eye - g*dt*M1, np.broadcast_to(eye, M1.shape))
+    K2 = M2 @ np.linalg.solve(eye - g*dt*M2, eye + a21*dt*K1)
+    return np.linalg.solve(eye - g*dt*M3, eye + dt*(b1*K1 + b2*K2))
+
+
+def sdirk3(
+        n: int,
+        rho_vec: T_arr,
+        dt: float,
+        betas: T_arr,
+        lams: T_arr,
+        L: float,
+        P0: float = 1,
+        sparse: bool = False,
+) -> typing.Tuple[T_arr, T_arr]:
+    """Build A and B matrices using a 3-stage SDIRK method (third order).
+
+    The stages are eliminated within each step (see sdirk3_propagators()),
+    and the system is laid out as in sdirk().
+
+
+    Parameters:
+    -----------
+    n: int
+        Number of timesteps
+
+    rho_vec: np.ndarray(float)
+        Array of reactivities at each timestep ($).
+
+    dt: float
+        Timestep size (s).
+
+    betas: np.ndarray(float)
+        Array of delayed neutron precursor fission yields.
+
+    lams: np.ndarray(float)
+        Array of delayed neutron precursor decay constants (s^-1).
+
+    L: float
+        Prompt neutron lifetime (s).
+
+    P0: float, optional.
+        Starting power.
+        [Default: 1]
+
+    sparse: bool, optional.
+        Whether to assemble A as a scipy.sparse CSR matrix.
+        [Default: False]
+
+    Returns:
+    --------
+    A: np.ndarray or scipy.sparse.csr_matrix
+        Square [NxN] array, for LHS of matrix solution.
+
+    B: np.ndarray
+        Vector [Nx1] array, for RHS of matrix solution.
+    """
+    _check_inputs(n, rho_vec, betas, lams)
+    rho_vec *= sum(betas)   # convert from $
+    S = sdirk3_propagators(*sdirk3_stage_reactivities(rho_vec), dt, betas, lams, L)
+    return _propagator_system(S, n, betas, lams, L, P0, sparse)
+
+
+def _propagator_system(S, n, betas, lams, L, P0, sparse):
+    """Build A and B for a one-step method from its propagators S."""
+    ndg = len(betas)    # number of delayed groups
+    size = (1 + ndg)*n
+    ip = np.arange(n-1)[:, None, None]
+    var = n*np.arange(1 + ndg)
+    entries, B = _initial_conditions(n, betas, lams, L, P0)
+    entries += [
+        (ip + var[:, None], ip + var, -S),              # y_n
+        (ip[:, 0] + var, ip[:, 0] + var + 1, 1),        # y_{n+1}
+    ]
+    A = _assemble(size, entries, sparse)
     return A, B
 
 
@@ -191,5 +742,282 @@ METHODS = {
 	key: implicit_euler for key in keys.IMPLICIT_NAMES
 } | {
 	key: explicit_euler for key in keys.EXPLICIT_NAMES
+} | {
+	key: crank_nicolson for key in keys.CRANK_NICOLSON_NAMES
+} | {
+	key: bdf2 for key in keys.BDF2_NAMES
+} | {
+	key: sdirk for key in keys.SDIRK_NAMES
+} | {
+	key: sdirk3 for key in keys.SDIRK3_NAMES
 }
+assert set(METHODS) == set(keys.MATRIX_METHOD_NAMES)
 
+
+def _frozen_sweep(gains, row, col, diag, n, implicit, segments=keys.PRECOND_SEGMENTS):
+    """Block forward substitution with the reactivity frozen in each segment.
+    
+    Each step of both Euler methods is Z_{n+1} = G (Z_n + R_n) (implicit) or
+    Z_{n+1} = G Z_n + R_n (explicit), for the (1+ndg)x(1+ndg) step matrix
+        [[gain, row], [col, diag]]
+    (inverted for G in the implicit case). Only the gain changes with time.
+    Within each of 'segments' spans of time, it is replaced by its mean,
+    so that G can be diagonalized once and its modes run as scalar
+    recurrences by scipy.signal.lfilter(), without a loop over the steps.
+    This is exact for a constant reactivity, and the closer, the slower
+    the reactivity changes.
+    
+    The products row*col are positive, so a diagonal scaling makes the
+    step matrix symmetric, and its eigenvectors well-conditioned.
+    
+    Returns:
+    --------
+    callable
+        Applies the approximate inverse of A to a vector.
+    """
+    import scipy.signal
+    bounds = np.unique(np.linspace(0, n - 1, min(segments, n - 1) + 1).astype(int))
+    scale = np.concatenate(([1.0], np.sqrt(row/col)))
+    modes = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        step = np.diag(np.concatenate(([gains[start:stop].mean()], diag)))
+        step[0, 1:] = row
+        step[1:, 0] = col
+        mu, Q = np.linalg.eigh(scale[:, None]*step/scale[None, :])
+        if implicit:
+            mu = 1/mu
+        modes.append((start, stop, mu, Q/scale[:, None], Q.T*scale[None, :]))
+    
+    def apply(r):
+        R = r.reshape((-1, n))
+        Z = np.empty_like(R)
+        Z[:, 0] = R[:, -1]
+        for start, stop, mu, V, Vinv in modes:
+            U = Vinv @ R[:, start:stop]
+            W0 = Vinv @ Z[:, start]
+            W = np.empty_like(U)
+            for j, m in enumerate(mu):
+                b = [m] if implicit else [1.0]
+                W[j], _ = scipy.signal.lfilter(b, [1.0, -m], U[j], zi=[m*W0[j]])
+            Z[:, start+1:stop+1] = V @ W
+        return Z.ravel()
+    return apply
+
+
+def _operator_inputs(n, rho_vec, dt, betas, lams, L, P0):
+    """Get the per-group coefficients shared by the matrix-free operators."""
+    _check_inputs(n, rho_vec, betas, lams)
+    betas = np.asarray(betas)
+    lams = np.asarray(lams)
+    beff = sum(betas)   # beta effective
+    rho_vec = np.asarray(rho_vec)*beff  # convert from $
+    size = (1 + len(betas))*n
+    _, B = _initial_conditions(n, betas, lams, L, P0)
+    return size, beff, rho_vec, betas[:, None], lams[:, None], B
+
+
+def implicit_euler_operator(
+        n: int,
+        rho_vec: T_arr,
+        dt: float,
+        betas: T_arr,
+        lams: T_arr,
+        L: float,
+        P0: float=1,
+        preconditioner: str=keys.PRECOND_FROZEN,
+) -> typing.Tuple[spla.LinearOperator, T_arr, spla.LinearOperator]:
+    """Build a matrix-free A, the vector B, and a preconditioner using Implicit Euler.
+    
+    The operator applies the same equations as implicit_euler(), with the
+    same layout of unknowns, without ever storing A.
+    
+    The preconditioners are built from each step's [(1+ndg) x (1+ndg)] block,
+    the coefficients of P_{n+1} and C_{k,n+1}:
+        'frozen': block forward substitution with the reactivity frozen
+                  over a few spans of time; see _frozen_sweep().
+        'sweep': exact block forward substitution, step by step. This is
+                 the inverse of A, i.e. a direct solve, and as slow as
+                 marching; the Krylov method converges in one iteration.
+    
+    Parameters:
+    -----------
+    n: int
+        Number of timesteps
+    
+    rho_vec: np.ndarray(float)
+        Array of reactivities at each timestep ($).
+    
+    dt: float
+        Timestep size (s).
+    
+    betas: np.ndarray(float)
+        Array of delayed neutron precursor fission yields.
+    
+    lams: np.ndarray(float)
+        Array of delayed neutron precursor decay constants (s^-1).
+    
+    L: float
+        Prompt neutron lifetime (s).
+        
+    P0: float, optional.
+        Starting power.
+        [Default: 1]
+    
+    preconditioner: str, optional.
+        'frozen' or 'sweep'
+        [Default: 'frozen']
+    
+    Returns:
+    --------
+    A: scipy.sparse.linalg.LinearOperator
+        Square [NxN] operator, for LHS of matrix solution.
+    
+    B: np.ndarray
+        Vector [Nx1] array, for RHS of matrix solution.
+    
+    M: scipy.sparse.linalg.LinearOperator
+        Square [NxN] preconditioner, approximating the inverse of A.
+    """
+    size, beff, rho_vec, betas_k, lams_k, B = _operator_inputs(n, rho_vec, dt, betas, lams, L, P0)
+    gains = 1 - dt*(rho_vec[1:] - beff)/L
+    
+    def matvec(x):
+        X = x.reshape((-1, n))
+        Y = np.empty_like(X)
+        P, C = X[0], X[1:]
+        Y[0, :-1] = -P[:-1] + gains*P[1:] - np.sum(dt*lams_k*C[:, 1:], axis=0)
+        Y[1:, :-1] = -dt*betas_k/L*P[1:] - C[:, :-1] + (1 + dt*lams_k)*C[:, 1:]
+        # Initial conditions
+        Y[:, -1] = X[:, 0]
+        return Y.ravel()
+    
+    # Eliminate the precursors from each step's block, as in marching.implicit_euler()
+    decay = 1/(1 + dt*lams_k)
+    source = dt*betas_k/L*decay
+    feed = dt*lams_k*decay
+    denoms = gains - np.sum(dt*lams_k*source)
+    
+    def sweep(r):
+        R = r.reshape((-1, n))
+        Z = np.empty_like(R)
+        Z[:, 0] = R[:, -1]
+        for ip in range(n - 1):
+            rhs = R[:, ip] + Z[:, ip]
+            Z[0, ip+1] = (rhs[0] + np.dot(feed[:, 0], rhs[1:]))/denoms[ip]
+            Z[1:, ip+1] = decay[:, 0]*rhs[1:] + source[:, 0]*Z[0, ip+1]
+        return Z.ravel()
+    
+    if preconditioner == keys.PRECOND_FROZEN:
+        precond = _frozen_sweep(gains, -dt*lams_k[:, 0], -dt*betas_k[:, 0]/L, 1 + dt*lams_k[:, 0],
+                                n, implicit=True)
+    else:
+        precond = sweep
+    A = spla.LinearOperator((size, size), matvec=matvec, dtype=float)
+    M = spla.LinearOperator((size, size), matvec=precond, dtype=float)
+    return A, B, M
+
+
+def explicit_euler_operator(
+        n: int,
+        rho_vec: T_arr,
+        dt: float,
+        betas: T_arr,
+        lams: T_arr,
+        L: float,
+        P0: float = 1,
+        preconditioner: str = keys.PRECOND_FROZEN,
+) -> typing.Tuple[spla.LinearOperator, T_arr, spla.LinearOperator]:
+    """Build a matrix-free A, the vector B, and a preconditioner using Explicit Euler.
+
+    The operator applies the same equations as explicit_euler(), with the
+    same layout of unknowns, without ever storing A.
+
+    The preconditioners are built from each step's [(1+ndg) x (1+ndg)] block,
+    the coefficients of P_n and C_{k,n}; that of P_{n+1} and C_{k,n+1} is
+    the identity, so a block-diagonal preconditioner would do nothing.
+        'frozen': block forward substitution with the reactivity frozen
+                  over a few spans of time; see _frozen_sweep().
+        'sweep': exact block forward substitution, step by step. This is
+                 the inverse of A, i.e. a direct solve, and as slow as
+                 marching; the Krylov method converges in one iteration.
+
+    Parameters:
+    -----------
+    n: int
+        Number of timesteps
+
+    rho_vec: np.ndarray(float)
+        Array of reactivities at each timestep ($).
+
+    dt: float
+        Timestep size (s).
+
+    betas: np.ndarray(float)
+        Array of delayed neutron precursor fission yields.
+
+    lams: np.ndarray(float)
+        Array of delayed neutron precursor decay constants (s^-1).
+
+    L: float
+        Prompt neutron lifetime (s).
+
+    P0: float, optional.
+        Starting power.
+        [Default: 1]
+
+    preconditioner: str, optional.
+        'frozen' or 'sweep'
+        [Default: 'frozen']
+
+    Returns:
+    --------
+    A: scipy.sparse.linalg.LinearOperator
+        Square [NxN] operator, for LHS of matrix solution.
+
+    B: np.ndarray
+        Vector [Nx1] array, for RHS of matrix solution.
+
+    M: scipy.sparse.linalg.LinearOperator
+        Square [NxN] preconditioner, approximating the inverse of A.
+    """
+    size, beff, rho_vec, betas_k, lams_k, B = _operator_inputs(n, rho_vec, dt, betas, lams, L, P0)
+    gains = 1 + dt*(rho_vec[:-1] - beff)/L
+
+    def matvec(x):
+        X = x.reshape((-1, n))
+        Y = np.empty_like(X)
+        P, C = X[0], X[1:]
+        Y[0, :-1] = -gains*P[:-1] + P[1:] - np.sum(dt*lams_k*C[:, :-1], axis=0)
+        Y[1:, :-1] = -dt*betas_k/L*P[:-1] + (-1 + dt*lams_k)*C[:, :-1] + C[:, 1:]
+        # Initial conditions
+        Y[:, -1] = X[:, 0]
+        return Y.ravel()
+
+    decay = 1 - dt*lams_k[:, 0]
+    source = dt*betas_k[:, 0]/L
+    feed = dt*lams_k[:, 0]
+
+    def sweep(r):
+        R = r.reshape((-1, n))
+        Z = np.empty_like(R)
+        Z[:, 0] = R[:, -1]
+        for ip in range(n - 1):
+            Z[0, ip+1] = R[0, ip] + gains[ip]*Z[0, ip] + np.dot(feed, Z[1:, ip])
+            Z[1:, ip+1] = R[1:, ip] + decay*Z[1:, ip] + source*Z[0, ip]
+        return Z.ravel()
+
+    if preconditioner == keys.PRECOND_FROZEN:
+        precond = _frozen_sweep(gains, feed, source, decay, n, implicit=False)
+    else:
+        precond = sweep
+    A = spla.LinearOperator((size, size), matvec=matvec, dtype=float)
+    M = spla.LinearOperator((size, size), matvec=precond, dtype=float)
+    return A, B, M
+
+
+OPERATORS = {
+	key: implicit_euler_operator for key in keys.IMPLICIT_NAMES
+} | {
+	key: explicit_euler_operator for key in keys.EXPLICIT_NAMES
+}
+assert set(OPERATORS) == set(keys.OPERATOR_METHOD_NAMES)
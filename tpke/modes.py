@@ -5,15 +5,20 @@ Run modes for TPKE
 """
 import os
 import sys
+import copy
+import concurrent.futures
+import itertools
 import typing
 import warnings
 import numpy as np
+import scipy.optimize
+import scipy.sparse as sp
 import matplotlib.pyplot as plt
 import tpke
 import tpke.keys as K
 
 
-def plot_only(output_dir: tpke.tping.PathType):
+def plot_only(output_dir: tpke.tping.PathType, max_points: int = K.PLOT_POINTS_DEFAULT):
 	"""Only plot the existing results
 	
 	Parameters:
@@ -21,6 +26,10 @@ def plot_only(output_dir: tpke.tping.PathType):
 	output_dir: str or PathLike
 		Output folder to read existing results from.
 	
+	max_points: int, optional
+		Most points to plot for each series; see plotter.decimate().
+		[Default: keys.PLOT_POINTS_DEFAULT]
+	
 	Returns:
 	--------
 	le: int
@@ -28,41 +37,43 @@ def plot_only(output_dir: tpke.tping.PathType):
 		le == 0 is OK, le != 0 indicates errors.
 	"""
 	errs = []
-	# Spy plot of Matrix A
+	# Spy plot of Matrix A, if it was saved
+	sfpath = os.path.join(output_dir, K.FNAME_MATRIX_A_SPARSE)
 	afpath = os.path.join(output_dir, K.FNAME_MATRIX_A)
-	if not os.path.exists(afpath):
-		errs.append(f"Matrix A could not be found at: {afpath}")
-	else:
+	if os.path.exists(sfpath) or os.path.exists(afpath):
 		try:
-			matA = np.loadtxt(afpath)
+			if os.path.exists(sfpath):
+				matA = sp.load_npz(sfpath)
+			else:
+				# Dense text, from older versions.
+				matA = np.loadtxt(afpath)
 			tpke.plotter.plot_matrix(matA)
 		except Exception as e:
 			errs.append(f"Failed to plot Matrix A: {type(e)}: {e}")
 		else:
-			plt.savefig(K.FNAME_SPY)
-			print("Matrix A spy plot saved to:", K.FNAME_SPY)
+			fpath_spy = os.path.join(output_dir, K.FNAME_SPY)
+			plt.savefig(fpath_spy)
+			print("Matrix A spy plot saved to:", fpath_spy)
+	else:
+		print("Matrix A was not saved; skipping spy plot.")
 	# Power-Reactivity plot
-	tfpath = os.path.join(output_dir, K.FNAME_TIME)
-	rfpath = os.path.join(output_dir, K.FNAME_RHO)
-	pfpath = os.path.join(output_dir, K.FNAME_P)
-	if not os.path.exists(tfpath):
-		errs.append(f"Times could not be found at: {tfpath}")
-	elif not os.path.exists(rfpath):
-		errs.append(f"Reactivities could not be found at: {rfpath}")
-	elif not os.path.exists(pfpath):
-		errs.append(f"Reactor powers could not be found at: {pfpath}")
+	fmt = tpke.store.find(output_dir)
+	if fmt is None:
+		errs.append(f"Results could not be found in: {output_dir}")
 	else:
 		try:
-			times = np.loadtxt(tfpath)
-			reactivities = np.loadtxt(rfpath)
-			powers = np.loadtxt(pfpath)
+			datasets, _ = tpke.store.load(output_dir, names=(K.DSET_TIME, K.DSET_RHO, K.DSET_P))
 			# if len(times) != len(reactivities) != len(powers)  -> handled in plotting
-			tpke.plotter.plot_reactivity_and_power(times, reactivities, powers)
+			tpke.plotter.plot_reactivity_and_power(
+				datasets[K.DSET_TIME], datasets[K.DSET_RHO], datasets[K.DSET_P],
+				max_points=max_points
+			)
 		except Exception as e:
 			errs.append(f"Failed to plot power and reactivity: {type(e)}: {e}")
 		else:
-			plt.savefig(K.FNAME_PR)
-			print("Power and reactivity plot saved to:", K.FNAME_PR)
+			fpath_pr = os.path.join(output_dir, K.FNAME_PR)
+			plt.savefig(fpath_pr)
+			print("Power and reactivity plot saved to:", fpath_pr)
 	le = len(errs)
 	if le:
 		errstr = f"There were {le} errors:\n\t"
@@ -72,11 +83,17 @@ def plot_only(output_dir: tpke.tping.PathType):
 	return le
 
 
-def solution(input_dict: typing.Mapping, output_dir: tpke.tping.PathType):
+def solution(
+		input_dict: typing.Mapping,
+		output_dir: tpke.tping.PathType,
+		fmt: str = K.FORMAT_TXT,
+		save_matrix: bool = False
+):
 	"""Solve the Point Kinetics Reactor Equations
 	
-	Numerically solve the PKRE, write the data to the output directory,
-	make the indicated plots, and save plots to the output directory.
+	Numerically solve the PKRE with api.run(), write the data to the
+	output directory, make the indicated plots, and save plots to the
+	output directory.
 	
 	Parameters:
 	-----------
@@ -87,51 +104,60 @@ def solution(input_dict: typing.Mapping, output_dir: tpke.tping.PathType):
 		Output folder to write results to.
 		If it does not exist, it will be created.
 	
+	fmt: str, optional
+		Format to write the results in: one of keys.FORMATS.
+		[Default: keys.FORMAT_TXT]
+	
+	save_matrix: bool, optional
+		Whether to write the linear system: Matrix A as sparse triplets,
+		and Vector B as text. Only applies to the assembled solvers
+		(Vector B alone for the Krylov solvers).
+		[Default: False]
+	
+	Returns:
+	--------
+	powers: np.ndarray
+		Vector of powers at each timestep.
 	"""
 	plots = input_dict.get(K.PLOT, {})
-	method = tpke.matrices.METHODS[input_dict[K.METH]]
-	total = input_dict[K.TIME][K.TIME_TOTAL]
-	dt = input_dict[K.TIME][K.TIME_DELTA]
-	num_steps = int(np.ceil(total/dt))  # Will raise total if not divisible
-	times = np.linspace(0, num_steps*dt, num_steps)
-	np.savetxt(os.path.join(output_dir, K.FNAME_TIME), times)
-	rxdict = dict(input_dict[K.REAC])
-	rxtype = rxdict.pop(K.REAC_TYPE)
-	reactivity_vals = tpke.reactivity.get_reactivity_vector(
-		r_type=rxtype,
-		n=num_steps,
-		dt=dt,
-		**rxdict
-	)
-	np.savetxt(os.path.join(output_dir, K.FNAME_RHO), reactivity_vals)
-	matA, matB = method(
-		n=num_steps,
-		dt=dt,
-		betas=input_dict[K.DATA][K.DATA_B],
-		lams=input_dict[K.DATA][K.DATA_L],
-		L=input_dict[K.DATA][K.DATA_BIG_L],
-		rho_vec=reactivity_vals.copy()
-	)
-	np.savetxt(os.path.join(output_dir, K.FNAME_MATRIX_A), matA)
-	np.savetxt(os.path.join(output_dir, K.FNAME_MATRIX_B), matB)
 	to_show = plots.get(K.PLOT_SHOW, 0)
-	if plots.get(K.PLOT_SPY):
-		tpke.plotter.plot_matrix(matA)
-		plt.savefig(os.path.join(output_dir, K.FNAME_SPY))
+	spy = plots.get(K.PLOT_SPY)
+	solver_name = input_dict.get(K.SOLVER, K.SOLVER_DENSE).lower()
+	if spy and (solver_name == K.SOLVER_MARCH or K.DATA_FEEDBACK in input_dict[K.DATA]):
+		warnings.warn("The marching solver does not build Matrix A; skipping spy plot.")
+		spy = False
+	elif spy and solver_name in tpke.solver.KRYLOV_SOLVERS:
+		warnings.warn("The Krylov solvers do not store Matrix A; skipping spy plot.")
+		spy = False
+	result = tpke.api.run(input_dict, keep_system=bool(save_matrix or spy))
+	_report(input_dict, result)
+	with tpke.profiler.phase("output"):
+		tpke.store.save(output_dir, result.datasets(), metadata=result.metadata, fmt=fmt)
+		if "residuals" in result.info:
+			np.savetxt(os.path.join(output_dir, K.FNAME_RESIDUALS), result.info["residuals"])
+		if save_matrix and result.system is not None:
+			matA, matB = result.system
+			if sp.issparse(matA) or isinstance(matA, np.ndarray):
+				# Only the nonzero (row, col, value) triplets.
+				sp.save_npz(os.path.join(output_dir, K.FNAME_MATRIX_A_SPARSE), sp.coo_matrix(matA))
+			np.savetxt(os.path.join(output_dir, K.FNAME_MATRIX_B), matB)
+	if spy and result.system is not None:
+		with tpke.profiler.phase("plotting"):
+			tpke.plotter.plot_matrix(result.system[0])
+			plt.savefig(os.path.join(output_dir, K.FNAME_SPY))
 		if to_show > 1:
 			plt.show()
-	power_vals, concentration_vals = tpke.solver.linalg(matA, matB, num_steps)
-	np.savetxt(os.path.join(output_dir, K.FNAME_P), power_vals)
-	np.savetxt(os.path.join(output_dir, K.FNAME_C), concentration_vals)
 	prplot = plots.get(K.PLOT_PR)
 	if prplot == 1:
-		tpke.plotter.plot_reactivity_and_power(
-			times=times,
-			reacts=reactivity_vals,
-			powers=power_vals,
-			plot_type=plots.get(K.PLOT_LOG)
-		)
-		plt.savefig(os.path.join(output_dir, K.FNAME_PR))
+		with tpke.profiler.phase("plotting"):
+			tpke.plotter.plot_reactivity_and_power(
+				times=result.times,
+				reacts=result.reactivities,
+				powers=result.powers,
+				plot_type=plots.get(K.PLOT_LOG),
+				max_points=plots.get(K.PLOT_POINTS, K.PLOT_POINTS_DEFAULT)
+			)
+			plt.savefig(os.path.join(output_dir, K.FNAME_PR))
 	elif prplot == 2:
 		# Plot them separately
 		warnings.warn("Not implemented yet: separate power and reactivity plots", FutureWarning)
@@ -141,12 +167,273 @@ def solution(input_dict: typing.Mapping, output_dir: tpke.tping.PathType):
 	# keep at end
 	if to_show:
 		plt.show()
+	return result.powers
+
+
+def _report(input_dict: typing.Mapping, result: "tpke.api.Result"):
+	"""Print what the solver reported about a run."""
+	info = result.info
+	if K.DATA_FEEDBACK in input_dict[K.DATA]:
+		print(f"Feedback: {info['iterations']} Newton iterations, "
+		      f"{info['jacobians']} Jacobian evaluations.")
+	elif "steps" in info:
+		print(f"Adaptive time stepping took {info['steps']} steps.")
+	elif "residual" in info:
+		preconditioner = input_dict.get(K.PRECOND, K.PRECOND_FROZEN).lower()
+		print(f"{input_dict[K.SOLVER].lower()} ({preconditioner}): {info['iterations']} iterations, "
+		      f"relative residual {info['residual']:.2e}.")
+
+
+def stream_solution(
+		input_dict: typing.Mapping,
+		output_dir: tpke.tping.PathType,
+		fmt: str = K.FORMAT_TXT,
+		chunk: int = K.STREAM_CHUNK
+) -> int:
+	"""Solve the Point Kinetics Reactor Equations in bounded memory.
+	
+	The solution is marched 'chunk' timesteps at a time with marching.stream(),
+	and each chunk is appended to the output as soon as it is produced.
+	Plots are not made; use plot_only() afterwards.
+	
+	Parameters:
+	-----------
+	input_dict: dict
+		Dictionary of the the parsed input file.
+	
+	output_dir: str or PathLike
+		Output folder to write results to.
+		If it does not exist, it will be created.
+	
+	fmt: str, optional
+		Format to write the results in: keys.FORMAT_TXT or keys.FORMAT_HDF5.
+		[Default: keys.FORMAT_TXT]
+	
+	chunk: int, optional
+		Number of timesteps per chunk.
+		[Default: keys.STREAM_CHUNK]
+	
+	Returns:
+	--------
+	num_points: int
+		Number of times written.
+	"""
+	timing = input_dict[K.TIME]
+	method_name = input_dict[K.METH].lower()
+	errs = []
+	if K.TIME_DELTA not in timing:
+		errs.append("Streaming requires a fixed timestep 'dt'.")
+	if method_name not in tpke.marching.STREAM_METHODS:
+		errs.append(f"Method '{method_name}' is not available for streaming.")
+	if K.DATA_FEEDBACK in input_dict[K.DATA]:
+		errs.append("Feedback is not available for streaming.")
+	if fmt.lower() not in (K.FORMAT_TXT, K.FORMAT_HDF5):
+		errs.append(f"Streaming can only write the '{K.FORMAT_TXT}' or '{K.FORMAT_HDF5}' formats.")
+	if errs:
+		errstr = f"There were {len(errs)} errors:\n\t"
+		errstr += "\n\t".join(errs)
+		raise ValueError(errstr)
+	if input_dict.get(K.SOLVER, K.SOLVER_MARCH).lower() != K.SOLVER_MARCH:
+		warnings.warn("Streaming always uses the marching solver.")
+	if input_dict.get(K.PLOT):
+		warnings.warn("Plots are not made when streaming; use --plot_folder afterwards.")
+	rxdict = dict(input_dict[K.REAC])
+	rxtype = rxdict.pop(K.REAC_TYPE)
+	chunks = tpke.marching.stream(
+		total=timing[K.TIME_TOTAL],
+		dt=timing[K.TIME_DELTA],
+		rho_func=tpke.reactivity.get_reactivity_function(rxtype, **rxdict),
+		betas=input_dict[K.DATA][K.DATA_B],
+		lams=input_dict[K.DATA][K.DATA_L],
+		L=input_dict[K.DATA][K.DATA_BIG_L],
+		method=method_name,
+		chunk=chunk
+	)
+	num_points = 0
+	for times, reactivity_vals, power_vals, concentration_vals in tpke.profiler.iterate("solve", chunks):
+		datasets = {
+			K.DSET_TIME: times,
+			K.DSET_RHO: reactivity_vals,
+			K.DSET_P: power_vals,
+			K.DSET_C: concentration_vals,
+		}
+		with tpke.profiler.phase("output"):
+			tpke.store.append(output_dir, datasets, metadata=tpke.api.metadata(input_dict),
+			                  fmt=fmt, new=not num_points)
+		num_points += len(times)
+	return num_points
+
+
+def inverse_solution(
+		input_dict: typing.Mapping,
+		trace_file: str,
+		output_dir: tpke.tping.PathType,
+		fmt: str = K.FORMAT_TXT,
+		chunk: int = K.STREAM_CHUNK
+) -> int:
+	"""Find the reactivity behind a measured power trace.
+	
+	Only the 'data' block of the input is used. The trace is filtered
+	'chunk' rows at a time with inverse.stream(), and each chunk is appended
+	to the output as soon as it is produced, like stream_solution().
+	
+	Parameters:
+	-----------
+	input_dict: dict
+		Dictionary of the the parsed input file.
+	
+	trace_file: str
+		Path to the (time, power) trace; see inverse.read_trace().
+		Use '-' to read it from the standard input.
+	
+	output_dir: str or PathLike
+		Output folder to write results to.
+		If it does not exist, it will be created.
+	
+	fmt: str, optional
+		Format to write the results in: keys.FORMAT_TXT or keys.FORMAT_HDF5.
+		[Default: keys.FORMAT_TXT]
+	
+	chunk: int, optional
+		Number of rows per chunk.
+		[Default: keys.STREAM_CHUNK]
+	
+	Returns:
+	--------
+	num_points: int
+		Number of times written.
+	"""
+	if fmt.lower() not in (K.FORMAT_TXT, K.FORMAT_HDF5):
+		raise ValueError(f"Inverse kinetics can only write the '{K.FORMAT_TXT}' or '{K.FORMAT_HDF5}' formats.")
+	if K.DATA_FEEDBACK in input_dict[K.DATA]:
+		warnings.warn("Inverse kinetics finds the total reactivity; feedback is ignored.")
+	data = input_dict[K.DATA]
+	chunks = tpke.inverse.stream(
+		tpke.inverse.read_trace(trace_file, chunk),
+		betas=data[K.DATA_B],
+		lams=data[K.DATA_L],
+		L=data[K.DATA_BIG_L]
+	)
+	metadata = {
+		"mode": "inverse kinetics",
+		"trace": os.path.abspath(trace_file) if trace_file != "-" else trace_file,
+		"delayed_groups": len(data[K.DATA_B]),
+		"config": input_dict,
+	}
+	num_points = 0
+	# The trace is read as it is filtered.
+	for times, reactivity_vals, power_vals, concentration_vals in tpke.profiler.iterate("solve", chunks):
+		datasets = {
+			K.DSET_TIME: times,
+			K.DSET_RHO: reactivity_vals,
+			K.DSET_P: power_vals,
+			K.DSET_C: concentration_vals,
+		}
+		with tpke.profiler.phase("output"):
+			tpke.store.append(output_dir, datasets, metadata=metadata, fmt=fmt, new=not num_points)
+		num_points += len(times)
+	return num_points
+
+
+def ensemble(
+		input_dicts: typing.Sequence[typing.Mapping],
+		output_dir: tpke.tping.PathType,
+		fmt: str = K.FORMAT_TXT
+):
+	"""Solve many variants of the same problem together.
+	
+	All the scenarios are marched at once by marching.batch(),
+	so they must share the time options, the method, and the number
+	of delayed groups. The reactivity and kinetics data may differ.
+	
+	Parameters:
+	-----------
+	input_dicts: sequence of dict
+		Dictionaries of the parsed input files.
+	
+	output_dir: str or PathLike
+		Output folder to write results to.
+		Each scenario's solution is written to a subfolder, numbered
+		in the order of 'input_dicts', as by solution().
+	
+	fmt: str, optional
+		Format to write the results in: one of keys.FORMATS.
+		[Default: keys.FORMAT_TXT]
+	
+	Returns:
+	--------
+	powers: np.ndarray
+		[scenarios x n] array of powers at each timestep.
+	"""
+	first = input_dicts[0]
+	timing = first[K.TIME]
+	method_name = first[K.METH].lower()
+	ndg = len(first[K.DATA][K.DATA_B])
+	errs = []
+	if K.TIME_DELTA not in timing:
+		errs.append("Batches require a fixed timestep 'dt'.")
+	if method_name not in tpke.marching.BATCH_METHODS:
+		errs.append(f"Method '{method_name}' is not available for batches.")
+	for i, cfg in enumerate(input_dicts[1:], start=1):
+		if cfg[K.TIME] != timing:
+			errs.append(f"Scenario {i} has different time options.")
+		if cfg[K.METH].lower() != method_name:
+			errs.append(f"Scenario {i} has a different method.")
+		if len(cfg[K.DATA][K.DATA_B]) != ndg:
+			errs.append(f"Scenario {i} has a different number of delayed groups.")
+	if any(K.DATA_FEEDBACK in cfg[K.DATA] for cfg in input_dicts):
+		errs.append("Feedback is not available for batches.")
+	if errs:
+		errstr = f"There were {len(errs)} errors:\n\t"
+		errstr += "\n\t".join(errs)
+		raise ValueError(errstr)
+	total = timing[K.TIME_TOTAL]
+	dt = timing[K.TIME_DELTA]
+	num_steps = int(np.ceil(total/dt))  # Will raise total if not divisible
+	times = np.linspace(0, num_steps*dt, num_steps + 1)
+	reactivity_vals = np.empty((len(input_dicts), num_steps + 1))
+	with tpke.profiler.phase("reactivity"):
+		for i, cfg in enumerate(input_dicts):
+			rxdict = dict(cfg[K.REAC])
+			rxtype = rxdict.pop(K.REAC_TYPE)
+			reactivity_vals[i] = tpke.reactivity.get_reactivity_vector(
+				r_type=rxtype,
+				n=num_steps,
+				dt=dt,
+				**rxdict
+			)
+	with tpke.profiler.phase("solve"):
+		power_vals, concentration_vals = tpke.marching.batch(
+			n=num_steps + 1,
+			rho_vecs=reactivity_vals,
+			dt=dt,
+			betas=np.array([cfg[K.DATA][K.DATA_B] for cfg in input_dicts]),
+			lams=np.array([cfg[K.DATA][K.DATA_L] for cfg in input_dicts]),
+			L=np.array([cfg[K.DATA][K.DATA_BIG_L] for cfg in input_dicts]),
+			method=method_name
+		)
+	with tpke.profiler.phase("output"):
+		for i, cfg in enumerate(input_dicts):
+			# Whatever the solver in its input, each scenario was marched.
+			metadata = dict(tpke.api.metadata(cfg), solver=K.SOLVER_MARCH, mode="ensemble", scenario=i)
+			result = tpke.api.Result(times, reactivity_vals[i], power_vals[i], concentration_vals[i],
+			                         metadata=metadata)
+			member_dir = os.path.join(output_dir, str(i))
+			os.makedirs(member_dir, exist_ok=True)
+			tpke.store.save(member_dir, result.datasets(), metadata=result.metadata, fmt=fmt)
+	return power_vals
+
+
+# Relative differences in power this small are taken as round-off.
+ROUNDOFF = 1e-10
 
 
 def study_timesteps(
 		input_dict: typing.Mapping,
 		output_dir: tpke.tping.PathType,
-		dts: typing.Iterable[float]
+		dts: typing.Iterable[float],
+		jobs: int = 1,
+		tolerance: float = None
 ):
 	"""Study the effect of timestep size upon final power.
 	
@@ -156,25 +443,50 @@ def study_timesteps(
 		Dictionary of the the parsed input file.
 	
 	output_dir: str or PathLike
-		Output folder to write results to.
-		If it does not exist, it will be created.
-		Each result will create a subfolder in 'output_dir'.
+		Output folder to write the study report and plot to.
+		The cases are solved in memory; their solutions are not written.
 	
 	dts: iterable of float
 		List of timestep sizes (s).
+	
+	jobs: int, optional
+		Number of cases to run at once, in separate processes.
+		[Default: 1]
+	
+	tolerance: float, optional
+		Relative error in the final power to aim for.
+		If given, recommend the largest 'dt' which meets it.
+		[Default: None]
+	
+	The observed order of convergence from the differences between
+	each three successive timesteps is reported alongside the errors.
+	The converged power is estimated by Richardson extrapolation,
+	and the error of each case is also reported against it.
 	"""
 	dts = sorted(dts)
+	cases = [(input_dict, dt) for dt in dts]
+	profiler = tpke.profiler.active()
+	with tpke.profiler.phase("cases"):
+		if jobs > 1 and profiler is not None:
+			# Profile each case in its process, and gather the phases here.
+			with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+				runs = list(pool.map(tpke.profiler.run_profiled, itertools.repeat(profiler.memory),
+				                     itertools.repeat(_study_case), *zip(*cases)))
+			powers = [power for power, _ in runs]
+			for _, phases in runs:
+				profiler.merge(phases)
+		elif jobs > 1:
+			with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+				powers = list(pool.map(_study_case, *zip(*cases)))
+		else:
+			powers = [_study_case(*case) for case in cases]
+	formal = tpke.marching.ORDERS.get(input_dict[K.METH].lower())
+	with tpke.profiler.phase("extrapolation"):
+		p_inf, order, coeff = _richardson(dts, powers, formal)
 	errors = []
+	lines = [f"Method: {input_dict[K.METH]}"]
 	ref = np.nan
-	for i, dt in enumerate(dts):
-		cfg = dict(input_dict)
-		cfg[K.TIME][K.TIME_DELTA] = dt
-		out_fpath = os.path.join(output_dir, str(i))
-		os.makedirs(out_fpath, exist_ok=True)
-		with open(os.path.join(out_fpath, K.FNAME_DT), 'w') as f:
-			f.write(str(dt))
-		solution(cfg, out_fpath)
-		power = _load_solution(out_fpath)
+	for i, (dt, power) in enumerate(zip(dts, powers)):
 		report = f"\tP(dt={dt:.2e} s): {power:.4f}"
 		# Calculate the relative error vs. the reference solution.
 		if i == 0:
@@ -183,26 +495,112 @@ def study_timesteps(
 		else:
 			error = (power - ref)/ref
 			report += f" | Error: {error:+8.4%}"
+		if i > 1:
+			# Observed order of convergence from successive differences,
+			# as P(dt) - P(dt/r) ~ dt^p. The reference is no exact solution,
+			# so the errors against it would bias the order.
+			coarse, fine = power - powers[i-1], powers[i-1] - powers[i-2]
+			differences = np.abs([coarse, fine])
+			if np.all(np.isfinite(differences)) and np.all(differences > ROUNDOFF*abs(power)):
+				order_i = np.log(abs(coarse/fine))/np.log(dt/dts[i-1])
+				report += f" | Order: {order_i:.2f}"
+			else:
+				# Converged to round-off, or a case failed
+				report += " | Order: n/a"
+		report += f" | Est. error: {(power - p_inf)/p_inf:+.3e}"
 		print(report)
+		lines.append(report)
 		errors.append(error)
-	with open(os.path.join(output_dir, K.FNAME_REPORT), 'w') as f:
-		f.write(report)
+	summary = [
+		f"Richardson extrapolation: P = {p_inf:.8g}",
+		f"Order of convergence: {order:.3f}",
+	]
+	if tolerance is not None:
+		est_errors = np.abs((np.array(powers) - p_inf)/p_inf)
+		meets = [dt for dt, e in zip(dts, est_errors) if e <= tolerance]
+		if meets:
+			summary.append(f"Largest dt tested meeting tolerance {tolerance:.1e}: {max(meets):.3e} s")
+		else:
+			summary.append(f"No dt tested meets tolerance {tolerance:.1e}")
+		if coeff:
+			# |P(dt) - P| ~ |c| dt^p
+			dt_tol = (tolerance*abs(p_inf/coeff))**(1/order)
+			summary.append(f"Predicted largest dt meeting tolerance {tolerance:.1e}: {dt_tol:.3e} s")
+	for line in summary:
+		print(line)
+	lines += summary
+	with tpke.profiler.phase("output"):
+		with open(os.path.join(output_dir, K.FNAME_REPORT), 'w') as f:
+			f.write("\n".join(lines) + "\n")
 	plot_dts = np.array(dts)[1:]
 	plot_err = np.array(errors)[1:]*100
-	tpke.plotter.plot_convergence(plot_dts, plot_err, in_percent=True)
-	fpath_plot = os.path.join(output_dir, K.FNAME_CONVERGE)
-	plt.savefig(fpath_plot)
+	with tpke.profiler.phase("plotting"):
+		tpke.plotter.plot_convergence(plot_dts, plot_err, in_percent=True)
+		fpath_plot = os.path.join(output_dir, K.FNAME_CONVERGE)
+		plt.savefig(fpath_plot)
 	print("Results plotted to:", fpath_plot)
 	plt.show()
 
 
-def _load_solution(study_dir: tpke.tping.PathType) -> float:
-	"""Load the last power from a transient."""
-	fpath = os.path.join(study_dir, K.FNAME_P)
+def _richardson(
+		dts: typing.Sequence[float],
+		powers: typing.Sequence[float],
+		order: float = None
+) -> typing.Tuple[float, float, float]:
+	"""Estimate the converged power by Richardson extrapolation.
+	
+	Fits P(dt) = P + c*dt^p through the three smallest timesteps.
+	If there are only two, or the convergence is not monotonic,
+	the order is not observed, and the formal 'order' is used instead.
+	
+	Parameters:
+	-----------
+	dts: sequence of float
+		Sorted timestep sizes (s).
+	
+	powers: sequence of float
+		Final power for each timestep.
+	
+	order: float, optional
+		Formal order of the method, for when it can't be observed.
+		[Default: None]
+	
+	Returns:
+	--------
+	p_inf: float
+		Extrapolated power.
+	
+	order: float
+		Observed (or formal) order of convergence.
+	
+	coeff: float
+		Coefficient c of the leading error term.
+	"""
+	h = np.asarray(dts[:3], dtype=float)
+	P = np.asarray(powers[:3], dtype=float)
+	if len(h) < 2 or P[1] == P[0]:
+		return P[0], (order or np.nan), 0.0
+	if len(h) == 3:
+		ratio = (P[2] - P[1])/(P[1] - P[0])
+		def residual(p):
+			return (h[2]**p - h[1]**p)/(h[1]**p - h[0]**p) - ratio
+		try:
+			order = scipy.optimize.brentq(residual, 0.05, 20)
+		except ValueError:
+			warnings.warn("Convergence is not monotonic; using the formal order.")
+	if not order:
+		return P[0], np.nan, 0.0
+	coeff = (P[1] - P[0])/(h[1]**order - h[0]**order)
+	return P[0] - coeff*h[0]**order, order, coeff
+
+
+def _study_case(input_dict: typing.Mapping, dt: float) -> float:
+	"""Run one case of a timestep study in memory and return the last power."""
+	cfg = copy.deepcopy(input_dict)
+	cfg[K.TIME][K.TIME_DELTA] = dt
 	try:
-		powers = np.loadtxt(fpath)
-		endpow = powers.flatten()[-1]
-		return float(endpow)
+		result = tpke.api.run(cfg)
+		return float(result.powers[-1])
 	except Exception as e:
-		warnings.warn(f"Failed to load {fpath}: {e}", Warning)
+		warnings.warn(f"Failed to solve with dt={dt}: {e}", Warning)
 	return np.nan
@@ -6,6 +6,8 @@ Plotting thingies
 import tpke.keys as K
 from matplotlib import rcParams
 import matplotlib.pyplot as plt
+from scipy import sparse
+import numpy as np
 import typing
 
 # This will make the y-labels not be so stupid.
@@ -18,6 +20,43 @@ COLOR_R = "firebrick"
 
 
 
+def decimate(values: V_float, max_points: int) -> np.ndarray:
+	"""Choose which points of a long series to plot.
+	
+	The series is split into max_points/2 buckets, and the minimum and
+	maximum of each bucket are kept, along with the first and last points.
+	Peaks are therefore kept exactly, and the outline of the curve is
+	the same as that of the full series at the resolution of the plot.
+	
+	Parameters:
+	-----------
+	values: collection of float
+		Series to decimate.
+	
+	max_points: int
+		Point budget. At most this many points (+2) are kept.
+	
+	Returns:
+	--------
+	indices: np.ndarray(int)
+		Sorted indices of the points to plot.
+	"""
+	values = np.asarray(values)
+	n = len(values)
+	if n <= max_points:
+		return np.arange(n)
+	num_buckets = max(max_points//2, 1)
+	size = -(-n//num_buckets)
+	# Pad with the last value, so that the buckets are all the same size.
+	padded = np.pad(values, (0, num_buckets*size - n), mode="edge").reshape(num_buckets, size)
+	offsets = np.arange(num_buckets)*size
+	keep = np.concatenate((
+		[0, n - 1],
+		offsets + padded.argmin(axis=1),
+		offsets + padded.argmax(axis=1),
+	))
+	return np.unique(np.minimum(keep, n - 1))
+
 
 def plot_reactivity_and_power(
 		times: V_float,
@@ -25,7 +64,8 @@ def plot_reactivity_and_power(
 		powers: V_float,
 		plot_type=K.PLOT_LOG,
 		power_units=None,
-		title_text=""
+		title_text="",
+		max_points=K.PLOT_POINTS_DEFAULT
 ):
 	f"""Plot the reactor power and reactivity vs. time
 	
@@ -54,6 +94,10 @@ def plot_reactivity_and_power(
 	title_text: str, optional
 		Title for the plot.
 		[Default: None]
+	
+	max_points: int, optional
+		Most points to plot for each of power and reactivity; see decimate().
+		[Default: {K.PLOT_POINTS_DEFAULT}]
 	"""
 	n = len(times)
 	len_p = len(powers)
@@ -71,19 +115,22 @@ def plot_reactivity_and_power(
 		K.PLOT_LOGLOG: pax.loglog
 	}
 	plot_f = plot_functions.get(plot_type, pax.loglog)
-	plines = plot_f(times, powers, "-", color=COLOR_P, label=r"$P(t)$")
+	times = np.asarray(times)
+	ip = decimate(powers, max_points)
+	plines = plot_f(times[ip], np.asarray(powers)[ip], "-", color=COLOR_P, label=r"$P(t)$")
 	pax.tick_params(axis="y", which="both", labelcolor=COLOR_P)
 	pax.set_ylabel(f"Power ({power_units})", color=COLOR_P)
 	
 	# Plot reactivity
 	rax = pax.twinx()
-	rlines = rax.plot(times, reacts, "--", color=COLOR_R, label=r"$\rho(t)$")
+	ir = decimate(reacts, max_points)
+	rlines = rax.plot(times[ir], np.asarray(reacts)[ir], "--", color=COLOR_R, label=r"$\rho(t)$")
 	rax.tick_params(axis="y", labelcolor=COLOR_R)
 	rax.set_ylabel("Reactivity (\$)", color=COLOR_R)
 	
 	lines = plines + rlines
 	pax.legend(lines, [l.get_label() for l in lines], loc=0)
-	pax.set_xlim([0, max(times)])
+	pax.set_xlim([0, times[-1]])
 	pax.set_xlabel("Time (s)")
 	
 	# continue...
@@ -136,11 +183,14 @@ def plot_matrix(matA):
 	
 	Parameters:
 	-----------
-	matA: np.ndarray
+	matA: np.ndarray or scipy.sparse matrix
 		Square matrix, LHS of the equation, to plot.
+		Only the nonzero entries are drawn, so even a dense
+		matrix is converted to sparse first.
 	"""
+	matA = sparse.coo_matrix(matA)
 	axA = plt.figure().add_subplot()
-	axA.spy(matA)
+	axA.spy(matA, markersize=min(rcParams['lines.markersize'], 600/matA.shape[0]))
 	# axA.set_title(r"$\overline{\overline{A}}$")
 	plt.tight_layout()
 	return axA
@@ -0,0 +1,202 @@
+"""
+Profiler
+
+Wall time and peak memory of each phase of a run.
+
+The run modes mark their phases with:
+	with profiler.phase("solve"):
+		...
+which does nothing unless profiling was turned on with enable().
+Phases may be nested, and repeated phases (such as those of each case
+in a timestep study) are accumulated under the same name.
+Work done in other processes is profiled there with run_profiled(), and
+its phases are merged into the enclosing phase with Profiler.merge().
+Their times are summed, so those of parallel workers may add up to more
+than the wall time of the enclosing phase.
+Memory is traced with tracemalloc, which sees the arrays NumPy allocates
+but not the work space of compiled libraries such as LAPACK or SuperLU.
+Tracing slows down Python code (plotting, most of all) several times
+over, so it can be left out for undistorted times.
+"""
+import contextlib
+import json
+import os
+import time
+import tracemalloc
+import typing
+import tpke.keys as K
+from tpke.tping import PathType
+
+_NULL = contextlib.nullcontext()
+_END = object()
+
+
+class Profiler:
+	"""Accumulates the time and memory of named phases.
+	
+	Attributes:
+	-----------
+	phases: dict of {str: dict}
+		For each phase, by its path ("outer/inner"): the number of calls,
+		the total wall time (s), and the peak memory above that in use
+		when the phase started (bytes, or None if not traced), over all calls.
+	
+	memory: bool
+		Whether memory is traced.
+	"""
+	def __init__(self, memory: bool = True):
+		self.memory = memory
+		self.phases = {}
+		self._stack = []
+		self._start = None
+		self.total = 0.0
+	
+	def start(self):
+		if self.memory:
+			tracemalloc.start()
+		self._start = time.perf_counter()
+	
+	def stop(self):
+		self.total = time.perf_counter() - self._start
+		if self.memory:
+			tracemalloc.stop()
+	
+	def _record(self, path: str) -> dict:
+		"""The record of a phase, added (in the order started) if new."""
+		return self.phases.setdefault(path, {"calls": 0, "time": 0.0, "memory": 0 if self.memory else None})
+	
+	def _traced(self) -> typing.Tuple[int, int]:
+		"""Current and peak traced memory (bytes)."""
+		if self.memory:
+			return tracemalloc.get_traced_memory()
+		return 0, 0
+	
+	@contextlib.contextmanager
+	def phase(self, name: str):
+		path = "/".join([frame["path"] for frame in self._stack[-1:]] + [name])
+		frame = {"path": path, "peak": 0}
+		self._stack.append(frame)
+		record = self._record(path)
+		base = self._traced()[0]
+		if self.memory:
+			tracemalloc.reset_peak()
+		tick = time.perf_counter()
+		try:
+			yield
+		finally:
+			elapsed = time.perf_counter() - tick
+			peak = max(frame["peak"], self._traced()[1])
+			self._stack.pop()
+			if self._stack:
+				# The reset hid this peak from the enclosing phase.
+				parent = self._stack[-1]
+				parent["peak"] = max(parent["peak"], peak)
+			record["calls"] += 1
+			record["time"] += elapsed
+			if self.memory:
+				record["memory"] = max(record["memory"], peak - base)
+	
+	def merge(self, phases: typing.Mapping[str, dict]):
+		"""Add the phases recorded by another profiler under the current phase.
+		
+		Parameters:
+		-----------
+		phases: dict of {str: dict}
+			Profiler.phases of the other profiler, such as one in a worker process.
+		"""
+		prefix = "".join(frame["path"] + "/" for frame in self._stack[-1:])
+		for path, other in phases.items():
+			record = self._record(prefix + path)
+			record["calls"] += other["calls"]
+			record["time"] += other["time"]
+			if self.memory and other["memory"] is not None:
+				record["memory"] = max(record["memory"], other["memory"])
+	
+	def summary(self) -> str:
+		"""Table of the phases, in the order they first started."""
+		lines = [f"{'Phase':<32} {'Calls':>6} {'Time (s)':>10} {'%':>6} {'Peak (MB)':>10}"]
+		rest = self.total
+		for path, record in self.phases.items():
+			depth = path.count("/")
+			if not depth:
+				rest -= record["time"]
+			name = "  "*depth + path.rsplit("/", 1)[-1]
+			share = 100*record["time"]/self.total if self.total else 0
+			memory = "-" if record["memory"] is None else f"{record['memory']/2**20:.2f}"
+			lines.append(f"{name:<32} {record['calls']:>6} {record['time']:>10.4f} {share:>6.1f} {memory:>10}")
+		# Input handling and printing
+		share = 100*rest/self.total if self.total else 0
+		lines.append(f"{'(other)':<32} {'':>6} {rest:>10.4f} {share:>6.1f}")
+		lines.append(f"{'Total':<32} {'':>6} {self.total:>10.4f}")
+		return "\n".join(lines)
+	
+	def write(self, output_dir: PathType) -> str:
+		"""Write the profile as JSON to the output directory, and return its path."""
+		fpath = os.path.join(output_dir, K.FNAME_PROFILE)
+		with open(fpath, 'w') as f:
+			json.dump({"total": self.total, "memory_traced": self.memory, "phases": self.phases}, f, indent=1)
+		return fpath
+
+
+_active: typing.Optional[Profiler] = None
+
+
+def enable(memory: bool = True) -> Profiler:
+	"""Start profiling the phases of this process, and return the profiler."""
+	global _active
+	_active = Profiler(memory)
+	_active.start()
+	return _active
+
+
+def disable() -> typing.Optional[Profiler]:
+	"""Stop profiling, and return the profiler that was active (if any)."""
+	global _active
+	profiler, _active = _active, None
+	if profiler is not None:
+		profiler.stop()
+	return profiler
+
+
+def active() -> typing.Optional[Profiler]:
+	"""The profiler of this process, if profiling is enabled."""
+	return _active
+
+
+def phase(name: str) -> typing.ContextManager:
+	"""Context manager marking a phase of the run; a no-op unless enabled."""
+	if _active is None:
+		return _NULL
+	return _active.phase(name)
+
+
+def iterate(name: str, iterable: typing.Iterable) -> typing.Iterator:
+	"""Iterate, timing the production of each item as a call of phase 'name'.
+	
+	For generators which do their work lazily, such as those which stream.
+	"""
+	iterator = iter(iterable)
+	while True:
+		with phase(name):
+			item = next(iterator, _END)
+		if item is _END:
+			return
+		yield item
+
+
+def run_profiled(memory: bool, function: typing.Callable, *args) -> typing.Tuple[typing.Any, dict]:
+	"""Call 'function' with its own profiler, in a worker process.
+	
+	Returns:
+	--------
+	result:
+		What 'function(*args)' returned.
+	
+	phases: dict of {str: dict}
+		Profiler.phases, for Profiler.merge() in the parent process.
+	"""
+	profiler = enable(memory)
+	try:
+		return function(*args), profiler.phases
+	finally:
+		disable()
@@ -4,6 +4,7 @@ Reactivity
 Generate reactivity functions.
 All units are arbitrary.
 """
+import os
 import typing
 import numpy as np
 import tpke.keys as K
@@ -23,17 +24,15 @@ def step(rho: float, start=0, stop=np.inf) -> typing.Callable:
 	
 	stop: float, optional
 		End of the step.
-		[Default: 0]
+		[Default: np.inf]
 	
 	Returns:
 	--------
-	step_function(t)
+	step_function(t), for a time or an array of times
 	"""
 	def step_function(t):
-		if start <= t <= stop:
-			return rho
-		else:
-			return 0
+		t = np.asarray(t)
+		return np.where((start <= t) & (t <= stop), rho, 0.0)[()]
 	return step_function
 
 
@@ -56,15 +55,11 @@ def ramp(rho: float, slope: float, start=0) -> typing.Callable:
 	
 	Returns:
 	--------
-	ramp_function(t)
+	ramp_function(t), for a time or an array of times
 	"""
+	low, high = min(0, rho), max(0, rho)
 	def ramp_function(t):
-		if t < start:
-			return 0
-		r = slope*t
-		if r < rho:
-			return r
-		return rho
+		return np.clip(slope*(np.asarray(t) - start), low, high)[()]
 	return ramp_function
 
 
@@ -81,20 +76,170 @@ def sine(rho: float, frequency: float) -> typing.Callable:
 	
 	Returns:
 	--------
-	sine_function(t)
+	sine_function(t), for a time or an array of times
 	"""
 	def sine_function(t):
-		return rho*np.sin(frequency*t)
+		return rho*np.sin(frequency*np.asarray(t))
 	return sine_function
 
 
+def load_table(fpath: str) -> typing.Tuple[T_arr, T_arr]:
+	"""Load a reactivity trace of (time, rho) rows.
+	
+	A .npy file of shape [n x 2] is memory-mapped, so only the pages
+	that are interpolated get read. Text files (.csv or .txt) are parsed
+	by np.loadtxt, skipping one header line if there is one.
+	
+	Parameters:
+	-----------
+	fpath: str
+		Path to the .npy, .csv, or .txt file.
+	
+	Returns:
+	--------
+	times: np.ndarray
+		Increasing times (s).
+	
+	rhos: np.ndarray
+		Reactivities ($) at those times.
+	"""
+	ext = os.path.splitext(fpath)[1].lower()
+	if ext == ".npy":
+		table = np.load(fpath, mmap_mode='r')
+	else:
+		delimiter = "," if ext == ".csv" else None
+		with open(fpath) as f:
+			first = f.readline().split(delimiter)
+		try:
+			[float(x) for x in first]
+			skiprows = 0
+		except ValueError:
+			skiprows = 1
+		table = np.loadtxt(fpath, delimiter=delimiter, skiprows=skiprows, ndmin=2)
+	if table.ndim != 2 or table.shape[1] != 2 or len(table) < 2:
+		raise ValueError(f"Expected at least 2 rows of (time, rho) in: {fpath}")
+	times, rhos = table[:, 0], table[:, 1]
+	for start in range(0, len(times) - 1, K.TABLE_CHUNK):
+		if np.any(np.diff(times[start:start + K.TABLE_CHUNK + 1]) <= 0):
+			raise ValueError(f"Times must be strictly increasing in: {fpath}")
+	return times, rhos
+
+
+def _pchip_slopes(times: T_arr, rhos: T_arr, k: T_arr) -> T_arr:
+	"""Slopes of the PCHIP interpolant at rows 'k' of the table.
+	
+	Only rows k-2 to k+2 are read. The slopes match those
+	of scipy.interpolate.PchipInterpolator on the whole table.
+	"""
+	last = len(times) - 1
+	interior = np.clip(k, 1, last - 1)
+	x = [np.asarray(times[interior + j]) for j in (-1, 0, 1)]
+	y = [np.asarray(rhos[interior + j]) for j in (-1, 0, 1)]
+	h0, h1 = x[1] - x[0], x[2] - x[1]
+	m0, m1 = (y[1] - y[0])/h0, (y[2] - y[1])/h1
+	# Weighted harmonic mean, or 0 at local extrema.
+	w0, w1 = 2*h1 + h0, h1 + 2*h0
+	same = (np.sign(m0)*np.sign(m1)) > 0
+	with np.errstate(divide="ignore", invalid="ignore"):
+		d = np.where(same, (w0 + w1)/(w0/m0 + w1/m1), 0.0)
+	# One-sided, shape-preserving three-point slopes at the ends.
+	ends = (k == 0) | (k == last)
+	if np.any(ends):
+		at_start = k[ends] == 0
+		ha = np.where(at_start, h0[ends], h1[ends])
+		hb = np.where(at_start, h1[ends], h0[ends])
+		ma = np.where(at_start, m0[ends], m1[ends])
+		mb = np.where(at_start, m1[ends], m0[ends])
+		de = ((2*ha + hb)*ma - ha*mb)/(ha + hb)
+		de = np.where(np.sign(de) != np.sign(ma), 0.0, de)
+		de = np.where((np.sign(ma) != np.sign(mb)) & (abs(de) > abs(3*ma)), 3*ma, de)
+		d[ends] = de
+	return d
+
+
+def table(file: str, interpolation: str = K.INTERP_LINEAR) -> typing.Callable:
+	"""Generate a reactivity function from a tabulated trace.
+	
+	For each requested time, only the rows of the table around it
+	are read, so memory does not depend on the length of the table.
+	Before the first and after the last time in the table,
+	the end values are held.
+	
+	Parameters:
+	-----------
+	file: str
+		Path to the table; see load_table().
+	
+	interpolation: str, optional
+		'linear', or 'pchip' for shape-preserving cubic interpolation.
+		[Default: 'linear']
+	
+	Returns:
+	--------
+	table_function(t), for a time or an array of times
+	"""
+	times, rhos = load_table(file)
+	interpolation = interpolation.lower()
+	if interpolation not in K.INTERP_TYPES:
+		raise ValueError(f"Unknown interpolation: {interpolation}. Expected one of: {K.INTERP_TYPES}")
+	pchip = interpolation == K.INTERP_PCHIP and len(times) > 2
+	
+	def interpolate(t):
+		t = np.clip(t, times[0], times[-1])
+		i = np.clip(np.searchsorted(times, t, side='right') - 1, 0, len(times) - 2)
+		x0, x1 = np.asarray(times[i]), np.asarray(times[i + 1])
+		y0, y1 = np.asarray(rhos[i]), np.asarray(rhos[i + 1])
+		h = x1 - x0
+		s = (t - x0)/h
+		if not pchip:
+			return y0 + s*(y1 - y0)
+		d0 = _pchip_slopes(times, rhos, i)
+		d1 = _pchip_slopes(times, rhos, i + 1)
+		# Cubic Hermite basis
+		return ((1 + 2*s)*(1 - s)**2*y0 + s*(1 - s)**2*h*d0
+		        + s**2*(3 - 2*s)*y1 - s**2*(1 - s)*h*d1)
+	
+	def table_function(t):
+		t = np.asarray(t, dtype=float)
+		flat = t.ravel()
+		rho = np.empty_like(flat)
+		for start in range(0, flat.size, K.TABLE_CHUNK):
+			stop = start + K.TABLE_CHUNK
+			rho[start:stop] = interpolate(flat[start:stop])
+		return rho.reshape(t.shape)[()]
+	return table_function
+
+
 FUNCTIONS = {
 	K.STEP: step,
 	K.RAMP: ramp,
-	K.SINE: sine
+	K.SINE: sine,
+	K.TABLE: table
 }
 
 
+def get_reactivity_function(r_type: str, **kwargs: typing.Mapping) -> typing.Callable:
+	"""Get the reactivity as a function of time.
+	
+	Parameters:
+	-----------
+	r_type: str
+		'step', 'ramp', 'sine', or 'table'
+	
+	kwargs: dict
+		Keyword arguments for the reactivity function generator.
+	
+	Returns:
+	--------
+	rho_function(t), for a time or an array of times
+	"""
+	r_type = r_type.lower()
+	if r_type not in FUNCTIONS:
+		raise KeyError(f"Unknown function type: {r_type}. "
+		               f"Expected one of: {list(FUNCTIONS.keys())}")
+	return FUNCTIONS[r_type](**kwargs)
+
+
 def get_reactivity_vector(
 		r_type: str,
 		n: int,
@@ -106,7 +251,7 @@ def get_reactivity_vector(
 	Parameters:
 	-----------
 	r_type: str
-		'step', 'ramp', or 'sign'
+		'step', 'ramp', 'sine', or 'table'
 	
 	n: int
 		Number of steps to generate (not counting 0).
@@ -120,11 +265,7 @@ def get_reactivity_vector(
 	Returns:
 	--------
 	rho_vector: np.ndarray
+		Reactivities at the n+1 times from 0 to n*dt.
 	"""
-	times = np.linspace(0, n*dt, n)  # n+1?
-	r_type = r_type.lower()
-	if r_type not in FUNCTIONS:
-		raise KeyError(f"Unknown function type: {r_type}. "
-		               f"Expected one of: {list(FUNCTIONS.keys())}")
-	f = np.vectorize(FUNCTIONS[r_type](**kwargs))
-	return f(times)
+	times = np.linspace(0, n*dt, n + 1)
+	return get_reactivity_function(r_type, **kwargs)(times)
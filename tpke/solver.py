@@ -3,12 +3,18 @@ Solver
 
 Solve the system of equations
 
-Right now, we only use scipy.linalg.solve().
-It'd probably be more efficient to use scipy's sparse matrix methods
-or to write my own Gauss-Seidel iterator, but that's not a priority.
+The default is the dense scipy.linalg.solve().
+For long transients, assemble the matrix with sparse=True
+and use the sparse direct solver or the banded solver instead,
+or skip storing the matrix altogether with the Krylov solver.
 """
 
+
+import numpy as np
 import scipy.linalg as la
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+import tpke.keys as K
 from tpke.tping import T_arr
 
 
@@ -88,3 +94,236 @@ def inversion(matA, matB, n):
 	invA = la.inv(matA, overwrite_a=False)
 	vecX = invA.dot(matB)
 	return __split_results(vecX, n)
+
+
+def sparse(matA, vecB: T_arr, n: int):
+	"""Solve using scipy's sparse direct solver
+	
+	Let M be the size of the matrix,
+	    n be the number of timesteps, and
+	    ndg be the number of delayed groups
+	
+	Paramters:
+	----------
+	matA: scipy.sparse matrix
+		[M x M] sparse square array of RHS
+		
+	vecB: np.ndarray
+		[1 x M] vector of LHS
+	
+	n: int
+		Number of timesteps
+	
+	Returns:
+	--------
+	P: np.ndarray
+		[1 x ndg] vector of powers
+	
+	C: np.ndarray
+		[ndg x n] array of precursor group concentrations
+	"""
+	vecX = spla.spsolve(matA.tocsc(), vecB)
+	return __split_results(vecX, n)
+
+
+def _time_major(n: int, size: int):
+	"""Get the time-major positions of the rows and columns of A.
+	
+	The builders in matrices.py order the unknowns by variable:
+	[P_0..P_{n-1}, C_{1,0}..C_{1,n-1}, ...], with the initial condition
+	of each variable in the last row of its block. Interleaving them by
+	timestep (and moving the initial conditions to the first timestep)
+	gathers every nonzero into a narrow band around the diagonal.
+	
+	Parameters:
+	-----------
+	n: int
+		Number of timesteps
+	
+	size: int
+		Size of the square matrix, (1 + ndg)*n
+	
+	Returns:
+	--------
+	rows: np.ndarray(int)
+		New position of each row of A.
+	
+	cols: np.ndarray(int)
+		New position of each column of A.
+	"""
+	m = size//n
+	var, step = np.divmod(np.arange(size), n)
+	# Row 'step' of each block links step -> step+1; row n-1 is the initial condition.
+	rows = ((step + 1) % n)*m + var
+	cols = step*m + var
+	return rows, cols
+
+
+def banded(matA, vecB: T_arr, n: int):
+	"""Solve using scipy's banded solver on the time-major system
+	
+	The unknowns are reordered internally, so the cost is linear
+	in the number of timesteps.
+	
+	Let M be the size of the matrix,
+	    n be the number of timesteps, and
+	    ndg be the number of delayed groups
+	
+	Paramters:
+	----------
+	matA: np.ndarray or scipy.sparse matrix
+		[M x M] square array of RHS
+		
+	vecB: np.ndarray
+		[1 x M] vector of LHS
+	
+	n: int
+		Number of timesteps
+	
+	Returns:
+	--------
+	P: np.ndarray
+		[1 x ndg] vector of powers
+	
+	C: np.ndarray
+		[ndg x n] array of precursor group concentrations
+	"""
+	coo = sp.coo_matrix(matA)
+	coo.sum_duplicates()
+	size = coo.shape[0]
+	rows, cols = _time_major(n, size)
+	ii = rows[coo.row]
+	jj = cols[coo.col]
+	lower = max(np.max(ii - jj), 0)
+	upper = max(np.max(jj - ii), 0)
+	ab = np.zeros((lower + upper + 1, size))
+	ab[upper + ii - jj, jj] = coo.data
+	vecY = np.empty(size)
+	vecY[rows] = vecB
+	vecY = la.solve_banded((lower, upper), ab, vecY)
+	vecX = vecY[cols]
+	return __split_results(vecX, n)
+
+
+def krylov(
+		opA,
+		vecB: T_arr,
+		n: int,
+		M=None,
+		method: str = K.SOLVER_GMRES,
+		rtol: float = 1e-10,
+		maxiter: int = None
+):
+	"""Solve iteratively with a Krylov method
+	
+	Let M be the size of the matrix,
+	    n be the number of timesteps, and
+	    ndg be the number of delayed groups
+	
+	Paramters:
+	----------
+	opA: scipy.sparse.linalg.LinearOperator, or any matrix
+		[M x M] square operator of RHS
+		
+	vecB: np.ndarray
+		[1 x M] vector of LHS
+	
+	n: int
+		Number of timesteps
+	
+	M: scipy.sparse.linalg.LinearOperator, optional
+		[M x M] preconditioner, approximating the inverse of opA.
+		[Default: None]
+	
+	method: str, optional
+		Krylov method: 'gmres' or 'bicgstab'.
+		[Default: 'gmres']
+	
+	rtol: float, optional
+		Relative tolerance on the residual.
+		[Default: 1e-10]
+	
+	maxiter: int, optional
+		Maximum number of iterations.
+		[Default: None --> scipy's default]
+	
+	Returns:
+	--------
+	P: np.ndarray
+		[1 x ndg] vector of powers
+	
+	C: np.ndarray
+		[ndg x n] array of precursor group concentrations
+	
+	report: dict
+		Convergence report:
+			'iterations': number of iterations (int)
+			'residuals': relative residual norm after each iteration (np.ndarray);
+			             for GMRES, this is the preconditioned residual.
+			'residual': true relative residual norm of the solution (float)
+	
+	Raises:
+	-------
+	RuntimeError
+		If the method stops before meeting the tolerance.
+	"""
+	residuals = []
+	normB = np.linalg.norm(vecB)
+	# BiCGSTAB does not call back when it converges halfway through an iteration,
+	# so count its products with A instead.
+	matvecs = 0
+	
+	def matvec(x):
+		nonlocal matvecs
+		matvecs += 1
+		return opA @ x
+	
+	counted = spla.LinearOperator(opA.shape, matvec=matvec, dtype=float)
+	# Start from the initial state held for all time. Only the initial conditions
+	# are nonzero in B, so starting from zero, BiCGSTAB's shadow residual (B) would
+	# be orthogonal to every later residual, and it would break down.
+	x0 = np.repeat(vecB.reshape((-1, n))[:, -1:], n, axis=1).ravel()
+	if method == K.SOLVER_GMRES:
+		vecX, info = spla.gmres(counted, vecB, x0=x0, M=M, rtol=rtol, maxiter=maxiter,
+		                        callback=residuals.append, callback_type="pr_norm")
+		iterations = len(residuals)
+	elif method == K.SOLVER_BICGSTAB:
+		def callback(xk):
+			residuals.append(np.linalg.norm(vecB - opA @ xk)/normB)
+		vecX, info = spla.bicgstab(counted, vecB, x0=x0, M=M, rtol=rtol, maxiter=maxiter, callback=callback)
+		# One product for the initial residual, then two per iteration
+		iterations = matvecs//2
+	else:
+		raise KeyError(f"Unknown Krylov method: {method}. "
+		               f"Expected one of: {KRYLOV_SOLVERS}")
+	residual = np.linalg.norm(vecB - opA @ vecX)/normB
+	if info:
+		if info > 0:
+			reason = "iteration limit"
+		else:
+			reason = {-10: "rho breakdown", -11: "omega breakdown"}.get(
+				info, f"illegal input or breakdown, info={info}"
+			)
+		raise RuntimeError(f"{method} did not converge to rtol={rtol} after {iterations} iterations "
+		                   f"({reason}); the relative residual is {residual:.3e}. "
+		                   f"Try another preconditioner or solver.")
+	if len(residuals) < iterations:
+		residuals.append(residual)
+	report = {
+		"iterations": iterations,
+		"residuals": np.array(residuals),
+		"residual": residual,
+	}
+	P, C = __split_results(vecX, n)
+	return P, C, report
+
+
+SOLVERS = {
+	K.SOLVER_DENSE: linalg,
+	K.SOLVER_SPARSE: sparse,
+	K.SOLVER_BANDED: banded,
+}
+# Solvers which need the matrix assembled with sparse=True
+SPARSE_SOLVERS = (K.SOLVER_SPARSE, K.SOLVER_BANDED)
+# Matrix-free solvers, for operators from matrices.OPERATORS
+KRYLOV_SOLVERS = K.KRYLOV_SOLVER_NAMES
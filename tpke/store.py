@@ -0,0 +1,286 @@
+"""
+Store
+
+Read and write the solution arrays in text or binary form.
+
+Text is one file per array, as written by np.savetxt().
+The binary formats keep all the arrays of a run in one file,
+with named datasets and the run metadata:
+	npz:  Uncompressed NumPy archive, memory-mapped when read back.
+	hdf5: Chunked, compressed HDF5 file (requires h5py), read back whole.
+"""
+import os
+import json
+import struct
+import typing
+import zipfile
+import numpy as np
+import tpke.tping
+import tpke.keys as K
+try:
+	import h5py
+except ImportError:
+	h5py = None
+
+# Dataset name -> text file name
+TEXT_FILES = {
+	K.DSET_TIME: K.FNAME_TIME,
+	K.DSET_RHO: K.FNAME_RHO,
+	K.DSET_P: K.FNAME_P,
+	K.DSET_C: K.FNAME_C,
+	K.DSET_T: K.FNAME_T,
+}
+# Datasets which only some runs have
+OPTIONAL = (K.DSET_T,)
+# Binary format -> file name
+BINARY_FILES = {
+	K.FORMAT_NPZ: K.FNAME_RESULTS_NPZ,
+	K.FORMAT_HDF5: K.FNAME_RESULTS_HDF5,
+}
+_METADATA = "metadata"
+_ZIP_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+
+def _require_h5py():
+	if h5py is None:
+		raise ImportError("The 'hdf5' format requires h5py: pip install h5py")
+
+
+def save(
+		output_dir: tpke.tping.PathType,
+		datasets: typing.Mapping[str, np.ndarray],
+		metadata: typing.Mapping = None,
+		fmt: str = K.FORMAT_TXT
+) -> str:
+	"""Write the solution arrays to the output directory.
+	
+	Parameters:
+	-----------
+	output_dir: str or PathLike
+		Output folder to write results to.
+	
+	datasets: dict of {str: np.ndarray}
+		Arrays to write, by name (see TEXT_FILES).
+	
+	metadata: dict, optional
+		JSON-serializable information about the run.
+		Not written in the text format.
+		[Default: None]
+	
+	fmt: str, optional
+		Output format: one of keys.FORMATS.
+		[Default: keys.FORMAT_TXT]
+	
+	Returns:
+	--------
+	fpath: str
+		Path to the file written (or to the output folder for text).
+	"""
+	fmt = fmt.lower()
+	metadata = dict(metadata or {})
+	if fmt == K.FORMAT_TXT:
+		for name, array in datasets.items():
+			np.savetxt(os.path.join(output_dir, TEXT_FILES[name]), array)
+		return str(output_dir)
+	if fmt not in BINARY_FILES:
+		raise ValueError(f"Unknown output format: {fmt}")
+	fpath = os.path.join(output_dir, BINARY_FILES[fmt])
+	if fmt == K.FORMAT_NPZ:
+		# Uncompressed, so that the arrays can be memory-mapped.
+		np.savez(fpath, **datasets, **{_METADATA: np.array(json.dumps(metadata, default=str))})
+	else:
+		_require_h5py()
+		with h5py.File(fpath, 'w') as f:
+			for name, array in datasets.items():
+				array = np.asarray(array)
+				f.create_dataset(
+					name, data=array,
+					chunks=True if array.ndim else None,
+					compression="gzip" if array.ndim else None,
+					shuffle=bool(array.ndim)
+				)
+			f.attrs[_METADATA] = json.dumps(metadata, default=str)
+	return fpath
+
+
+def append(
+		output_dir: tpke.tping.PathType,
+		datasets: typing.Mapping[str, np.ndarray],
+		metadata: typing.Mapping = None,
+		fmt: str = K.FORMAT_TXT,
+		new: bool = False
+) -> str:
+	"""Append a chunk of the solution arrays to the output directory.
+	
+	Arrays are extended along their last (time) axis. In the text format,
+	the concentrations are written with one row per time instead.
+	The npz format cannot be appended to.
+	
+	Parameters:
+	-----------
+	output_dir: str or PathLike
+		Output folder to write results to.
+	
+	datasets: dict of {str: np.ndarray}
+		Chunk of each array to write, by name (see TEXT_FILES).
+	
+	metadata: dict, optional
+		JSON-serializable information about the run.
+		Only written with the first chunk.
+		[Default: None]
+	
+	fmt: str, optional
+		Output format: keys.FORMAT_TXT or keys.FORMAT_HDF5.
+		[Default: keys.FORMAT_TXT]
+	
+	new: bool, optional
+		Whether this is the first chunk, which replaces any existing results.
+		[Default: False]
+	
+	Returns:
+	--------
+	fpath: str
+		Path to the file written (or to the output folder for text).
+	"""
+	fmt = fmt.lower()
+	if fmt == K.FORMAT_TXT:
+		for name, array in datasets.items():
+			if name == K.DSET_C:
+				array = np.asarray(array).T
+			with open(os.path.join(output_dir, TEXT_FILES[name]), 'w' if new else 'a') as f:
+				np.savetxt(f, array)
+		return str(output_dir)
+	if fmt != K.FORMAT_HDF5:
+		raise ValueError(f"Cannot append to the '{fmt}' format.")
+	_require_h5py()
+	fpath = os.path.join(output_dir, BINARY_FILES[fmt])
+	with h5py.File(fpath, 'w' if new else 'a') as f:
+		if new:
+			f.attrs[_METADATA] = json.dumps(dict(metadata or {}), default=str)
+		for name, array in datasets.items():
+			array = np.asarray(array)
+			if new:
+				f.create_dataset(
+					name, data=array, maxshape=array.shape[:-1] + (None,),
+					chunks=True, compression="gzip", shuffle=True
+				)
+				continue
+			dset = f[name]
+			size = dset.shape[-1]
+			dset.resize(size + array.shape[-1], axis=array.ndim - 1)
+			dset[..., size:] = array
+	return fpath
+
+
+def find(output_dir: tpke.tping.PathType) -> typing.Optional[str]:
+	"""Find which format the results in a folder were written in.
+	
+	Binary files take precedence over text.
+	
+	Returns:
+	--------
+	fmt: str or None
+		One of keys.FORMATS, or None if no results were found.
+	"""
+	for fmt, fname in BINARY_FILES.items():
+		if os.path.isfile(os.path.join(output_dir, fname)):
+			return fmt
+	if os.path.isfile(os.path.join(output_dir, K.FNAME_P)):
+		return K.FORMAT_TXT
+	return None
+
+
+def load(
+		output_dir: tpke.tping.PathType,
+		names: typing.Iterable[str] = None
+) -> typing.Tuple[typing.Dict[str, np.ndarray], typing.Dict]:
+	"""Read solution arrays back from the output directory.
+	
+	Parameters:
+	-----------
+	output_dir: str or PathLike
+		Output folder to read existing results from.
+	
+	names: iterable of str, optional
+		Datasets to read.
+		[Default: None -> all of them, skipping any OPTIONAL ones not written]
+	
+	Returns:
+	--------
+	datasets: dict of {str: np.ndarray}
+		Arrays by name. Only from npz files are these read lazily, as
+		read-only memory maps; text and the (compressed) HDF5 datasets
+		are read into memory whole.
+	
+	metadata: dict
+		Information about the run (empty for text).
+	"""
+	fmt = find(output_dir)
+	if fmt is None:
+		raise FileNotFoundError(f"No results could be found in: {output_dir}")
+	skippable = OPTIONAL if names is None else ()
+	names = list(TEXT_FILES) if names is None else list(names)
+	if fmt == K.FORMAT_TXT:
+		datasets = {}
+		for name in names:
+			fpath = os.path.join(output_dir, TEXT_FILES[name])
+			if not os.path.isfile(fpath):
+				if name in skippable:
+					continue
+				raise FileNotFoundError(fpath)
+			datasets[name] = np.loadtxt(fpath)
+		if K.DSET_C in datasets and K.DSET_P in datasets:
+			# Streamed concentrations have one row per time.
+			C, P = datasets[K.DSET_C], datasets[K.DSET_P]
+			if C.ndim == 2 and C.shape[1] != P.size and C.shape[0] == P.size:
+				datasets[K.DSET_C] = C.T
+		return datasets, {}
+	fpath = os.path.join(output_dir, BINARY_FILES[fmt])
+	if fmt == K.FORMAT_NPZ:
+		arrays = _memmap_npz(fpath)
+		metadata = json.loads(str(arrays.pop(_METADATA, "{}")))
+	else:
+		_require_h5py()
+		with h5py.File(fpath, 'r') as f:
+			# Compressed, so not memory-mapped
+			arrays = {name: f[name][()] for name in names if name in f}
+			metadata = json.loads(f.attrs.get(_METADATA, "{}"))
+	names = [name for name in names if name in arrays or name not in skippable]
+	missing = [name for name in names if name not in arrays]
+	if missing:
+		raise KeyError(f"Datasets {missing} are not in: {fpath}")
+	return {name: arrays[name] for name in names}, metadata
+
+
+def _memmap_npz(fpath: tpke.tping.PathType) -> typing.Dict[str, np.ndarray]:
+	"""Memory-map each array stored uncompressed in an npz archive.
+	
+	Compressed members (and 0-d arrays) are read normally.
+	"""
+	arrays = {}
+	with zipfile.ZipFile(fpath) as zf, open(fpath, 'rb') as f:
+		for info in zf.infolist():
+			name = info.filename[:-len(".npy")]
+			if info.compress_type != zipfile.ZIP_STORED:
+				with zf.open(info) as member:
+					arrays[name] = np.lib.format.read_array(member)
+				continue
+			f.seek(info.header_offset)
+			header = _ZIP_LOCAL_HEADER.unpack(f.read(_ZIP_LOCAL_HEADER.size))
+			name_len, extra_len = header[-2:]
+			f.seek(name_len + extra_len, os.SEEK_CUR)
+			start = f.tell()
+			version = np.lib.format.read_magic(f)
+			if version == (1, 0):
+				shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+			else:
+				shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+			if not shape or dtype.hasobject:
+				f.seek(start)
+				arrays[name] = np.lib.format.read_array(f)
+			else:
+				arrays[name] = np.memmap(
+					fpath, dtype=dtype, mode='r', offset=f.tell(),
+					shape=shape, order='F' if fortran else 'C'
+				)
+	return arrays
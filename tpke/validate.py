@@ -0,0 +1,88 @@
+"""
+Validate
+
+Check whole directories of input files at once, and report the errors
+in each as JSON. The schema is compiled once per process, instead of
+once per file.
+
+Usage:
+
+	python -m tpke.validate PATH [PATH ...] [-j JOBS] [-o REPORT]
+
+Directories are searched recursively for *.yml and *.yaml files.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import typing
+
+EXTENSIONS = (".yml", ".yaml")
+
+
+def find_input_files(paths: typing.Iterable) -> typing.List[str]:
+	"""Expand directories into the YAML files within them.
+	
+	Parameters:
+	-----------
+	paths: iterable of str or PathLike
+		Files and directories.
+	
+	Returns:
+	--------
+	fpaths: list of str
+		Files given directly, then the YAML files found in each directory.
+	"""
+	fpaths = []
+	for path in paths:
+		if not os.path.isdir(path):
+			fpaths.append(str(path))
+			continue
+		for root, dirs, files in os.walk(path):
+			dirs.sort()
+			fpaths += [os.path.join(root, f) for f in sorted(files) if f.lower().endswith(EXTENSIONS)]
+	return fpaths
+
+
+def get_arguments(args=None) -> argparse.Namespace:
+	ap = argparse.ArgumentParser(description="Validate many TPKE input files.")
+	ap.add_argument("paths", type=str, nargs="+",
+	                help="Input files, or directories to search for them.")
+	ap.add_argument("-j", "--jobs", type=int, default=1,
+	                help="Number of processes to validate in (default: 1).")
+	ap.add_argument("-o", "--output", type=str, default=None,
+	                help="File to write the JSON report to (default: standard output).")
+	return ap.parse_args(args)
+
+
+def main(args=None) -> int:
+	import tpke.yamlin
+	args = get_arguments(args)
+	if args.jobs < 1:
+		raise ValueError("Number of jobs must be >0.")
+	fpaths = find_input_files(args.paths)
+	tick = time.perf_counter()
+	errors = tpke.yamlin.validate_files(fpaths, jobs=args.jobs)
+	tock = time.perf_counter()
+	num_invalid = sum(bool(errs) for errs in errors.values())
+	report = {
+		"num_files": len(errors),
+		"num_valid": len(errors) - num_invalid,
+		"num_invalid": num_invalid,
+		"seconds": tock - tick,
+		"errors": errors,
+	}
+	if args.output:
+		with open(args.output, 'w') as f:
+			json.dump(report, f, indent=1)
+	else:
+		json.dump(report, sys.stdout, indent=1)
+		print()
+	print(f"{report['num_valid']} of {len(errors)} input files are valid "
+	      f"({len(errors)/max(tock - tick, 1e-9):.0f} files/s).", file=sys.stderr)
+	return int(num_invalid > 0)
+
+
+if __name__ == "__main__":
+	exit(main())
@@ -4,10 +4,10 @@ YAML in
 YAML reading and validation.
 """
 
+import functools
+import os
 import typing
-import yamale
 import numpy as np
-from tpke.matrices import METHODS
 from tpke.tping import PathType
 from tpke.keys import *
 
@@ -32,40 +32,68 @@ SCHEMA = f"""\
 {TIME}: include('time_type')
 {DATA}: include('data_type')
 {PLOT}: include('plot_type', required=False)
-{REAC}: any(include('step_type'), include('ramp_type'), include('sine_type'))
-{METH}: {_enum(METHODS.keys(), ignore_case=True)}
+{REAC}: any(include('step_type'), include('ramp_type'), include('sine_type'), include('table_type'))
+{METH}: {_enum(METHOD_NAMES, ignore_case=True)}
+{SOLVER}: {_enum(SOLVER_NAMES, ignore_case=True, required=False)}
+{PRECOND}: {_enum(PRECOND_TYPES, ignore_case=True, required=False)}
 ---
 time_type:
   {TIME_TOTAL}: num(min=0)
-  {TIME_DELTA}: num(min=0)
+  {TIME_DELTA}: num(min=0, required=False)
+  {TIME_RTOL}: num(min=0, required=False)
+  {TIME_ATOL}: num(min=0, required=False)
+  {TIME_DT_MIN}: num(min=0, required=False)
+  {TIME_DT_MAX}: num(min=0, required=False)
 ---
 data_type:
   {DATA_B}: list(num(min=0))
   {DATA_L}: list(num(min=0))
   {DATA_BIG_L}: num(min=0)
+  {DATA_FEEDBACK}: include('feedback_type', required=False)
+---
+feedback_type:
+  {FB_ALPHA_FUEL}: num()
+  {FB_ALPHA_COOL}: num()
+  {FB_HEAT_FUEL}: num(min=0)
+  {FB_HEAT_COOL}: num(min=0)
+  {FB_TRANSFER}: num(min=0)
+  {FB_REMOVAL}: num(min=0)
 ---
 plot_type:
   {PLOT_SHOW}: int(min=0, max=2, required=False)
   {PLOT_SPY}: int(min=0, max=1, required=False)
   {PLOT_PR}: int(min=0, max=2, required=False)
   {PLOT_LOG}: {_enum(PLOT_TYPES, ignore_case=True, required=False)}
+  {PLOT_POINTS}: int(min=4, required=False)
 ---
 step_type:
   {REAC_TYPE}: str(equals="{STEP}", ignore_case=True)
   {RHO}: num()
+  {REAC_START}: num(required=False)
+  {REAC_STOP}: num(required=False)
 ---
 ramp_type:
   {REAC_TYPE}: str(equals="{RAMP}", ignore_case=True)
   {RHO}: num()
   {RAMP_SLOPE}: num()
+  {REAC_START}: num(required=False)
 ---
 sine_type:
   {REAC_TYPE}: str(equals="{SINE}", ignore_case=True)
   {RHO}: num()
   {SINE_OMEGA}: num(min=0)
+---
+table_type:
+  {REAC_TYPE}: str(equals="{TABLE}", ignore_case=True)
+  {TABLE_FILE}: str()
+  {TABLE_INTERP}: {_enum(INTERP_TYPES, ignore_case=True, required=False)}
 """
 
-yamale_schema = yamale.make_schema(content=SCHEMA, parser=PARSER)
+@functools.lru_cache(maxsize=None)
+def get_schema():
+	"""Compile the Yamale schema, the first time it is needed."""
+	import yamale
+	return yamale.make_schema(content=SCHEMA, parser=PARSER)
 
 
 def load_input_file(fpath: PathType) -> typing.MutableMapping:
@@ -84,33 +112,153 @@ def load_input_file(fpath: PathType) -> typing.MutableMapping:
 	ydict: dict
 		Dictionary of the input parameters.
 	"""
+	import yamale
 	data = yamale.make_data(fpath, parser=PARSER)
-	yamale.validate(yamale_schema, data)
+	yamale.validate(get_schema(), data)
 	ydict = data[0][0]
+	_resolve_paths(ydict, fpath)
 	check_input(ydict)
 	# Let's make these arrays for later.
 	ydict[DATA][DATA_B] = np.array(ydict[DATA][DATA_B])*1e-5
 	ydict[DATA][DATA_L] = np.array(ydict[DATA][DATA_L])
-	ydict[REAC][RHO] = float(ydict[REAC][RHO])
+	if RHO in ydict[REAC]:
+		ydict[REAC][RHO] = float(ydict[REAC][RHO])
 	return ydict
 
 
+def _resolve_paths(config: typing.MutableMapping, fpath: PathType):
+	"""Make the paths in an input relative to the input file itself."""
+	rx = config[REAC]
+	if rx[REAC_TYPE].lower() == TABLE:
+		table_path = os.path.expanduser(rx[TABLE_FILE])
+		rx[TABLE_FILE] = os.path.join(os.path.dirname(os.path.abspath(fpath)), table_path)
+
+
 def check_input(config: typing.Mapping):
 	"""Check the input dictionary and raise an error if appropriate"""
+	errs = input_errors(config)
+	if errs:
+		errstr = f"There were {len(errs)} errors:\n\t"
+		errstr += "\n\t".join(errs)
+		raise ValueError(errstr)
+
+
+def input_errors(config: typing.Mapping) -> typing.List[str]:
+	"""List what is wrong with a schema-valid input dictionary"""
 	errs = []
 	if len(config[DATA][DATA_B]) != len(config[DATA][DATA_L]):
 		errs.append("Number of delayed fractions does not match number of decay constants.")
-	if config[TIME][TIME_TOTAL] < config[TIME][TIME_DELTA]:
-		errs.append("Total time is less than timestep size.")
+	timing = config[TIME]
+	method = config[METH].lower()
+	solver = config.get(SOLVER, SOLVER_DENSE).lower()
+	if TIME_DELTA in timing:
+		if timing[TIME_TOTAL] < timing[TIME_DELTA]:
+			errs.append("Total time is less than timestep size.")
+		if solver == SOLVER_MARCH:
+			if method not in MARCHING_METHOD_NAMES:
+				errs.append(f"Method '{method}' is not available with '{SOLVER}: {solver}'.")
+		elif solver in KRYLOV_SOLVER_NAMES:
+			if method not in OPERATOR_METHOD_NAMES:
+				errs.append(f"Method '{method}' is not available with '{SOLVER}: {solver}'.")
+		elif method not in MATRIX_METHOD_NAMES:
+			errs.append(f"Method '{method}' is only available with '{SOLVER}: {SOLVER_MARCH}'.")
+	elif TIME_RTOL not in timing:
+		errs.append(f"Either '{TIME_DELTA}' or '{TIME_RTOL}' (for adaptive time stepping) is required.")
+	else:
+		if SOLVER in config and solver != SOLVER_MARCH:
+			errs.append(f"Adaptive time stepping requires '{SOLVER}: {SOLVER_MARCH}'.")
+		if method not in ADAPTIVE_METHOD_NAMES:
+			errs.append(f"Adaptive time stepping is not available for method '{method}'.")
+		if timing.get(TIME_DT_MIN, 0) > timing.get(TIME_DT_MAX, timing[TIME_TOTAL]):
+			errs.append(f"'{TIME_DT_MIN}' is greater than '{TIME_DT_MAX}'.")
+	if DATA_FEEDBACK in config[DATA]:
+		if TIME_DELTA not in timing or solver != SOLVER_MARCH:
+			errs.append(f"Feedback requires a fixed '{TIME_DELTA}' and '{SOLVER}: {SOLVER_MARCH}'.")
+		if method not in FEEDBACK_METHOD_NAMES:
+			errs.append(f"Feedback is not available for method '{method}'.")
+		fb = config[DATA][DATA_FEEDBACK]
+		if not (fb[FB_HEAT_FUEL] > 0 and fb[FB_HEAT_COOL] > 0):
+			errs.append("Feedback heat capacities must be >0.")
 	rx = config[REAC]
 	if rx[REAC_TYPE] == RAMP and np.sign(rx[RHO]) != np.sign(rx[RAMP_SLOPE]):
 		errs.append("Reactivity inserted and insertion ramp slope have different signs.")
+	if rx[REAC_TYPE].lower() == TABLE:
+		if not os.path.isfile(rx[TABLE_FILE]):
+			errs.append(f"Reactivity table does not exist: {rx[TABLE_FILE]}")
+		elif not rx[TABLE_FILE].lower().endswith(TABLE_EXTENSIONS):
+			errs.append(f"Reactivity table must be one of {TABLE_EXTENSIONS}: {rx[TABLE_FILE]}")
+	if rx.get(REAC_START, 0) > rx.get(REAC_STOP, np.inf):
+		errs.append(f"Reactivity '{REAC_START}' is after '{REAC_STOP}'.")
 	# Might add some more checks later.
-	if errs:
-		errstr = f"There were {len(errs)} errors:\n\t"
-		errstr += "\n\t".join(errs)
-		raise ValueError(errstr)
-		
+	return errs
+
+
+def validate_file(fpath: PathType) -> typing.List[str]:
+	"""Validate an input file without preparing it for a run.
+	
+	Parameters:
+	-----------
+	fpath: str or PathLike
+		Path to the input YAML file to check
+	
+	Returns:
+	--------
+	errors: list of str
+		What is wrong with the file; empty if it is valid.
+	"""
+	import yamale
+	try:
+		data = yamale.make_data(fpath, parser=PARSER)
+		yamale.validate(get_schema(), data)
+		_resolve_paths(data[0][0], fpath)
+		return input_errors(data[0][0])
+	except yamale.YamaleError as e:
+		return [err for result in e.results for err in result.errors]
+	except Exception as e:
+		return [f"{type(e).__name__}: {e}"]
+
+
+# Fewest files worth starting another process for in validate_files()
+PARALLEL_MIN_FILES = 500
+
+
+def validate_files(
+		fpaths: typing.Sequence,
+		jobs: int = 1
+) -> typing.Dict[str, typing.List[str]]:
+	"""Validate many input files, compiling the schema only once per process.
+	
+	Parameters:
+	-----------
+	fpaths: sequence of str or PathLike
+		Paths to the input YAML files to check
+	
+	jobs: int, optional
+		Most processes to validate in. No more are used than there are CPUs
+		available, nor than one per PARALLEL_MIN_FILES files, as starting
+		a process costs more than validating a few hundred files.
+		[Default: 1]
+	
+	Returns:
+	--------
+	errors: dict of {str: list of str}
+		What is wrong with each file; empty lists for the valid ones.
+	"""
+	fpaths = [str(f) for f in fpaths]
+	if hasattr(os, "sched_getaffinity"):
+		cpus = len(os.sched_getaffinity(0))
+	else:
+		cpus = os.cpu_count() or 1
+	jobs = min(jobs, cpus, len(fpaths)//PARALLEL_MIN_FILES)
+	if jobs > 1:
+		import concurrent.futures
+		chunksize = max(1, len(fpaths)//(8*jobs))
+		with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+			results = list(pool.map(validate_file, fpaths, chunksize=chunksize))
+	else:
+		results = [validate_file(f) for f in fpaths]
+	return dict(zip(fpaths, results))
+
 
 def _ruamel_load_input_file(stream: typing.TextIO) -> typing.Mapping:
 	y = yaml.YAML(typ="safe")